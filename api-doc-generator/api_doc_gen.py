@@ -4,26 +4,493 @@ API Documentation Generator
 A tool for generating beautiful API documentation from code annotations and OpenAPI specs.
 """
 
+import ast
+import bisect
+import gc
+import heapq
 import os
+import re
 import sys
+import contextlib
+import threading
+import time
 import argparse
-import yaml
+import hashlib
+import pickle
 import json
+import codecs
+import itertools
+import functools
+import operator
+from array import array
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import asyncio
+from collections import deque
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Callable, Deque, Union, get_args
 
-try:
-    from fastapi import FastAPI
-    FASTAPI_AVAILABLE = True
-except ImportError:
-    FASTAPI_AVAILABLE = False
+# Framework, YAML and server modules are imported on first use so that runs
+# which never touch them (e.g. --source openapi with a JSON spec) start fast.
 
-try:
-    from flask import Flask
-    FLASK_AVAILABLE = True
-except ImportError:
-    FLASK_AVAILABLE = False
+__version__ = '1.0.0'
+
+# Cold-start budget for `import api_doc_gen`, enforced by check_startup.py
+IMPORT_TIME_BUDGET_MS = 50
+
+# Default location of the parsed-spec cache, overridable via config or env
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'api-doc-gen')
+
+# Remote specs: cache subdirectory, concurrent downloads, socket timeout
+# (seconds) and the longest redirect chain followed
+REMOTE_CACHE_DIR = 'remote'
+FETCH_THREADS = 8
+FETCH_TIMEOUT = 30
+FETCH_MAX_REDIRECTS = 5
+
+# Buffer size for streamed output files; large writes keep syscall count low
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Output files are written by this many threads, each file queueing at most
+# OUTPUT_QUEUE_BLOCKS blocks of WRITE_BUFFER_SIZE bytes ahead of its writer
+OUTPUT_WRITE_THREADS = 4
+OUTPUT_QUEUE_BLOCKS = 4
+
+# Written by a writer staging into an enclosing build's staging directory:
+# the output files, relative to it, that the enclosing writer deletes on commit
+STAGED_REMOVALS_FILE = '.removed'
+
+# Section used for endpoints that carry no tags
+DEFAULT_TAG = 'default'
+
+# Inputs generate_documentation() can parse (--source and batch "source")
+SOURCES = ('fastapi', 'flask', 'openapi')
+
+# Decorator names that register FastAPI routes on an app or router
+FASTAPI_ROUTE_METHODS = {'get', 'post', 'put', 'delete', 'patch', 'options', 'head', 'trace'}
+
+# Format of the cached static module summaries, part of their cache kind
+STATIC_SUMMARY_FORMAT = 2
+
+# Flask URL converters with a non-string parameter type
+FLASK_CONVERTER_TYPES = {'int': 'integer', 'float': 'number'}
+
+# Flask config keys read as documentation metadata
+FLASK_METADATA_SETTINGS = {'title': 'API_TITLE', 'version': 'API_VERSION', 'description': 'API_DESCRIPTION'}
+
+# Schema type names that are never linked to a component schema
+SCHEMA_PRIMITIVES = {'string', 'integer', 'number', 'boolean', 'object', 'array', 'null', 'any'}
+
+# Lazily loaded schema section of split-by-tag output
+SCHEMAS_FRAGMENT_FILE = 'schemas.html'
+
+# Labels of annotations already rendered by _annotation_label()
+_ANNOTATION_LABELS: Dict[Any, str] = {}
+
+# JSON schemas generated per Pydantic model class by _model_schemas()
+_MODEL_SCHEMAS: Dict[type, Dict[str, Any]] = {}
+
+# $ref target of a model schema, matching OpenAPI component schemas
+MODEL_REF_TEMPLATE = '#/components/schemas/{model}'
+
+# JSON schemas Pydantic generates for annotations the static extractor reads by name
+_STATIC_TYPE_SCHEMAS = {
+    'str': {'type': 'string'},
+    'int': {'type': 'integer'},
+    'float': {'type': 'number'},
+    'bool': {'type': 'boolean'},
+    'bytes': {'format': 'binary', 'type': 'string'},
+    'dict': {'additionalProperties': True, 'type': 'object'},
+    'Dict': {'additionalProperties': True, 'type': 'object'},
+    'list': {'items': {}, 'type': 'array'},
+    'List': {'items': {}, 'type': 'array'},
+    'datetime': {'format': 'date-time', 'type': 'string'},
+    'date': {'format': 'date', 'type': 'string'},
+    'UUID': {'format': 'uuid', 'type': 'string'},
+    'EmailStr': {'format': 'email', 'type': 'string'},
+    'None': {'type': 'null'},
+    'Any': {}
+}
+
+# Endpoints per rendering task handed to a --jobs worker process
+RENDER_BATCH_SIZE = 256
+
+# Build manifest recording input/content hashes for incremental builds
+MANIFEST_FILE = '.api-doc-manifest.json'
+
+# Delta publishing: change manifest, changelog and per-operation page directory
+DELTA_MANIFEST_FILE = 'delta.json'
+CHANGELOG_FILE = 'CHANGELOG.md'
+OPERATIONS_DIR = 'operations'
+
+# Page of the operations directory linking every current operation
+OPERATIONS_INDEX_FILE = 'index.html'
+
+# Operation fields compared by delta publishing, in changelog order
+DELTA_FIELDS = ('summary', 'description', 'parameters', 'request_body', 'responses', 'tags')
+
+# Polling interval of --watch and the server-sent events path for live reload
+WATCH_INTERVAL = 0.25
+LIVE_RELOAD_PATH = '/__livereload'
+
+# Docs server: keep-alive idle timeout (s), listen backlog and file cache bounds
+SERVE_KEEPALIVE_TIMEOUT = 30
+SERVE_BACKLOG = 256
+SERVE_CACHE_BYTES = 256 * 1024 * 1024
+SERVE_CACHE_MAX_FILE = 16 * 1024 * 1024
+
+# Search API of the docs server: path, page sizes and query expansion limits
+SEARCH_API_PATH = '/__search'
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+SEARCH_PREFIX_EXPANSIONS = 64
+SEARCH_FUZZY_MIN_LENGTH = 4
+# Right shifts applied to stored search weights for prefix and one-edit matches
+SEARCH_PREFIX_SHIFT = 1
+SEARCH_FUZZY_SHIFT = 2
+
+# Asset names carrying a content hash (see _fingerprinted_name), cacheable forever
+FINGERPRINTED_NAME = re.compile(r'\.[0-9a-f]{12}\.[a-z0-9]+$')
+
+# Served text responses below this size are not worth compressing
+GZIP_MIN_SIZE = 1024
+COMPRESSIBLE_TYPES = {'application/javascript', 'application/json', 'image/svg+xml', 'text/javascript'}
+
+# Built-in templates; a theme's templates/ directory overrides any of them
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+# Per-endpoint templates, rendered by compiled built-in code unless a theme overrides them
+ENDPOINT_TEMPLATES = {'html': 'endpoint.html', 'markdown': 'endpoint.md'}
+
+# Compact encoder of navigation rows (json.dumps with options builds one per call)
+_NAV_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+# Key-sorted encoder behind delta publishing's operation fingerprints
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(',', ':'), default=str)
+
+# Module-qualified names (typing.List, models.User) in annotation text
+_QUALIFIED_NAME = re.compile(r'\b(?:\w+\.)+(\w+)')
+
+# <converter(arguments):name> variable parts of a Flask URL rule
+_FLASK_RULE_ARGUMENT = re.compile(r'<(?:(\w+)(?:\([^)]*\))?:)?(\w+)>')
+
+# Characters that HTML escaping replaces
+_HTML_SPECIAL = re.compile(r'[&<>"\']')
+
+# Static search index emitted next to index.html
+SEARCH_INDEX_FILE = 'search-index.json'
+
+# Relative ranking weight of each indexed endpoint and schema field
+SEARCH_FIELD_WEIGHTS = {
+    'path': 8,
+    'name': 8,
+    'summary': 5,
+    'tags': 4,
+    'parameters': 3,
+    'properties': 3,
+    'methods': 2,
+    'description': 1
+}
+
+# Fields of the server-side search index (bit positions of its field masks) and their query aliases
+SEARCH_FIELDS = ('path', 'methods', 'summary', 'description', 'tags', 'parameters', 'name', 'properties')
+SEARCH_FIELD_ALIASES = {
+    'method': 'methods', 'tag': 'tags', 'param': 'parameters', 'params': 'parameters',
+    'parameter': 'parameters', 'property': 'properties', 'prop': 'properties'
+}
+# Result attributes that type: and service: query words filter on
+SEARCH_FILTERS = ('type', 'service')
+
+# Characters tried by the one-edit fuzzy matching of search terms
+_SEARCH_ALPHABET = 'abcdefghijklmnopqrstuvwxyz0123456789'
+
+# Default report path of --profile
+PROFILE_REPORT_FILE = 'api-doc-profile.json'
+
+
+class Profiler:
+    """Records wall time and peak traced allocation per phase, plus counters.
+    
+    Phases nest and are aggregated by name; the peak of a phase covers
+    everything allocated while it ran, nested phases included. Only the
+    thread that created the profiler is measured, so the docs server and
+    render workers never interleave with the build's phases.
+    """
+    
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.counters: Dict[str, int] = {}
+        self._counter_lock = threading.Lock()
+        self.thread = threading.current_thread()
+        self._stack: List[Dict[str, Any]] = []
+        self._started = time.perf_counter()
+        self._elapsed: Optional[float] = None
+        self._owns_tracing = False
+    
+    def start(self) -> None:
+        """Start the wall clock and, if requested, allocation tracing."""
+        import tracemalloc
+        
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        self._started = time.perf_counter()
+        self._elapsed = None
+    
+    def stop(self) -> None:
+        """Stop the wall clock and any tracing this profiler started."""
+        import tracemalloc
+        
+        self._elapsed = time.perf_counter() - self._started
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+    
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the enclosed block as one call of the named phase."""
+        if threading.current_thread() is not self.thread:
+            yield
+            return
+        import tracemalloc
+        
+        tracing = tracemalloc.is_tracing()
+        frame = {'current': 0, 'peak': 0}
+        if tracing:
+            # Fold the running peak into the enclosing phases before resetting it
+            current, peak = tracemalloc.get_traced_memory()
+            for outer in self._stack:
+                outer['peak'] = max(outer['peak'], peak)
+            tracemalloc.reset_peak()
+            frame = {'current': current, 'peak': current}
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._stack.pop()
+            record = self.phases.get(name)
+            if record is None:
+                record = self.phases[name] = {
+                    'name': name, 'depth': len(self._stack), 'calls': 0, 'seconds': 0.0,
+                    # Allocation fields stay null when tracing is off
+                    'peak_alloc_bytes': 0 if tracing else None,
+                    'net_alloc_bytes': 0 if tracing else None
+                }
+            record['calls'] += 1
+            record['seconds'] += seconds
+            if tracing and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                frame['peak'] = max(frame['peak'], peak)
+                record['peak_alloc_bytes'] = max(record['peak_alloc_bytes'], frame['peak'])
+                record['net_alloc_bytes'] += current - frame['current']
+                if self._stack:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], frame['peak'])
+    
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add amount to a named counter; output writer threads count too."""
+        with self._counter_lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def report(self) -> Dict[str, Any]:
+        """Return phases, counters and derived rates as a JSON-serializable dict."""
+        elapsed = self._elapsed if self._elapsed is not None else time.perf_counter() - self._started
+        rates = {}
+        for counter, rate in [('endpoints', 'endpoints_per_second'), ('bytes_written', 'bytes_written_per_second')]:
+            if counter in self.counters and elapsed > 0:
+                rates[rate] = round(self.counters[counter] / elapsed, 1)
+        return {
+            'generator_version': __version__,
+            'python': sys.version.split()[0],
+            'argv': sys.argv[1:],
+            'trace_memory': self.trace_memory,
+            'elapsed_seconds': round(elapsed, 6),
+            'phases': [
+                dict(record, seconds=round(record['seconds'], 6))
+                for record in self.phases.values()
+            ],
+            'counters': dict(self.counters),
+            'rates': rates
+        }
+    
+    def write_report(self, report_path: str) -> None:
+        """Write the report as indented JSON."""
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+            f.write("\n")
+
+
+# Profiler installed by profiling(); None keeps the instrumented methods at full speed
+_active_profiler: Optional[Profiler] = None
+
+
+@contextlib.contextmanager
+def profiling(report_path: Optional[str] = None, trace_memory: bool = True) -> Iterator[Profiler]:
+    """Profile every public APIDocumentationGenerator call made inside the block.
+    
+    Yields the Profiler so callers can add their own phases and counters;
+    the JSON report is written to report_path, if given, on exit.
+    """
+    global _active_profiler
+    
+    profiler = Profiler(trace_memory)
+    previous = _active_profiler
+    _active_profiler = profiler
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _active_profiler = previous
+        if report_path:
+            profiler.write_report(report_path)
+
+
+def _profiled(method: Callable) -> Callable:
+    """Record each call of a generator method as a phase while profiling is active."""
+    name = f"APIDocumentationGenerator.{method.__name__}"
+    parses = method.__name__.startswith('parse_')
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profiler = _active_profiler
+        if profiler is None:
+            return method(self, *args, **kwargs)
+        parsed = len(self.endpoints)
+        with profiler.phase(name):
+            result = method(self, *args, **kwargs)
+        if parses:
+            profiler.count('endpoints', len(self.endpoints) - parsed)
+        return result
+    
+    return wrapper
+
+
+def _detach_profiler() -> None:
+    """Process pool initializer: forked workers neither trace nor report."""
+    global _active_profiler
+    if _active_profiler is not None:
+        import tracemalloc
+        
+        _active_profiler = None
+        tracemalloc.stop()
+
+
+def _profile_count(name: str, amount: int = 1) -> None:
+    """Add to a counter of the active profiler, if any."""
+    if _active_profiler is not None:
+        _active_profiler.count(name, amount)
+
+
+class Parameter:
+    """A documented endpoint parameter.
+    
+    Records are slotted and deduplicated per generator, so a parameter that
+    many operations share (an `id` path parameter, a paging query) is stored
+    once.
+    """
+    
+    __slots__ = ('name', 'type', 'required', 'location', 'default', 'description')
+    
+    def __init__(self, name: str, type: str = 'string', required: bool = False,
+                 location: Optional[str] = None, default: Any = None, description: str = ''):
+        self.name = name
+        self.type = type
+        self.required = required
+        self.location = location
+        self.default = default
+        self.description = description
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Parameter':
+        """Build a parameter from a parsed dict (OpenAPI 'in' becomes location)."""
+        return cls(
+            sys.intern(str(data.get('name', 'unknown'))),
+            sys.intern(str(data.get('type', 'string'))),
+            bool(data.get('required', False)),
+            sys.intern(data['in']) if isinstance(data.get('in'), str) else None,
+            data.get('default'),
+            data.get('description') or ''
+        )
+    
+    def astuple(self) -> tuple:
+        """Return the field values in slot order."""
+        return (self.name, self.type, self.required, self.location, self.default, self.description)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the parameter as a plain dict."""
+        return {
+            'name': self.name,
+            'type': self.type,
+            'required': self.required,
+            'in': self.location,
+            'default': self.default,
+            'description': self.description
+        }
+    
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Parameter) and self.astuple() == other.astuple()
+    
+    def __hash__(self) -> int:
+        return hash((self.name, self.type, self.location))
+    
+    def __repr__(self) -> str:
+        return f"Parameter({self.name!r}, {self.type!r}, required={self.required})"
+
+
+class Endpoint:
+    """A documented operation: its path, HTTP methods and documentation.
+    
+    Methods, tags and parameters are tuples of interned strings and shared
+    Parameter records; responses and request_body stay as parsed dicts.
+    """
+    
+    __slots__ = ('path', 'methods', 'name', 'summary', 'description',
+                 'parameters', 'responses', 'tags', 'request_body')
+    
+    def __init__(self, path: str, methods: tuple, name: str = '', summary: str = '', description: str = '',
+                 parameters: tuple = (), responses: Optional[Dict[str, Any]] = None, tags: tuple = (),
+                 request_body: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.methods = methods
+        self.name = name
+        self.summary = summary
+        self.description = description
+        self.parameters = parameters
+        self.responses = responses if responses is not None else {}
+        self.tags = tags
+        self.request_body = request_body
+    
+    @property
+    def key(self) -> str:
+        """Readable "METHODS path" identifier."""
+        return f"{' '.join(self.methods)} {self.path}"
+    
+    def astuple(self) -> tuple:
+        """Return the field values in slot order, with parameters as tuples."""
+        return (
+            self.path, self.methods, self.name, self.summary, self.description,
+            tuple(param.astuple() for param in self.parameters),
+            self.responses, self.tags, self.request_body
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the endpoint as a plain dict, as earlier versions stored it."""
+        data = {
+            'path': self.path,
+            'methods': list(self.methods),
+            'name': self.name,
+            'summary': self.summary,
+            'description': self.description,
+            'parameters': [param.to_dict() for param in self.parameters],
+            'responses': self.responses,
+            'tags': list(self.tags)
+        }
+        if self.request_body is not None:
+            data['request_body'] = self.request_body
+        return data
+    
+    def __repr__(self) -> str:
+        return f"Endpoint({self.key!r})"
 
 
 class APIDocumentationGenerator:
@@ -31,25 +498,51 @@ class APIDocumentationGenerator:
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
-        self.endpoints = []
+        self.endpoints: List[Endpoint] = []
         self.schemas = {}
+        # Files the parsed documentation depends on, used by --watch
+        self.source_files: List[str] = []
+        # Process pool used for endpoint rendering with --jobs
+        self._render_pool = None
+        self._render_jobs = 1
+        # $ref resolver of the OpenAPI document being parsed
+        self._resolver: Optional['RefResolver'] = None
+        # Shared method/tag tuples and Parameter records, see _endpoint_record()
+        self._interned: Dict[Any, Any] = {}
+        # Content-hashed file names of fingerprinted assets, by logical name
+        self._asset_names: Dict[str, str] = {}
+        # Templates and branding selected by the `theme` setting, see load_theme()
+        self._theme: Optional['Theme'] = None
+        # Staged, threaded writer of the build in progress, see _output()
+        self._writer: Optional['OutputWriter'] = None
+        # Search documents of a streamed build for the server's search API, see _search_documents()
+        self._streamed_documents: Optional[List[Dict[str, Any]]] = None
+        # Downloads URL inputs outside of a remote_specs() block, see _local_spec()
+        self._fetcher: Optional['SpecFetcher'] = None
+        # Schemas of statically parsed Pydantic models by (module file, class), per parse
+        self._static_schemas: Dict[tuple, Dict[str, Any]] = {}
         self.metadata = {
             'title': 'API Documentation',
             'version': '1.0.0',
             'description': 'API Documentation generated automatically'
         }
     
+    @_profiled
     def parse_fastapi_app(self, app_path: str) -> None:
         """Parse FastAPI application for endpoints and schemas."""
-        if not FASTAPI_AVAILABLE:
+        try:
+            from fastapi import FastAPI
+        except ImportError:
             raise ImportError("FastAPI not available. Install with: pip install fastapi")
         
         # Import the FastAPI app
-        sys.path.insert(0, os.path.dirname(app_path))
+        app_dir = os.path.dirname(app_path)
+        sys.path.insert(0, app_dir)
         module_name = os.path.basename(app_path).replace('.py', '')
         
         try:
             module = __import__(module_name)
+            self.source_files = _local_module_files(app_dir or '.')
             app = None
             
             # Find FastAPI app instance
@@ -81,17 +574,19 @@ class APIDocumentationGenerator:
         except Exception as e:
             raise Exception(f"Failed to parse FastAPI app: {e}")
     
-    def _parse_fastapi_route(self, route) -> Optional[Dict[str, Any]]:
+    def _parse_fastapi_route(self, route) -> Optional[Endpoint]:
         """Parse individual FastAPI route."""
         try:
+            response_model = getattr(route, 'response_model', None)
+            self._add_model_schemas(response_model)
             endpoint_data = {
                 'path': route.path,
-                'methods': list(route.methods),
+                'methods': sorted(route.methods),
                 'name': getattr(route, 'name', ''),
                 'summary': '',
                 'description': '',
                 'parameters': [],
-                'responses': {},
+                'responses': _response_model_responses(_annotation_name(response_model)),
                 'tags': getattr(route, 'tags', [])
             }
             
@@ -105,536 +600,4156 @@ class APIDocumentationGenerator:
                 import inspect
                 signature = inspect.signature(func)
                 for param_name, param in signature.parameters.items():
-                    if param_name not in ['request', 'response']:
+                    if param.annotation != param.empty and self._add_model_schemas(param.annotation):
+                        # Pydantic model parameters are read from the JSON request body
+                        endpoint_data.setdefault('request_body', {
+                            'required': param.default == param.empty,
+                            'model': _annotation_label(param.annotation)
+                        })
+                    elif param_name not in ['request', 'response']:
                         param_info = {
                             'name': param_name,
-                            'type': str(param.annotation) if param.annotation != param.empty else 'string',
+                            'type': _annotation_label(param.annotation) if param.annotation != param.empty else 'string',
                             'required': param.default == param.empty,
                             'default': param.default if param.default != param.empty else None
                         }
                         endpoint_data['parameters'].append(param_info)
             
-            return endpoint_data
+            return self._endpoint_record(endpoint_data)
             
         except Exception as e:
             print(f"⚠️  Warning: Failed to parse route {route.path}: {e}")
             return None
     
-    def parse_openapi_spec(self, spec_path: str) -> None:
-        """Parse OpenAPI specification file."""
+    def _add_model_schemas(self, annotation: Any) -> bool:
+        """Add the schemas of the Pydantic models in an annotation to self.schemas.
+        
+        Schemas are generated once per model class and shared by every route
+        (and generator) using it; nested models become their own entries,
+        referenced by name. Returns whether the annotation holds a model.
+        """
+        models = _pydantic_models(annotation)
+        for model in models:
+            for name, schema in _model_schemas(model).items():
+                self.schemas.setdefault(name, schema)
+        return bool(models)
+    
+    @_profiled
+    def parse_fastapi_source(self, app_path: str) -> None:
+        """Extract FastAPI routes statically with ast, without importing the application.
+        
+        Resolves @app/@router method decorators, APIRouter prefixes and tags and
+        include_router calls across the app's local modules. Each module's
+        extracted routes are cached by file content hash.
+        """
         try:
-            with open(spec_path, 'r') as f:
-                if spec_path.endswith('.yaml') or spec_path.endswith('.yml'):
-                    spec = yaml.safe_load(f)
-                else:
-                    spec = json.load(f)
+            self._parse_static_app(app_path, 'FastAPI', _summarize_fastapi_module, _static_fastapi_endpoint)
+            print(f"✅ Parsed {len(self.endpoints)} endpoints from FastAPI source")
+            
+        except Exception as e:
+            raise Exception(f"Failed to parse FastAPI source: {e}")
+    
+    def _add_static_models(self, endpoint: Dict[str, Any], event: Dict[str, Any], module_file: str,
+                           load: Callable[[str], Dict[str, Any]], root: str) -> None:
+        """Treat the Pydantic models of a static FastAPI route as parse_fastapi_app does.
+        
+        Model classes are recognized by their BaseModel ancestry across the
+        local modules. Their schemas are added to self.schemas, and a
+        parameter annotated with one becomes the request body.
+        """
+        self._static_model_schemas_for(event['response_model'], module_file, load, root)
+        parameters = []
+        for source, param in zip(event['parameters'], endpoint['parameters']):
+            if self._static_model_schemas_for(source['type'], module_file, load, root):
+                # Pydantic model parameters are read from the JSON request body
+                endpoint.setdefault('request_body', {'required': param['required'], 'model': param['type']})
+            else:
+                parameters.append(param)
+        endpoint['parameters'] = parameters
+    
+    def _static_model_schemas_for(self, annotation: Optional[str], module_file: str,
+                                  load: Callable[[str], Dict[str, Any]], root: str) -> bool:
+        """Add the schemas of the models named in an annotation's source; return whether there are any."""
+        if not annotation:
+            return False
+        try:
+            node = ast.parse(annotation, mode='eval').body
+        except SyntaxError:
+            return False
+        models = []
+        _static_type_schema(node, module_file, load, root, models)
+        for target in models:
+            for name, schema in _static_model_schemas(target, load, root, self._static_schemas).items():
+                self.schemas.setdefault(name, schema)
+        return bool(models)
+    
+    @_profiled
+    def parse_flask_app(self, app_path: str) -> None:
+        """Parse a Flask application's url_map for endpoints.
+        
+        The app is the module's Flask instance, or what its create_app()
+        factory returns. The extracted routes are cached together with the
+        content hash of every local module the import loaded; while none of
+        them changed, the next build skips the (often slow) import entirely.
+        """
+        app_file = os.path.abspath(app_path)
+        digest = hashlib.sha256(app_file.encode()).hexdigest()
+        cached = self._cache_load('flask-app', digest)
+        if cached is not None and _files_unchanged(cached['files']):
+            self.metadata.update(cached['metadata'])
+            self.endpoints.extend(self._endpoint_record(route) for route in cached['routes'])
+            self.source_files = list(cached['files'])
+            print(f"✅ Parsed {len(self.endpoints)} endpoints from Flask app (cached)")
+            return
+        
+        try:
+            from flask import Flask
+        except ImportError:
+            raise ImportError("Flask not available. Install with: pip install flask")
+        
+        # Import the Flask app
+        app_dir = os.path.dirname(app_path)
+        sys.path.insert(0, app_dir)
+        module_name = os.path.basename(app_path).replace('.py', '')
+        
+        try:
+            module = __import__(module_name)
+            app = next((attr for attr in vars(module).values() if isinstance(attr, Flask)), None)
+            if app is None and callable(getattr(module, 'create_app', None)):
+                # Application factory, as `flask run` discovers it
+                app = module.create_app()
+            if not isinstance(app, Flask):
+                raise ValueError("No Flask app instance found")
+            self.source_files = _local_module_files(app_dir or '.')
+            
+            # Extract metadata
+            metadata = {
+                key: app.config[setting] for key, setting in FLASK_METADATA_SETTINGS.items()
+                if isinstance(app.config.get(setting), str)
+            }
+            self.metadata.update(metadata)
+            
+            # Parse URL rules; static file routes are not part of the API
+            routes = []
+            for rule in app.url_map.iter_rules():
+                if rule.endpoint == 'static' or rule.endpoint.endswith('.static'):
+                    continue
+                view = app.view_functions.get(rule.endpoint)
+                routes.append(_flask_endpoint(rule.rule, rule.methods or (), rule.endpoint,
+                                              getattr(view, '__doc__', None) or ''))
+            self.endpoints.extend(self._endpoint_record(route) for route in routes)
+            
+            files = {}
+            for module_file in self.source_files:
+                with open(module_file, 'rb') as f:
+                    files[module_file] = hashlib.sha256(f.read()).hexdigest()
+            self._cache_store('flask-app', digest, {'files': files, 'metadata': metadata, 'routes': routes})
+            
+            print(f"✅ Parsed {len(self.endpoints)} endpoints from Flask app")
+            
+        except Exception as e:
+            raise Exception(f"Failed to parse Flask app: {e}")
+    
+    @_profiled
+    def parse_flask_source(self, app_path: str) -> None:
+        """Extract Flask routes statically with ast, without importing the application.
+        
+        Resolves @route/@get-style decorators, add_url_rule calls (including
+        MethodView.as_view), Blueprint names and url_prefix and
+        register_blueprint calls across the app's local modules, also inside
+        an application factory. Each module's extracted routes are cached by
+        file content hash, so unchanged blueprints are not parsed again.
+        """
+        try:
+            self._parse_static_app(app_path, 'Flask', _summarize_flask_module, _static_flask_endpoint)
+            print(f"✅ Parsed {len(self.endpoints)} endpoints from Flask source")
+            
+        except Exception as e:
+            raise Exception(f"Failed to parse Flask source: {e}")
+    
+    def _parse_static_app(self, app_path: str, framework: str,
+                          summarize: Callable[[bytes, str], Dict[str, Any]],
+                          build: Callable[[Dict[str, Any], str, List[str]], Dict[str, Any]]) -> None:
+        """Collect the routes of the first app in app_path from its modules' static summaries."""
+        app_file = os.path.abspath(app_path)
+        root = os.path.dirname(app_file)
+        kind = f"{framework.lower()}-ast{STATIC_SUMMARY_FORMAT}"
+        modules: Dict[str, Dict[str, Any]] = {}
+        
+        def load(module_file: str) -> Dict[str, Any]:
+            if module_file not in modules:
+                modules[module_file] = self._scan_module(module_file, kind, summarize)
+            return modules[module_file]
+        
+        self._static_schemas = {}
+        with _gc_paused():
+            apps = load(app_file)['apps']
+            if not apps:
+                raise ValueError(f"No {framework} app instance found")
+            app_name, app_info = next(iter(apps.items()))
             
             # Extract metadata
-            info = spec.get('info', {})
             self.metadata.update({
-                'title': info.get('title', 'API Documentation'),
-                'version': info.get('version', '1.0.0'),
-                'description': info.get('description', '')
+                key: value for key, value in app_info.items() if isinstance(value, str)
             })
             
-            # Parse paths
-            paths = spec.get('paths', {})
-            for path, path_data in paths.items():
-                for method, operation in path_data.items():
-                    if method.upper() in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']:
-                        endpoint = self._parse_openapi_operation(path, method.upper(), operation)
-                        self.endpoints.append(endpoint)
+            routes = self._collect_static_routes(app_file, app_name, '', [], load, root,
+                                                 {(app_file, app_name)}, build)
+            self.endpoints.extend(self._endpoint_record(route) for route in routes)
+        
+        self.source_files = list(modules)
+    
+    def _scan_module(self, module_file: str, kind: str,
+                     summarize: Callable[[bytes, str], Dict[str, Any]]) -> Dict[str, Any]:
+        """Summarize one module's apps, routers and routes, cached by content hash."""
+        with open(module_file, 'rb') as f:
+            source = f.read()
+        
+        digest = hashlib.sha256(source).hexdigest()
+        summary = self._cache_load(kind, digest)
+        if summary is None:
+            summary = summarize(source, module_file)
+            self._cache_store(kind, digest, summary)
+        return summary
+    
+    def _collect_static_routes(self, module_file: str, owner: str, prefix: str, tags: List[str],
+                               load: Callable[[str], Dict[str, Any]], root: str, active: set,
+                               build: Callable[[Dict[str, Any], str, List[str]], Dict[str, Any]]
+                               ) -> List[Dict[str, Any]]:
+        """Collect the routes registered on an app or router, following include_router calls."""
+        endpoints = []
+        for event in load(module_file)['events']:
+            if event['owner'] != owner:
+                continue
+            
+            if event['kind'] == 'route':
+                endpoint = build(event, prefix, tags)
+                if 'response_model' in event:
+                    self._add_static_models(endpoint, event, module_file, load, root)
+                endpoints.append(endpoint)
+                continue
+            
+            target = _resolve_static_ref(module_file, event['router'], load, root)
+            if target is None:
+                print(f"⚠️  Warning: Could not resolve router {'.'.join(event['router'])} in {module_file}")
+                continue
+            if target in active:
+                continue
             
-            # Parse schemas
-            components = spec.get('components', {})
-            self.schemas = components.get('schemas', {})
+            router = load(target[0])['routers'].get(target[1], {'prefix': '', 'tags': []})
+            # Flask's register_blueprint(url_prefix=...) replaces the blueprint's own prefix
+            router_prefix = router['prefix'] if event.get('url_prefix') is None else event['url_prefix']
+            endpoints.extend(self._collect_static_routes(
+                target[0], target[1],
+                prefix + event['prefix'] + router_prefix,
+                tags + event['tags'] + router['tags'],
+                load, root, active | {target}, build
+            ))
+        return endpoints
+    
+    @_profiled
+    def parse_openapi_spec(self, spec_path: str) -> None:
+        """Parse OpenAPI specification file or URL."""
+        try:
+            # The spec and endpoint list are large, long-lived and acyclic, so
+            # cyclic GC passes over them while they are built are pure overhead
+            with _gc_paused():
+                spec = self._load_spec_file(spec_path)
+                self._use_openapi_document(spec, spec_path)
+                
+                # Parse paths, resolving shared parameters and responses through $refs
+                paths = spec.get('paths', {})
+                for path, path_data in paths.items():
+                    self.endpoints.extend(self._iter_path_operations(path, path_data))
+                self.source_files = [spec_path] + self._resolver.external_files()
+                # Endpoints hold what they reference; the raw document can go
+                self._resolver = None
             
             print(f"✅ Parsed {len(self.endpoints)} endpoints from OpenAPI spec")
             
         except Exception as e:
             raise Exception(f"Failed to parse OpenAPI spec: {e}")
+        finally:
+            self._release_fetcher()
+    
+    def stream_openapi_spec(self, spec_path: str) -> Iterator[Dict[str, Any]]:
+        """Yield the endpoints of a JSON OpenAPI spec one path item at a time.
+        
+        Only the top-level members other than paths are kept in memory. When
+        paths come before components, a first pass skips over them so that
+        $refs can be resolved and a second pass streams the operations.
+        """
+        try:
+            local_path = self._local_spec(spec_path)
+            if local_path.endswith('.yaml') or local_path.endswith('.yml'):
+                raise Exception("Streaming needs a JSON spec; convert the YAML spec or drop --stream")
+            
+            document: Dict[str, Any] = {}
+            prepared = deferred = False
+            with open(local_path, 'rb') as f:
+                stream = JSONStream(f)
+                for key in stream.iter_object():
+                    if key != 'paths':
+                        document[key] = stream.value()
+                    elif 'components' in document or 'definitions' in document:
+                        self._use_openapi_document(document, spec_path)
+                        prepared = True
+                        yield from self._iter_streamed_paths(stream)
+                    else:
+                        stream.skip()
+                        deferred = True
+            
+            if not prepared:
+                self._use_openapi_document(document, spec_path)
+            if deferred:
+                with open(local_path, 'rb') as f:
+                    stream = JSONStream(f)
+                    for key in stream.iter_object():
+                        if key == 'paths':
+                            yield from self._iter_streamed_paths(stream)
+                            break
+                        stream.skip()
+            self.source_files = [spec_path] + self._resolver.external_files()
+            self._resolver = None
+        except Exception as e:
+            raise Exception(f"Failed to parse OpenAPI spec: {e}")
+        finally:
+            self._release_fetcher()
     
-    def _parse_openapi_operation(self, path: str, method: str, operation: Dict[str, Any]) -> Dict[str, Any]:
+    def _iter_streamed_paths(self, stream: 'JSONStream') -> Iterator[Dict[str, Any]]:
+        """Decode the paths object one path item at a time and yield its operations."""
+        for path in stream.iter_object():
+            yield from self._iter_path_operations(path, stream.value())
+    
+    def _use_openapi_document(self, spec: Dict[str, Any], spec_path: str) -> None:
+        """Take metadata, schemas and the $ref resolver from a parsed OpenAPI document."""
+        self.source_files = [spec_path]
+        
+        # Extract metadata
+        info = spec.get('info', {})
+        self.metadata.update({
+            'title': info.get('title', 'API Documentation'),
+            'version': info.get('version', '1.0.0'),
+            'description': info.get('description', '')
+        })
+        
+        # Parse schemas (OpenAPI 3 components or Swagger 2 definitions)
+        components = spec.get('components', {})
+        self.schemas = components.get('schemas') or spec.get('definitions', {})
+        self._resolver = RefResolver(spec, spec_path, self._load_spec_file)
+    
+    def _iter_path_operations(self, path: str, path_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield one endpoint per HTTP operation of an OpenAPI path item."""
+        if '$ref' in path_data:
+            path_data = self._resolver.resolve(path_data)
+        path_parameters = path_data.get('parameters', [])
+        for method, operation in path_data.items():
+            if method.upper() in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']:
+                yield self._parse_openapi_operation(path, method.upper(), operation, path_parameters)
+    
+    def _load_spec_file(self, spec_path: str) -> Dict[str, Any]:
+        """Load a JSON/YAML spec, reusing the cached parse when the content is unchanged."""
+        local_path = self._local_spec(spec_path)
+        with open(local_path, 'rb') as f:
+            data = f.read()
+        
+        digest = hashlib.sha256(data).hexdigest()
+        spec = self._cache_load('spec', digest)
+        if spec is not None:
+            return spec
+        
+        if local_path.endswith('.yaml') or local_path.endswith('.yml'):
+            spec = _load_yaml(data)
+        else:
+            spec = _load_json(data)
+        
+        self._cache_store('spec', digest, spec)
+        return spec
+    
+    def _local_spec(self, spec_path: str) -> str:
+        """Local file of a spec: the path itself, or the fetched copy of a URL."""
+        if not _is_url(spec_path):
+            return spec_path
+        if _active_fetcher is not None:
+            return _active_fetcher.fetch(spec_path)
+        if self._fetcher is None:
+            self._fetcher = SpecFetcher(self._cache_dir())
+        return self._fetcher.fetch(spec_path)
+    
+    def _release_fetcher(self) -> None:
+        """Close this generator's own fetcher once a spec and its references are loaded."""
+        if self._fetcher is not None:
+            self._fetcher.close()
+            self._fetcher = None
+    
+    def _cache_dir(self) -> Optional[Path]:
+        """Return the cache directory, or None when caching is disabled."""
+        if not self.config.get('cache', True):
+            return None
+        return Path(self.config.get('cache_dir') or os.environ.get('API_DOC_GEN_CACHE_DIR') or DEFAULT_CACHE_DIR)
+    
+    def _cache_path(self, kind: str, digest: str) -> Optional[Path]:
+        """Return the cache file for a content digest, or None when caching is disabled."""
+        cache_dir = self._cache_dir()
+        if cache_dir is None:
+            return None
+        key = hashlib.sha256(f"{__version__}:{kind}:{digest}".encode()).hexdigest()
+        return cache_dir / f"{kind}-{key}.pickle"
+    
+    @property
+    def theme(self) -> 'Theme':
+        """Theme selected by the `theme` setting; compiled templates are shared per process."""
+        if self._theme is None:
+            cache_dir = self._cache_dir()
+            self._theme = load_theme(self.config.get('theme'), str(cache_dir / 'templates') if cache_dir else None)
+        return self._theme
+    
+    def _cache_load(self, kind: str, digest: str) -> Any:
+        """Load a cached object keyed by content digest and generator version."""
+        cache_file = self._cache_path(kind, digest)
+        if cache_file is None or not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"⚠️  Warning: Ignoring unreadable cache entry {cache_file}: {e}")
+            return None
+    
+    def _cache_store(self, kind: str, digest: str, value: Any) -> None:
+        """Persist an object to the cache; failures only cost the next run a reparse."""
+        cache_file = self._cache_path(kind, digest)
+        if cache_file is None:
+            return
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            print(f"⚠️  Warning: Failed to write cache entry {cache_file}: {e}")
+    
+    def _parse_openapi_operation(self, path: str, method: str, operation: Dict[str, Any],
+                                 path_parameters: Optional[List[Dict[str, Any]]] = None) -> Endpoint:
         """Parse individual OpenAPI operation."""
-        return {
+        resolve = self._resolver.resolve if self._resolver is not None else _identity
+        
+        # Operation parameters override path-level ones with the same name and location
+        parameters = {}
+        for param in list(path_parameters or []) + list(operation.get('parameters', [])):
+            param = _openapi_parameter(resolve(param))
+            parameters[(param['name'], param.get('in'))] = param
+        
+        endpoint = {
             'path': path,
             'methods': [method],
             'summary': operation.get('summary', ''),
             'description': operation.get('description', ''),
-            'parameters': operation.get('parameters', []),
-            'responses': operation.get('responses', {}),
+            'parameters': list(parameters.values()),
+            'responses': resolve(operation.get('responses', {})),
             'tags': operation.get('tags', [])
         }
+        if 'requestBody' in operation:
+            endpoint['request_body'] = resolve(operation['requestBody'])
+        return self._endpoint_record(endpoint)
+    
+    def _endpoint_record(self, data: Dict[str, Any]) -> Endpoint:
+        """Turn a parsed endpoint dict into a compact Endpoint sharing repeated values.
+        
+        Methods are sorted, so Endpoint.key does not depend on the order a
+        parser (or a framework's method set) produced them in.
+        """
+        return Endpoint(
+            sys.intern(data['path']),
+            self._intern(_interned_strings(sorted(data['methods']))),
+            data.get('name', ''),
+            data.get('summary', ''),
+            data.get('description', ''),
+            self._intern(tuple(self._intern(Parameter.from_dict(param)) for param in data.get('parameters', []))),
+            data.get('responses', {}),
+            self._intern(_interned_strings(data.get('tags') or [])),
+            data.get('request_body')
+        )
+    
+    def _intern(self, value: Any) -> Any:
+        """Return the generator's shared instance of an equal hashable value."""
+        try:
+            return self._interned.setdefault(value, value)
+        except TypeError:
+            return value
+    
+    def iter_endpoints(self, tag: Optional[str] = None) -> Iterator[Endpoint]:
+        """Iterate over the parsed endpoints, optionally only those with a tag."""
+        for endpoint in self.endpoints:
+            if tag is None or tag in (endpoint.tags or (DEFAULT_TAG,)):
+                yield endpoint
+    
+    @_profiled
+    def get_endpoint(self, method: str, path: str) -> Optional[Endpoint]:
+        """Return the endpoint serving an HTTP method on a path, if any."""
+        method = method.upper()
+        for endpoint in self.endpoints:
+            if endpoint.path == path and method in endpoint.methods:
+                return endpoint
+        return None
     
+    @_profiled
     def generate_html_documentation(self, output_dir: str) -> None:
         """Generate HTML documentation."""
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-        
-        # Generate main HTML file
-        html_content = self._generate_html_template()
-        
-        with open(output_path / 'index.html', 'w') as f:
-            f.write(html_content)
-        
-        # Generate CSS file
-        css_content = self._generate_css()
-        with open(output_path / 'styles.css', 'w') as f:
-            f.write(css_content)
-        
-        # Generate JavaScript file
-        js_content = self._generate_javascript()
-        with open(output_path / 'script.js', 'w') as f:
-            f.write(js_content)
-        
-        print(f"✅ Generated HTML documentation in {output_dir}")
+        with self._output(output_dir) as output_path:
+            manifest = BuildManifest(self._writer, self.config.get('incremental', False))
+            fingerprints = self._endpoint_fingerprints()
+            manifest.endpoints = dict(zip(self._endpoint_keys(), fingerprints))
+            
+            groups = self._group_endpoints_by_tag()
+            
+            # Batch builds share one copy of the static assets across services
+            if not self.config.get('shared_assets'):
+                self._write_assets(manifest)
+            
+            # Prebuilt search index answered client-side by script.js; written
+            # before the pages so they can reference its fingerprinted name
+            encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+            self._write_output(
+                manifest, SEARCH_INDEX_FILE,
+                lambda: encoder.iterencode(self._build_search_index(groups)),
+                fingerprints + list(groups), fingerprint=bool(self.config.get('fingerprint'))
+            )
+            assets = [self._asset_file(name) for name in ['styles.css', 'script.js', SEARCH_INDEX_FILE]]
+            
+            with self._render_workers():
+                if self.config.get('split_by_tag'):
+                    # Lightweight index plus one lazily fetched fragment per tag
+                    tags_path = output_path / 'tags'
+                    tags_path.mkdir(exist_ok=True)
+                    tag_counts = {slug: (tag, len(endpoints)) for slug, (tag, endpoints) in groups.items()}
+                    tag_names = [f"{slug}={tag}:{count}" for slug, (tag, count) in tag_counts.items()]
+                    self._write_output(
+                        manifest, 'index.html', lambda: self._iter_sharded_index(tag_counts),
+                        tag_names + [len(self.schemas)] + assets
+                    )
+                    # Endpoints under several tags keep their index in their first
+                    # tag's section only, so element ids stay unique across sections
+                    slugs = {tag: slug for slug, (tag, _) in groups.items()}
+                    for slug, (tag, endpoints) in groups.items():
+                        anchors = [(i, _tag_anchor(i, endpoint, slug, slugs)) for i, endpoint in endpoints]
+                        self._write_output(
+                            manifest, f'tags/{slug}.html',
+                            lambda anchors=anchors: self._iter_tag_fragment(anchors),
+                            [f"{anchor}:{fingerprints[i]}" for i, anchor in anchors]
+                        )
+                    manifest.prune('tags/')
+                    if self.schemas:
+                        self._write_output(
+                            manifest, SCHEMAS_FRAGMENT_FILE,
+                            lambda: self._iter_schema_fragments(), [self._fingerprint(self.schemas)]
+                        )
+                else:
+                    # Stream main HTML file straight to disk
+                    self._write_output(
+                        manifest, 'index.html', self._iter_html_template,
+                        fingerprints + [self._fingerprint(self.schemas)] + assets
+                    )
+            
+            self._save_manifest(manifest)
+        print(f"✅ Generated HTML documentation in {output_dir}{manifest.summary()}")
     
+    @_profiled
     def generate_markdown_documentation(self, output_dir: str) -> None:
         """Generate Markdown documentation."""
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
+        with self._output(output_dir) as output_path:
+            manifest = BuildManifest(self._writer, self.config.get('incremental', False))
+            fingerprints = self._endpoint_fingerprints()
+            manifest.endpoints = dict(zip(self._endpoint_keys(), fingerprints))
+            
+            with self._render_workers():
+                self._write_output(
+                    manifest, 'README.md', self._iter_markdown_template,
+                    fingerprints + [self._fingerprint(self.schemas)]
+                )
+            
+            self._save_manifest(manifest)
+        print(f"✅ Generated Markdown documentation in {output_dir}{manifest.summary()}")
+    
+    @_profiled
+    def generate_streamed_documentation(self, spec_path: str, output_dir: str, output_format: str = 'html') -> None:
+        """Render a large JSON OpenAPI spec in a single pass over its operations.
         
-        markdown_content = self._generate_markdown_template()
+        Endpoints are rendered as they are decoded and never collected in
+        self.endpoints: fragments, navigation rows and search documents are
+        spooled to temporary files and assembled into the final pages at the
+        end, so memory is bounded by the largest path item plus the search
+        postings. With the search_api setting (--serve), each endpoint's
+        SearchService document is kept for _search_documents(). Every file is
+        rebuilt; --jobs and --incremental do not apply.
+        """
+        import tempfile
         
-        with open(output_path / 'README.md', 'w') as f:
-            f.write(markdown_content)
+        html = output_format in ['html', 'both']
+        markdown = output_format in ['markdown', 'both']
+        split = self.config.get('split_by_tag')
         
-        print(f"✅ Generated Markdown documentation in {output_dir}")
+        with contextlib.ExitStack() as stack:
+            # Entered first, so the spools are closed before the build is applied
+            output_path = stack.enter_context(self._output(output_dir))
+            manifest = BuildManifest(self._writer, False)
+            
+            def spool():
+                return stack.enter_context(tempfile.TemporaryFile(
+                    'w+', encoding='utf-8', buffering=WRITE_BUFFER_SIZE, dir=output_path
+                ))
+            
+            fragments = spool() if html and not split else None
+            nav = spool() if html and not split else None
+            docs = spool() if html else None
+            readme = spool() if markdown else None
+            tag_fragments: Dict[str, Any] = {}
+            tag_counts: Dict[str, Any] = {}
+            slugs: Dict[str, str] = {}
+            taken: set = set()
+            index = SearchIndexBuilder()
+            self._streamed_documents = [] if self.config.get('search_api') else None
+            
+            count = 0
+            for endpoint in self.stream_openapi_spec(spec_path):
+                tags = endpoint.tags or (DEFAULT_TAG,)
+                for tag in tags:
+                    if tag not in slugs:
+                        slug = _assign_tag_slug(tag, slugs, taken)
+                        tag_counts[slug] = [tag, 0]
+                        if html and split:
+                            tag_fragments[slug] = spool()
+                    tag_counts[slugs[tag]][1] += 1
+                
+                separator = "," if count else ""
+                if html:
+                    fragment = self.theme.render_endpoint('html', endpoint, count)
+                    if split:
+                        for tag in tags:
+                            slug = slugs[tag]
+                            anchor = _tag_anchor(count, endpoint, slug, slugs)
+                            tag_fragments[slug].write(
+                                fragment if anchor == count else self.theme.render_endpoint('html', endpoint, anchor)
+                            )
+                    else:
+                        fragments.write(fragment)
+                        nav.write(separator + _encode_nav_row([endpoint.path, ", ".join(endpoint.methods), count]))
+                    doc_row = index.add(endpoint, slugs)
+                    docs.write(separator + json.dumps(doc_row, ensure_ascii=False, separators=(',', ':')))
+                if markdown:
+                    readme.write(self.theme.render_endpoint('markdown', endpoint, count))
+                if self._streamed_documents is not None:
+                    self._streamed_documents.append(self._endpoint_search_document(endpoint, count, slugs))
+                count += 1
+            print(f"✅ Streamed {count} endpoints from OpenAPI spec")
+            _profile_count('endpoints', count)
+            
+            if html:
+                if not self.config.get('shared_assets'):
+                    self._write_assets(manifest)
+                self._write_output(
+                    manifest, SEARCH_INDEX_FILE, lambda: index.iter_json(_iter_spool(docs)),
+                    fingerprint=bool(self.config.get('fingerprint'))
+                )
+                if split:
+                    (output_path / 'tags').mkdir(exist_ok=True)
+                    self._write_output(manifest, 'index.html', lambda: self._iter_sharded_index(tag_counts))
+                    for slug, tag_spool in tag_fragments.items():
+                        self._write_output(manifest, f'tags/{slug}.html', lambda tag_spool=tag_spool: _iter_spool(tag_spool))
+                    if self.schemas:
+                        self._write_output(manifest, SCHEMAS_FRAGMENT_FILE, self._iter_schema_fragments)
+                else:
+                    self._write_output(
+                        manifest, 'index.html',
+                        lambda: self._iter_html_template(
+                            nav=itertools.chain(["["], _iter_spool(nav), ["]"]), fragments=_iter_spool(fragments)
+                        )
+                    )
+                print(f"✅ Generated HTML documentation in {output_dir}")
+            
+            if markdown:
+                self._write_output(
+                    manifest, 'README.md', lambda: self._iter_markdown_template(fragments=_iter_spool(readme))
+                )
+                print(f"✅ Generated Markdown documentation in {output_dir}")
+            
+            self._save_manifest(manifest)
     
-    def _generate_html_template(self) -> str:
-        """Generate HTML template for documentation."""
-        endpoints_html = ""
-        for endpoint in self.endpoints:
-            methods_badges = " ".join([
-                f'<span class="method-badge method-{method.lower()}">{method}</span>'
-                for method in endpoint['methods']
-            ])
-            
-            parameters_html = ""
-            if endpoint['parameters']:
-                parameters_html = "<h4>Parameters</h4><ul>"
-                for param in endpoint['parameters']:
-                    param_type = param.get('type', 'string')
-                    required = "required" if param.get('required', False) else "optional"
-                    parameters_html += f"<li><code>{param['name']}</code> ({param_type}) - {required}</li>"
-                parameters_html += "</ul>"
-            
-            endpoints_html += f"""
-            <div class="endpoint">
-                <div class="endpoint-header">
-                    <h3>{endpoint['path']}</h3>
-                    <div class="methods">{methods_badges}</div>
-                </div>
-                <div class="endpoint-content">
-                    <p class="summary">{endpoint['summary']}</p>
-                    <p class="description">{endpoint['description']}</p>
-                    {parameters_html}
-                </div>
-            </div>
-            """
+    @_profiled
+    def generate_delta_documentation(self, output_dir: str, previous: Optional[str] = None) -> Dict[str, Any]:
+        """Write pages for only the operations that changed since a previous build.
         
-        return f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>{self.metadata['title']}</title>
-            <link rel="stylesheet" href="styles.css">
-        </head>
-        <body>
-            <header>
-                <h1>{self.metadata['title']}</h1>
-                <p class="version">Version {self.metadata['version']}</p>
-                <p class="description">{self.metadata['description']}</p>
-            </header>
-            
-            <nav>
-                <input type="text" id="search" placeholder="Search endpoints...">
-                <div id="endpoint-list">
-                    {self._generate_nav_items()}
-                </div>
-            </nav>
+        Each operation is fingerprinted from the fields _parse_openapi_operation
+        extracts and compared against the delta manifest of the previous
+        build: previous (a manifest or the directory holding one), or the one
+        already in output_dir. Added and changed operations get a standalone
+        page under operations/, and operations/index.html links every current
+        operation; pages of removed operations are deleted. delta.json lists
+        the changes, the files to upload and delete and every fingerprint (the
+        base of the next comparison); CHANGELOG.md describes the change for
+        people. Rendering and upload volume scale with the change, not the
+        API. Returns the delta manifest.
+        """
+        with self._output(output_dir) as output_path:
+            (output_path / OPERATIONS_DIR).mkdir(exist_ok=True)
+            manifest = BuildManifest(self._writer, False)
+            base_path = Path(previous) if previous else self._writer.source(output_path / DELTA_MANIFEST_FILE)
+            base = _load_delta_manifest(base_path, required=bool(previous))
+            previous_operations = base.get('operations', {}) if base.get('fields') == list(DELTA_FIELDS) else {}
             
-            <main>
-                <div id="endpoints">
-                    {endpoints_html}
-                </div>
-            </main>
+            # Canonical JSON is stable across processes and Python versions
+            canonical = _CANONICAL_ENCODER.encode
+            operations: Dict[str, Any] = {}
+            added, changed = [], []
+            pages = []
+            for endpoint in self.endpoints:
+                key = endpoint.key
+                record = endpoint.to_dict()
+                values = [record.get(field) for field in DELTA_FIELDS]
+                fingerprint = hashlib.sha1(canonical(values).encode()).hexdigest()
+                old = previous_operations.get(key)
+                if old and old['fingerprint'] == fingerprint:
+                    operations[key] = old
+                    continue
+                
+                # Field hashes are only computed for new fingerprints and carried forward otherwise
+                operations[key] = {
+                    'fingerprint': fingerprint,
+                    'fields': [hashlib.sha1(canonical(value).encode()).hexdigest()[:12] for value in values]
+                }
+                page = _operation_page(key)
+                pages.append((page, endpoint))
+                if old:
+                    fields = [
+                        field for field, new_hash, old_hash
+                        in zip(DELTA_FIELDS, operations[key]['fields'], old.get('fields', []))
+                        if new_hash != old_hash
+                    ]
+                    changed.append({'key': key, 'page': page, 'fields': fields})
+                else:
+                    added.append({'key': key, 'page': page, 'summary': endpoint.summary})
+            removed = [
+                {'key': key, 'page': _operation_page(key)}
+                for key in previous_operations if key not in operations
+            ]
+            
+            # Operation pages only need the stylesheet, rewritten when it changes
+            files = []
+            css = self._generate_css()
+            css_hash = hashlib.sha256(css.encode('utf-8')).hexdigest()
+            fingerprint = bool(self.config.get('fingerprint'))
+            if base.get('assets', {}).get('styles.css') != css_hash:
+                self._write_output(manifest, 'styles.css', lambda: [css], fingerprint=fingerprint)
+                files.append(self._asset_file('styles.css'))
             
-            <script src="script.js"></script>
-        </body>
-        </html>
+            render = self.theme.endpoint_renderer('html')
+            context = self._page_context(asset_prefix='../', operations_index=OPERATIONS_INDEX_FILE)
+            for i, (page, endpoint) in enumerate(pages):
+                self._write_output(
+                    manifest, f"{OPERATIONS_DIR}/{page}",
+                    lambda: self.theme.generate('operation.html', fragment=render(endpoint, i), **context)
+                )
+            files.extend(f"{OPERATIONS_DIR}/{page}" for page, _ in pages)
+            
+            # The index of every current operation is rewritten only when it changes
+            index_file = f"{OPERATIONS_DIR}/{OPERATIONS_INDEX_FILE}"
+            index_html = "".join(self.theme.generate('operations.html', operations=[
+                {'key': endpoint.key, 'page': _operation_page(endpoint.key), 'summary': endpoint.summary}
+                for endpoint in self.endpoints
+            ], **context))
+            index_hash = hashlib.sha256(index_html.encode('utf-8')).hexdigest()
+            if base.get('assets', {}).get(index_file) != index_hash:
+                self._write_output(manifest, index_file, lambda: [index_html])
+                files.append(index_file)
+            
+            # Pages of removed operations are deleted here and listed for deletion on the host
+            deleted = [f"{OPERATIONS_DIR}/{change['page']}" for change in removed]
+            for name in deleted:
+                for stale in [name, name + '.gz']:
+                    self._writer.remove(output_path / stale)
+            
+            files.extend([CHANGELOG_FILE, DELTA_MANIFEST_FILE])
+            if self.config.get('precompress'):
+                files.extend([name + '.gz' for name in files])
+                deleted.extend([name + '.gz' for name in deleted])
+            
+            unchanged = len(operations) - len(pages)
+            self._write_output(manifest, CHANGELOG_FILE, lambda: self.theme.generate(
+                'CHANGELOG.md', metadata=self.metadata, previous_version=base.get('version'),
+                added=added, changed=changed, removed=removed, unchanged=unchanged
+            ))
+            delta = {
+                'generator': __version__,
+                'title': self.metadata['title'],
+                'version': self.metadata['version'],
+                'previous_version': base.get('version'),
+                'summary': {'added': len(added), 'changed': len(changed), 'removed': len(removed), 'unchanged': unchanged},
+                'added': added,
+                'changed': changed,
+                'removed': removed,
+                'files': files,
+                'deleted': deleted,
+                'assets': {'styles.css': css_hash, index_file: index_hash},
+                'fields': list(DELTA_FIELDS),
+                'operations': operations
+            }
+            self._write_output(manifest, DELTA_MANIFEST_FILE, lambda: [_NAV_ENCODER.encode(delta)])
+        
+        print(f"✅ Delta: {len(added)} added, {len(changed)} changed, {len(removed)} removed, "
+              f"{unchanged} unchanged; {len(files)} files to publish in {output_dir}")
+        return delta
+    
+    @contextlib.contextmanager
+    def _output(self, output_dir: str) -> Iterator[Path]:
+        """Write the enclosed build through an OutputWriter and yield the directory to write into.
+        
+        With the atomic_output setting (the default) that is a staging
+        directory applied on exit; the output_staging setting (batch services)
+        names the enclosing build's one. Nested calls for the same directory,
+        like the HTML and Markdown halves of --format both, share one writer.
         """
+        writer = self._writer
+        if writer is not None and writer.target == Path(output_dir).resolve():
+            yield writer.path
+            return
+        
+        with OutputWriter(output_dir, atomic=self.config.get('atomic_output', True),
+                          staging=self.config.get('output_staging')) as self._writer:
+            try:
+                yield self._writer.path
+            finally:
+                self._writer = writer
     
-    def _generate_nav_items(self) -> str:
-        """Generate navigation items for endpoints."""
-        nav_items = ""
-        for i, endpoint in enumerate(self.endpoints):
-            methods = ", ".join(endpoint['methods'])
-            nav_items += f"""
-            <div class="nav-item" onclick="scrollToEndpoint({i})">
-                <span class="nav-path">{endpoint['path']}</span>
-                <span class="nav-methods">{methods}</span>
-            </div>
-            """
-        return nav_items
+    def _save_manifest(self, manifest: 'BuildManifest') -> None:
+        """Save the build manifest once every queued write has landed."""
+        self._writer.wait()
+        manifest.save()
     
-    def _generate_css(self) -> str:
-        """Generate CSS styles for documentation."""
-        return """
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
+    def _write_output(self, manifest: 'BuildManifest', name: str,
+                      render: Callable[[], Iterable[str]], inputs: Iterable[str] = (),
+                      fingerprint: bool = False) -> bool:
+        """Render and write one output file unless its inputs are unchanged.
         
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            background-color: #f8f9fa;
-        }
+        The file is streamed to a temporary sibling by the build's
+        OutputWriter while its content hash is computed here; an identical
+        result leaves the existing file (and its mtime) untouched. With
+        fingerprint, the file is stored under a content-hashed name recorded
+        in self._asset_names. With the precompress setting a gzip sibling is
+        kept next to it. Renaming into place and compression happen on the
+        writer's threads. Returns True when the file on disk is replaced.
+        """
+        input_hash = self._hash_inputs(name, inputs)
+        if manifest.is_fresh(name, input_hash):
+            manifest.keep(name)
+            self._finish_output(manifest, name, manifest.file_name(name), fingerprint)
+            return False
+        
+        target = manifest.output_path / name
+        tmp_file = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        output = self._writer.open(tmp_file)
+        try:
+            content_hash = self._write_chunks(output, render())
+        except BaseException:
+            output.abort()
+            raise
+        file_name = _fingerprinted_name(name, content_hash) if fingerprint else name
+        if manifest.has_content(name, content_hash) and manifest.file_name(name) == file_name:
+            output.close(functools.partial(os.remove, tmp_file))
+            manifest.record(name, input_hash, content_hash, written=False, file_name=file_name)
+            self._finish_output(manifest, name, file_name, fingerprint)
+            return False
+        
+        output.close(functools.partial(
+            _publish_output, tmp_file, manifest.output_path / file_name, bool(self.config.get('precompress'))
+        ))
+        manifest.record(name, input_hash, content_hash, written=True, file_name=file_name)
+        if fingerprint:
+            self._asset_names[name] = file_name
+        return True
+    
+    def _finish_output(self, manifest: 'BuildManifest', name: str, file_name: str, fingerprint: bool) -> None:
+        """Publish a kept file's asset name and make sure its precompressed sibling exists."""
+        if fingerprint:
+            self._asset_names[name] = file_name
+        if self.config.get('precompress'):
+            file_path = manifest.output_path / file_name
+            self._writer.submit(_write_gzip_sibling, self._writer.source(file_path), False, file_path.parent)
+    
+    def _asset_file(self, name: str) -> str:
+        """Output file name of an asset: content-hashed when fingerprinting is enabled."""
+        if name in self._asset_names or not self.config.get('fingerprint'):
+            return self._asset_names.get(name, name)
+        
+        # Shared assets (batch services) are named without being written here
+        render = {'styles.css': self._generate_css, 'script.js': self._generate_javascript}.get(name)
+        if render is None:
+            return name
+        content_hash = hashlib.sha256(render().encode('utf-8')).hexdigest()
+        self._asset_names[name] = _fingerprinted_name(name, content_hash)
+        return self._asset_names[name]
+    
+    def _write_assets(self, manifest: 'BuildManifest') -> None:
+        """Write styles.css and script.js (fingerprinted when configured)."""
+        fingerprint = bool(self.config.get('fingerprint'))
+        
+        # Generate CSS file
+        self._write_output(manifest, 'styles.css', lambda: [self._generate_css()], fingerprint=fingerprint)
+        
+        # Generate JavaScript file
+        self._write_output(manifest, 'script.js', lambda: [self._generate_javascript()], fingerprint=fingerprint)
+    
+    def _write_chunks(self, output: 'OutputFile', chunks: Iterable[str]) -> str:
+        """Encode rendered chunks once, queue them in WRITE_BUFFER_SIZE blocks and return their hash."""
+        digest = hashlib.sha256()
+        size = 0
+        block = bytearray()
+        for chunk in chunks:
+            encoded = chunk.encode('utf-8')
+            digest.update(encoded)
+            block += encoded
+            if len(block) >= WRITE_BUFFER_SIZE:
+                size += len(block)
+                output.write(block)
+                block = bytearray()
+        size += len(block)
+        output.write(block)
+        _profile_count('files_written')
+        _profile_count('bytes_written', size)
+        return digest.hexdigest()
+    
+    def _hash_inputs(self, name: str, inputs: Iterable[str]) -> str:
+        """Hash everything a rendered file depends on: generator, settings and endpoints."""
+        digest = hashlib.sha256()
+        digest.update(f"{__version__}\0{name}\0".encode())
+        # Where a batch service stages its files does not change what it renders
+        settings = {key: value for key, value in self.config.items() if key != 'output_staging'}
+        digest.update(json.dumps([self.metadata, settings], sort_keys=True, default=str).encode())
+        digest.update(self.theme.fingerprint.encode())
+        for item in inputs:
+            digest.update(b"\0")
+            digest.update(str(item).encode())
+        return digest.hexdigest()
+    
+    def _endpoint_keys(self) -> List[str]:
+        """Return a readable "METHODS path" key per endpoint for the build manifest."""
+        return [endpoint.key for endpoint in self.endpoints]
+    
+    def _endpoint_fingerprints(self) -> List[str]:
+        """Return a content hash per endpoint, computed once per parsed endpoint list."""
+        cached = getattr(self, '_fingerprints', None)
+        if cached is not None and cached[0] is self.endpoints and len(cached[1]) == len(self.endpoints):
+            return cached[1]
+        fingerprints = [self._fingerprint(endpoint) for endpoint in self.endpoints]
+        self._fingerprints = (self.endpoints, fingerprints)
+        return fingerprints
+    
+    @staticmethod
+    def _fingerprint(endpoint: Any) -> str:
+        """Hash the canonical JSON of one endpoint record, stable across processes and Python versions."""
+        if isinstance(endpoint, Endpoint):
+            endpoint = endpoint.to_dict()
+        return hashlib.sha1(_CANONICAL_ENCODER.encode(endpoint).encode()).hexdigest()
+    
+    def _generate_html_template(self) -> str:
+        """Generate HTML template for documentation."""
+        return "".join(self._iter_html_template())
+    
+    def _iter_html_template(self, nav: Optional[Iterable[str]] = None,
+                            fragments: Optional[Iterable[str]] = None) -> Iterator[str]:
+        """Yield the HTML document in chunks, one endpoint batch at a time.
         
-        header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 2rem;
-            text-align: center;
+        Streaming builds pass their spooled navigation data and endpoint
+        fragments instead of rendering them from self.endpoints.
+        """
+        if fragments is None:
+            fragments = self._iter_endpoint_fragments('html', range(len(self.endpoints)))
+        yield from self.theme.generate('index.html', **self._page_context(
+            nav=nav if nav is not None else self._iter_nav_items(),
+            fragments=fragments,
+            schemas=self._iter_schema_fragments() if self.schemas else ()
+        ))
+    
+    def _iter_sharded_index(self, tag_counts: Dict[str, Any]) -> Iterator[str]:
+        """Yield an index page whose tag sections load their endpoints on demand."""
+        yield from self.theme.generate('tag_index.html', **self._page_context(
+            nav=self._iter_nav_data(
+                [str(tag), f"{count} endpoints", slug]
+                for slug, (tag, count) in tag_counts.items()
+            ),
+            tag_counts=tag_counts,
+            schema_count=len(self.schemas),
+            schemas_file=SCHEMAS_FRAGMENT_FILE
+        ))
+    
+    def _iter_tag_fragment(self, anchors: List[Any]) -> Iterator[str]:
+        """Yield the endpoint fragments belonging to a single tag, as (index, anchor) pairs."""
+        yield from self._iter_endpoint_fragments('html', anchors)
+    
+    def _iter_schema_fragments(self) -> Iterator[str]:
+        """Yield one HTML fragment per component schema."""
+        template = self.theme.template('schema.html')
+        for name, schema in self.schemas.items():
+            yield template.render(name=name, schema=schema)
+    
+    def _group_endpoints_by_tag(self) -> Dict[str, Any]:
+        """Group (index, endpoint) pairs by tag, keyed by a URL-safe slug in first-seen order."""
+        groups: Dict[str, Any] = {}
+        slugs: Dict[str, str] = {}
+        taken: set = set()
+        for i, endpoint in enumerate(self.endpoints):
+            for tag in endpoint.tags or (DEFAULT_TAG,):
+                if tag not in slugs:
+                    groups[_assign_tag_slug(tag, slugs, taken)] = (tag, [])
+                groups[slugs[tag]][1].append((i, endpoint))
+        return groups
+    
+    def _build_search_index(self, groups: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a compact inverted index over the searchable endpoint fields."""
+        tag_slugs = {}
+        for slug, (tag, _) in groups.items():
+            tag_slugs[tag] = slug
+        
+        index = SearchIndexBuilder()
+        docs = []
+        for endpoint in self.endpoints:
+            docs.append(index.add(endpoint, tag_slugs))
+        return index.build(docs)
+    
+    def _search_documents(self, page: str = 'index.html') -> List[Dict[str, Any]]:
+        """Describe every endpoint and schema for SearchService: searchable fields and result row.
+        
+        page is the document's URL path below the server root; HTML pages get
+        #endpoint-N / #schema-Name anchors, and endpoint rows carry the slug
+        of the tag section that holds them in split output.
+        """
+        anchors = page.endswith('.html')
+        if self._streamed_documents is not None:
+            # A streamed build kept its endpoints' documents instead of the endpoints
+            endpoint_documents = self._streamed_documents
+        else:
+            slugs = {tag: slug for slug, (tag, _) in self._group_endpoints_by_tag().items()}
+            endpoint_documents = [
+                self._endpoint_search_document(endpoint, i, slugs) for i, endpoint in enumerate(self.endpoints)
+            ]
+        documents = []
+        for document in endpoint_documents:
+            index = document['result']['index']
+            documents.append(dict(document, result=dict(
+                document['result'], url=f"/{page}#endpoint-{index}" if anchors else f"/{page}"
+            )))
+        for name, schema in self.schemas.items():
+            schema = schema if isinstance(schema, dict) else {}
+            properties = schema.get('properties')
+            description = str(schema.get('description') or '')
+            documents.append({
+                'key': f"schema {name}",
+                'fields': {
+                    'name': name,
+                    'description': description,
+                    'properties': " ".join(properties) if isinstance(properties, dict) else ''
+                },
+                'result': {
+                    'type': 'schema',
+                    'name': name,
+                    'description': description,
+                    'url': f"/{page}#schema-{name}" if anchors else f"/{page}"
+                }
+            })
+        return documents
+    
+    @staticmethod
+    def _endpoint_search_document(endpoint: Endpoint, index: int, slugs: Dict[str, str]) -> Dict[str, Any]:
+        """SearchService document of one endpoint, without its URL; slugs must hold its tags."""
+        tags = endpoint.tags or (DEFAULT_TAG,)
+        return {
+            'key': f"endpoint {endpoint.key}",
+            'fields': {
+                'path': endpoint.path,
+                'methods': " ".join(endpoint.methods),
+                'summary': endpoint.summary,
+                'description': endpoint.description,
+                'tags': " ".join(str(tag) for tag in tags),
+                'parameters': " ".join(param.name for param in endpoint.parameters)
+            },
+            'result': {
+                'type': 'endpoint',
+                'path': endpoint.path,
+                'methods': endpoint.methods,
+                'summary': endpoint.summary,
+                'tags': endpoint.tags,
+                'index': index,
+                'section': slugs[tags[0]]
+            }
         }
+    
+    def _page_context(self, **context: Any) -> Dict[str, Any]:
+        """Template variables shared by every page: metadata, asset names, live reload and search."""
+        page = {
+            'metadata': self.metadata,
+            'asset': self._asset_file,
+            'asset_prefix': self.config.get('asset_prefix', ''),
+            'search_index': SEARCH_INDEX_FILE,
+            'live_reload': LIVE_RELOAD_PATH if self.config.get('live_reload') else None,
+            'search_api': SEARCH_API_PATH
+        }
+        page.update(context)
+        return page
+    
+    def _iter_portal_index(self, services: List[Dict[str, Any]]) -> Iterator[str]:
+        """Yield the portal page linking every service documented by a batch build."""
+        yield from self.theme.generate('portal.html', **self._page_context(services=services))
+    
+    @staticmethod
+    def _render_endpoint_html(endpoint: Endpoint, index: Any) -> str:
+        """Render a single endpoint as an HTML fragment; compiled form of endpoint.html.
+        
+        Text is escaped like the autoescaped template, but fields are probed in
+        groups first, since almost none contain a character that needs it.
+        """
+        needs_escape = _HTML_SPECIAL.search
+        escape = _escape_html
+        methods_badges = " ".join([
+            f'<span class="method-badge method-{method.lower()}">{method}</span>'
+            for method in endpoint.methods
+        ])
+        
+        parameters_html = ""
+        if endpoint.parameters:
+            items = []
+            for param in endpoint.parameters:
+                required = "required" if param.required else "optional"
+                name, param_type = param.name, param.type
+                if needs_escape(f"{name}{param_type}"):
+                    name, param_type = escape(name), escape(param_type)
+                items.append(f"<li><code>{name}</code> ({param_type}) - {required}</li>")
+            parameters_html = "<h4>Parameters</h4><ul>" + "".join(items) + "</ul>"
+        
+        request_body = endpoint.request_body
+        if isinstance(request_body, dict):
+            required = "required" if request_body.get('required', False) else "optional"
+            parameters_html += f"<h4>Request Body</h4><p>{_schema_link(_content_label(request_body))} - {required}</p>"
+        
+        if endpoint.responses:
+            items = []
+            for code, response in endpoint.responses.items():
+                if not isinstance(response, dict):
+                    continue
+                label = _content_label(response)
+                schema_html = f" ({_schema_link(label)})" if label else ""
+                description = response.get('description', '')
+                if needs_escape(f"{code}{description}"):
+                    code, description = escape(code), escape(description)
+                items.append(f"<li><code>{code}</code> {description}{schema_html}</li>")
+            parameters_html += "<h4>Responses</h4><ul>" + "".join(items) + "</ul>"
+        
+        path, summary, description = endpoint.path, endpoint.summary, endpoint.description
+        if needs_escape(f"{path}{summary}{description}"):
+            path, summary, description = escape(path), escape(summary), escape(description)
+        
+        return f"""
+            <div class="endpoint" id="endpoint-{index}">
+                <div class="endpoint-header">
+                    <h3>{path}</h3>
+                    <div class="methods">{methods_badges}</div>
+                </div>
+                <div class="endpoint-content">
+                    <p class="summary">{summary}</p>
+                    <p class="description">{description}</p>
+                    {parameters_html}
+                </div>
+            </div>
+"""
+    
+    def _iter_endpoint_fragments(self, kind: str, indices: Iterable[Any]) -> Iterator[str]:
+        """Yield rendered endpoint fragments in order, one batch at a time.
+        
+        Inside _render_workers() batches are rendered by the process pool; at
+        most two batches per worker are in flight so memory stays bounded, and
+        results are consumed first-in first-out so output is deterministic.
+        """
+        if self._render_pool is None:
+            for batch in _batched(indices, RENDER_BATCH_SIZE):
+                yield _render_fragments(self.theme, self.endpoints, kind, batch)
+            return
+        
+        pending: Deque[Any] = deque()
+        for batch in _batched(indices, RENDER_BATCH_SIZE):
+            pending.append(self._render_pool.submit(_render_worker_batch, kind, batch))
+            if len(pending) >= self._render_jobs * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    
+    @contextlib.contextmanager
+    def _render_workers(self) -> Iterator[None]:
+        """Run endpoint rendering on a process pool for the duration of the block (--jobs)."""
+        jobs = int(self.config.get('jobs') or 1)
+        if jobs <= 1 or len(self.endpoints) < RENDER_BATCH_SIZE * 2:
+            yield
+            return
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        # Workers receive the endpoint list once (inherited on fork) and then
+        # only exchange batches of indices and rendered text
+        with ProcessPoolExecutor(jobs, initializer=_init_render_worker, initargs=(self.endpoints, self.theme)) as pool:
+            self._render_pool = pool
+            self._render_jobs = jobs
+            try:
+                yield
+            finally:
+                self._render_pool = None
+    
+    def _generate_nav_items(self) -> str:
+        """Generate navigation items for endpoints."""
+        return "".join(self._iter_nav_items())
+    
+    def _iter_nav_items(self) -> Iterator[str]:
+        """Yield navigation rows for endpoints as a JSON data array."""
+        yield from self._iter_nav_data(
+            [endpoint.path, ", ".join(endpoint.methods), i]
+            for i, endpoint in enumerate(self.endpoints)
+        )
+    
+    def _iter_nav_data(self, rows: Iterable[List[Any]]) -> Iterator[str]:
+        """Yield [label, detail, target] rows for the virtualized navigation.
+        
+        The array is embedded in a JSON script block, so "</" is escaped to keep
+        paths from terminating the block early.
+        """
+        yield "["
+        separator = ""
+        for batch in _batched(rows, RENDER_BATCH_SIZE):
+            # One encoder call per batch: the rows of a JSON array, minus its brackets
+            yield separator + _encode_nav_row(batch)[1:-1]
+            separator = ","
+        yield "]"
+    
+    def _generate_css(self) -> str:
+        """Generate CSS styles for documentation."""
+        return self.theme.render('styles.css')
+    
+    def _generate_javascript(self) -> str:
+        """Generate JavaScript for interactive features."""
+        return self.theme.render('script.js')
+    
+    def _generate_markdown_template(self) -> str:
+        """Generate Markdown template for documentation."""
+        return "".join(self._iter_markdown_template())
+    
+    def _iter_markdown_template(self, fragments: Optional[Iterable[str]] = None) -> Iterator[str]:
+        """Yield the Markdown document in chunks, one endpoint batch at a time."""
+        if fragments is None:
+            fragments = self._iter_endpoint_fragments('markdown', range(len(self.endpoints)))
+        yield from self.theme.generate(
+            'README.md', metadata=self.metadata, fragments=fragments,
+            schemas=self._iter_schema_sections() if self.schemas else ()
+        )
+    
+    def _iter_schema_sections(self) -> Iterator[str]:
+        """Yield one Markdown section per component schema."""
+        template = self.theme.template('schema.md')
+        for name, schema in self.schemas.items():
+            yield template.render(name=name, schema=schema)
+    
+    @staticmethod
+    def _render_endpoint_markdown(endpoint: Endpoint, index: int = 0) -> str:
+        """Render a single endpoint as a Markdown section."""
+        methods = ", ".join(endpoint.methods)
+        parts = [f"""### {endpoint.path}
+
+**Methods:** {methods}
+
+**Summary:** {endpoint.summary}
+
+**Description:** {endpoint.description}
+
+"""]
+        
+        if endpoint.parameters:
+            parts.append("**Parameters:**\n\n")
+            for param in endpoint.parameters:
+                required = "✅ Required" if param.required else "❌ Optional"
+                parts.append(f"- `{param.name}` ({param.type}) - {required}\n")
+            parts.append("\n")
+        
+        request_body = endpoint.request_body
+        if isinstance(request_body, dict):
+            required = "✅ Required" if request_body.get('required', False) else "❌ Optional"
+            parts.append(f"**Request Body:** {_content_label(request_body)} - {required}\n\n")
+        
+        if endpoint.responses:
+            parts.append("**Responses:**\n\n")
+            for code, response in endpoint.responses.items():
+                if not isinstance(response, dict):
+                    continue
+                label = _content_label(response)
+                parts.append(f"- `{code}` {response.get('description', '')}{f' ({label})' if label else ''}\n")
+            parts.append("\n")
         
-        header h1 {
-            font-size: 2.5rem;
-            margin-bottom: 0.5rem;
+        parts.append("---\n\n")
+        return "".join(parts)
+
+
+class SearchIndexBuilder:
+    """Accumulates the inverted search index one endpoint at a time.
+    
+    Terms are sorted so the client can answer prefix queries with a binary
+    search; each posting list is a flat [doc, weight, doc, weight, ...] array.
+    """
+    
+    def __init__(self):
+        self.postings: Dict[str, List[int]] = {}
+        self.count = 0
+    
+    def add(self, endpoint: 'Endpoint', tag_slugs: Dict[str, str]) -> List[str]:
+        """Index an endpoint under the next document number and return its doc row."""
+        tags = endpoint.tags or (DEFAULT_TAG,)
+        fields = {
+            'path': endpoint.path,
+            'methods': " ".join(endpoint.methods),
+            'summary': endpoint.summary,
+            'description': endpoint.description,
+            'tags': " ".join(str(tag) for tag in tags),
+            'parameters': " ".join(param.name for param in endpoint.parameters)
         }
+        weights: Dict[str, int] = {}
+        for field, text in fields.items():
+            for token in set(_tokenize(text)):
+                weights[token] = weights.get(token, 0) + SEARCH_FIELD_WEIGHTS[field]
+        for token, weight in weights.items():
+            self.postings.setdefault(token, []).extend((self.count, weight))
+        self.count += 1
         
-        .version {
-            font-size: 1.1rem;
-            opacity: 0.9;
-            margin-bottom: 0.5rem;
+        return [
+            endpoint.path,
+            ", ".join(endpoint.methods),
+            endpoint.summary,
+            tag_slugs.get(tags[0], DEFAULT_TAG)
+        ]
+    
+    def build(self, docs: List[List[str]]) -> Dict[str, Any]:
+        """Return the index document for the given doc rows."""
+        terms = sorted(self.postings)
+        return {
+            'docs': docs,
+            'terms': terms,
+            'postings': [self.postings[term] for term in terms]
         }
+    
+    def iter_json(self, doc_rows: Iterable[str]) -> Iterator[str]:
+        """Yield the index as compact JSON around pre-encoded, comma-separated doc rows."""
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        terms = sorted(self.postings)
+        yield '{"docs":['
+        yield from doc_rows
+        yield '],"terms":'
+        yield encoder.encode(terms)
+        yield ',"postings":['
+        separator = ""
+        for term in terms:
+            yield separator + encoder.encode(self.postings[term])
+            separator = ","
+        yield ']}'
+
+
+class JSONStream:
+    """Incremental reader that decodes one JSON value at a time from a file.
+    
+    Callers walk objects key by key with iter_object() and decode or skip
+    each value, so memory stays bounded by the largest single value that is
+    decoded rather than by the whole document.
+    """
+    
+    _WHITESPACE = re.compile(r'[ \t\n\r]*')
+    
+    def __init__(self, f, chunk_size: int = WRITE_BUFFER_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.scanner = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+    
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of the object at the current position.
+        
+        The caller must consume each key's value (value(), skip() or a nested
+        iter_object()) before asking for the next key.
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self._expect(':')
+            yield key
+            separator = self._peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or '}}' in JSON object, found {separator!r}")
+    
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self._peek()
+        while True:
+            try:
+                value, end = self.scanner.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Grow the buffer geometrically so long values are rescanned only a few times
+                if not self._fill(len(self.buffer) - self.pos):
+                    raise
+                continue
+            # A number or literal that touches the end of the buffer may continue in the next chunk
+            if not isinstance(value, (dict, list, str)) and self.buffer[end:end + 1] in ('', '.', 'e', 'E') \
+                    and self._fill():
+                continue
+            self.pos = end
+            return value
+    
+    def skip(self) -> None:
+        """Consume the next value; objects are decoded one member at a time."""
+        if self._peek() == '{':
+            for _ in self.iter_object():
+                self.value()
+        else:
+            self.value()
+    
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of input)."""
+        while True:
+            self.pos = self._WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+    
+    def _expect(self, char: str) -> None:
+        """Consume one structural character."""
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON document, found {found or 'end of input'!r}")
+        self.pos += 1
+    
+    def _fill(self, min_size: int = 0) -> bool:
+        """Drop consumed input and read the next chunk; False at end of file."""
+        if self.eof:
+            return False
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        data = self.f.read(max(self.chunk_size, min_size))
+        self.eof = not data
+        self.buffer += self.decoder.decode(data, final=self.eof)
+        return not self.eof
+
+
+class RefResolver:
+    """Resolves JSON references ($ref) of an OpenAPI document on demand.
+    
+    Each reference is resolved at most once and the result is shared by every
+    place that uses it, so documentation for specs with deep shared models
+    stays linear in the spec size. External documents are loaded once per
+    file. A reference reached again while it is still being resolved (a
+    recursive schema) is left as {'$ref': ..., 'x-circular': True}.
+    """
+    
+    def __init__(self, spec: Dict[str, Any], spec_path: str, load_file: Callable[[str], Any]):
+        self.base_file = spec_path if _is_url(spec_path) else os.path.abspath(spec_path)
+        self.documents: Dict[str, Any] = {self.base_file: spec}
+        self.load_file = load_file
+        self._resolved: Dict[tuple, Any] = {}
+        self._active: set = set()
+    
+    def resolve(self, node: Any, base_file: Optional[str] = None) -> Any:
+        """Return node with every reference inside it resolved."""
+        if isinstance(node, dict):
+            ref = node.get('$ref')
+            if isinstance(ref, str):
+                return self.resolve_ref(ref, base_file or self.base_file)
+            return {key: self.resolve(value, base_file) for key, value in node.items()}
+        if isinstance(node, list):
+            return [self.resolve(item, base_file) for item in node]
+        return node
+    
+    def resolve_ref(self, ref: str, base_file: str) -> Any:
+        """Resolve a single reference relative to the document that contains it."""
+        location, _, pointer = ref.partition('#')
+        if _is_url(base_file):
+            from urllib.parse import urljoin
+            
+            # References inside a remote document are URLs relative to it
+            target_file = urljoin(base_file, location) if location else base_file
+        elif _is_url(location):
+            return {'$ref': ref}
+        else:
+            target_file = os.path.normpath(os.path.join(os.path.dirname(base_file), location)) if location else base_file
+        key = (target_file, pointer)
+        
+        if key in self._resolved:
+            return self._resolved[key]
+        if key in self._active:
+            return {'$ref': ref, 'x-circular': True}
+        
+        self._active.add(key)
+        try:
+            target = self._lookup(target_file, pointer)
+            resolved = self.resolve(target, target_file)
+        except (KeyError, IndexError, ValueError, OSError) as e:
+            print(f"⚠️  Warning: Could not resolve $ref {ref}: {e}")
+            resolved = {'$ref': ref}
+        finally:
+            self._active.discard(key)
+        
+        # Remember which component a schema came from so renderers can name it
+        name = _component_schema_name(pointer)
+        if name and isinstance(resolved, dict):
+            resolved = dict(resolved)
+            resolved.setdefault('x-schema-name', name)
+        
+        self._resolved[key] = resolved
+        return resolved
+    
+    def external_files(self) -> List[str]:
+        """Return the external documents loaded while resolving references."""
+        return [path for path in self.documents if path != self.base_file]
+    
+    def _lookup(self, file_path: str, pointer: str) -> Any:
+        """Follow a JSON pointer inside a (possibly external) document."""
+        from urllib.parse import unquote
+        
+        if file_path not in self.documents:
+            self.documents[file_path] = self.load_file(file_path)
+        node = self.documents[file_path]
+        for token in [part for part in pointer.split('/') if part]:
+            token = unquote(token).replace('~1', '/').replace('~0', '~')
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        return node
+
+
+class SpecFetcher:
+    """Downloads remote specs concurrently over pooled keep-alive connections.
+    
+    Each URL's body is kept under the cache directory next to its ETag and
+    Last-Modified validators. Later fetches send If-None-Match and
+    If-Modified-Since and reuse the kept file on 304 Not Modified; because
+    parsed specs are cached by content, an unchanged spec is then neither
+    downloaded nor parsed again. Without a cache directory the bodies go to
+    a temporary directory removed by close(). Connections are pooled per
+    scheme and host and reused while the server keeps them alive; a forked
+    process starts with an empty pool. Every URL is fetched at most once per
+    fetcher.
+    """
+    
+    def __init__(self, cache_dir: Optional[Path] = None, threads: int = FETCH_THREADS,
+                 timeout: float = FETCH_TIMEOUT):
+        self.revalidate = cache_dir is not None
+        if cache_dir is None:
+            import tempfile
+            
+            self.cache_dir = Path(tempfile.mkdtemp(prefix='api-doc-gen-'))
+        else:
+            self.cache_dir = Path(cache_dir) / REMOTE_CACHE_DIR
+        self.threads = threads
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._idle: Dict[tuple, List[Any]] = {}
+        self._fetched: Dict[str, str] = {}
+        self._pid = os.getpid()
+    
+    def fetch_all(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Fetch many specs concurrently and map each URL that could be fetched to its local file.
+        
+        Failures are left out rather than raised, so that every caller of
+        fetch() for a failed URL reports its own error.
+        """
+        urls = list(dict.fromkeys(urls))
+        if len(urls) < 2:
+            fetched = [self._try_fetch(url) for url in urls]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            
+            with ThreadPoolExecutor(min(self.threads, len(urls)), thread_name_prefix='api-doc-fetch') as pool:
+                fetched = list(pool.map(self._try_fetch, urls))
+        return {url: path for url, path in zip(urls, fetched) if path is not None}
+    
+    def fetch(self, url: str) -> str:
+        """Return a local file holding the spec at url, downloading it only when it changed."""
+        with self._lock:
+            if url in self._fetched:
+                return self._fetched[url]
+        import http.client
+        
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        meta_file = self.cache_dir / f"{key}.meta.json"
+        meta = self._load_meta(meta_file) if self.revalidate else {}
+        cached = self.cache_dir / meta['file'] if meta.get('file') else None
+        headers = {'Accept-Encoding': 'gzip', 'User-Agent': f'api-doc-gen/{__version__}'}
+        if cached is not None and cached.exists():
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        else:
+            cached = None
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            response, tmp_file = self._get(url, headers, key)
+        except (OSError, http.client.HTTPException) as e:
+            if cached is None:
+                raise Exception(f"Failed to fetch {url}: {e}")
+            print(f"⚠️  Warning: Could not fetch {url} ({e}); using the cached copy")
+            return self._remember(url, cached)
+        
+        if tmp_file is None:
+            print(f"🌐 {url}: not modified")
+            _profile_count('specs_not_modified')
+            return self._remember(url, cached)
         
-        .description {
-            font-size: 1.1rem;
-            opacity: 0.9;
+        content_type = (response.getheader('Content-Type') or '').lower()
+        is_yaml = 'yaml' in content_type or url.split('?', 1)[0].endswith(('.yaml', '.yml'))
+        spec_file = self.cache_dir / f"{key}{'.yaml' if is_yaml else '.json'}"
+        os.replace(tmp_file, spec_file)
+        if cached is not None and cached != spec_file:
+            with contextlib.suppress(OSError):
+                os.remove(cached)
+        if self.revalidate:
+            self._store_meta(meta_file, {
+                'url': url,
+                'file': spec_file.name,
+                'etag': response.getheader('ETag'),
+                'last_modified': response.getheader('Last-Modified')
+            })
+        size = spec_file.stat().st_size
+        print(f"🌐 {url}: downloaded {size / 1024:.0f} KB")
+        _profile_count('specs_downloaded')
+        _profile_count('bytes_downloaded', size)
+        return self._remember(url, spec_file)
+    
+    def close(self) -> None:
+        """Close idle connections and drop the temporary bodies of a cache-less fetcher."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        if self._pid != os.getpid():
+            return
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+        if not self.revalidate:
+            import shutil
+            
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+    
+    def _try_fetch(self, url: str) -> Optional[str]:
+        """fetch() for the pool of fetch_all: None instead of an exception."""
+        try:
+            return self.fetch(url)
+        except Exception:
+            return None
+    
+    def _remember(self, url: str, spec_file: Path) -> str:
+        """Record the local file of a fetched URL for the rest of this fetcher's life."""
+        with self._lock:
+            self._fetched[url] = str(spec_file)
+        return str(spec_file)
+    
+    def _get(self, url: str, headers: Dict[str, str], key: str) -> tuple:
+        """GET url, following redirects; return the response and the downloaded file (None on 304)."""
+        import http.client
+        from urllib.parse import urljoin, urlsplit
+        
+        for _ in range(FETCH_MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+            for fresh in (False, True):
+                connection, reused = self._acquire(parts.scheme, parts.netloc, fresh)
+                try:
+                    connection.request('GET', target, headers=headers)
+                    response = connection.getresponse()
+                    break
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    # Only a pooled connection the server closed while idle is retried
+                    if not reused:
+                        raise
+            
+            try:
+                location = response.getheader('Location')
+                if response.status in (301, 302, 303, 307, 308) and location:
+                    response.read()
+                    url = urljoin(url, location)
+                    continue
+                if response.status == 304:
+                    response.read()
+                    return response, None
+                if response.status != 200:
+                    response.read()
+                    raise http.client.HTTPException(f"HTTP {response.status} {response.reason}")
+                return response, self._download(response, key)
+            finally:
+                self._release(parts.scheme, parts.netloc, connection, response)
+        raise http.client.HTTPException(f"more than {FETCH_MAX_REDIRECTS} redirects")
+    
+    def _download(self, response: Any, key: str) -> Path:
+        """Stream a response body, gunzipping it when encoded, into a temporary file."""
+        import zlib
+        
+        tmp_file = self.cache_dir / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        encoding = (response.getheader('Content-Encoding') or '').lower()
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if encoding == 'gzip' else None
+        try:
+            with open(tmp_file, 'wb') as f:
+                while True:
+                    chunk = response.read(WRITE_BUFFER_SIZE)
+                    if not chunk:
+                        break
+                    f.write(decoder.decompress(chunk) if decoder else chunk)
+                if decoder:
+                    f.write(decoder.flush())
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_file)
+            raise
+        return tmp_file
+    
+    def _acquire(self, scheme: str, netloc: str, fresh: bool = False) -> tuple:
+        """Return (connection, reused): an idle pooled connection unless fresh, else a new one."""
+        import http.client
+        
+        with self._lock:
+            if self._pid != os.getpid():
+                # The sockets inherited across fork() still belong to the parent
+                self._idle = {}
+                self._pid = os.getpid()
+            idle = self._idle.get((scheme, netloc))
+            if idle and not fresh:
+                return idle.pop(), True
+        connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return connection_class(netloc, timeout=self.timeout), False
+    
+    def _release(self, scheme: str, netloc: str, connection: Any, response: Any) -> None:
+        """Pool a connection whose response was read to the end and that the server keeps open."""
+        if response.will_close or not response.isclosed():
+            connection.close()
+            return
+        with self._lock:
+            self._idle.setdefault((scheme, netloc), []).append(connection)
+    
+    @staticmethod
+    def _load_meta(meta_file: Path) -> Dict[str, Any]:
+        """Validators and file name stored for a URL, or {} when there are none."""
+        try:
+            with open(meta_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    @staticmethod
+    def _store_meta(meta_file: Path, meta: Dict[str, Any]) -> None:
+        """Write a URL's validators next to its body."""
+        tmp_file = meta_file.with_name(f".{meta_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_file, meta_file)
+
+
+# Fetcher installed by remote_specs(); generators otherwise fetch through their own
+_active_fetcher: Optional[SpecFetcher] = None
+
+
+@contextlib.contextmanager
+def remote_specs(cache_dir: Optional[Path] = None) -> Iterator[SpecFetcher]:
+    """Share one SpecFetcher, with its connections and fetched files, among the generators used in the block."""
+    global _active_fetcher
+    
+    fetcher = SpecFetcher(cache_dir)
+    previous = _active_fetcher
+    _active_fetcher = fetcher
+    try:
+        yield fetcher
+    finally:
+        _active_fetcher = previous
+        fetcher.close()
+
+
+class BuildManifest:
+    """Input and content hashes of the files written into one output directory.
+    
+    With incremental builds enabled the previous manifest is consulted so that
+    files whose inputs did not change are neither re-rendered nor rewritten.
+    Earlier output is read and deleted through the build's OutputWriter.
+    """
+    
+    def __init__(self, writer: 'OutputWriter', incremental: bool = False):
+        self.writer = writer
+        self.output_path = writer.path
+        self.path = writer.path / MANIFEST_FILE
+        self.incremental = incremental
+        self.previous = self._load() if incremental else {}
+        # Entries owned by other formats sharing this directory are carried forward
+        self.files: Dict[str, Dict[str, str]] = dict(self.previous.get('files', {}))
+        self.endpoints: Dict[str, str] = {}
+        self.seen: set = set()
+        self.written = 0
+        self.unchanged = 0
+    
+    def _load(self) -> Dict[str, Any]:
+        """Load the previous manifest, ignoring ones written by another generator version."""
+        try:
+            with open(self.writer.source(self.path), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return manifest if manifest.get('generator') == __version__ else {}
+    
+    def is_fresh(self, name: str, input_hash: str) -> bool:
+        """Whether a file was built from identical inputs and is still on disk."""
+        entry = self.previous.get('files', {}).get(name)
+        return bool(entry) and entry['input'] == input_hash and self._exists(name)
+    
+    def has_content(self, name: str, content_hash: str) -> bool:
+        """Whether the file on disk already holds exactly this content."""
+        entry = self.previous.get('files', {}).get(name)
+        return bool(entry) and entry['output'] == content_hash and self._exists(name)
+    
+    def _exists(self, name: str) -> bool:
+        """Whether the file the previous build wrote for a logical name is still there."""
+        return self.writer.source(self.output_path / self.file_name(name)).exists()
+    
+    def file_name(self, name: str) -> str:
+        """File the previous build wrote for a logical name (differs when fingerprinted)."""
+        return self.previous.get('files', {}).get(name, {}).get('file', name)
+    
+    def keep(self, name: str) -> None:
+        """Carry an up-to-date file over into the new manifest."""
+        self.seen.add(name)
+        self.unchanged += 1
+    
+    def record(self, name: str, input_hash: str, content_hash: str, written: bool,
+               file_name: Optional[str] = None) -> None:
+        """Record the hashes of a freshly rendered file."""
+        self.files[name] = {'input': input_hash, 'output': content_hash}
+        if file_name and file_name != name:
+            self.files[name]['file'] = file_name
+        self.seen.add(name)
+        if written:
+            self.written += 1
+        else:
+            self.unchanged += 1
+    
+    def prune(self, prefix: str) -> None:
+        """Delete files under prefix that the previous build wrote but this one did not."""
+        for name in [name for name in self.files if name.startswith(prefix) and name not in self.seen]:
+            file_name = self.files[name].get('file', name)
+            for stale in [file_name, file_name + '.gz']:
+                self.writer.remove(self.output_path / stale)
+            del self.files[name]
+    
+    def save(self) -> None:
+        """Write the manifest when incremental builds are enabled and something changed.
+        
+        Other builds rewrite files without consulting it, so they delete it
+        rather than leave it describing files it no longer matches.
+        """
+        if not self.incremental:
+            self.writer.remove(self.path)
+            return
+        if (self.written == 0 and self.files == self.previous.get('files')
+                and self.endpoints == self.previous.get('endpoints')):
+            return
+        manifest = {
+            'generator': __version__,
+            'endpoints': self.endpoints,
+            'files': self.files
         }
+        tmp_file = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, separators=(',', ':'))
+        os.replace(tmp_file, self.path)
+    
+    def summary(self) -> str:
+        """Short written/unchanged report for incremental builds."""
+        if not self.incremental:
+            return ""
+        return f" ({self.written} written, {self.unchanged} unchanged)"
+
+
+class OutputWriter:
+    """Writes one build into a staging directory on a bounded thread pool.
+    
+    The staging directory is a sibling of the output directory and receives
+    only the files this build writes; reads of earlier output go through
+    source() and deletions through remove(), so an incremental build costs
+    I/O in proportion to what changed. Rendered text reaches a writer thread
+    as WRITE_BUFFER_SIZE blocks through a short queue: rendering the next
+    block or file overlaps with writing earlier ones while memory stays
+    bounded. On leaving the block every write is awaited, then the staged
+    files are renamed over the output, each after every file it references:
+    assets, then pages, then entry pages (deepest first), then build
+    manifests. Removed files are deleted last, and removed manifests first.
+    Readers see each file either old or new, never partially written, and
+    never a page whose assets are missing; a failed build leaves the output
+    untouched. A
+    first build is renamed into place whole. With staging, the writer stages
+    into that directory of an enclosing build instead (a batch service) and
+    leaves its files and a STAGED_REMOVALS_FILE list for that build's writer
+    to apply. Mount points and non-atomic writers are written in place, each
+    file still being renamed into place only once complete.
+    """
+    
+    def __init__(self, output_dir: str, atomic: bool = True, threads: int = OUTPUT_WRITE_THREADS,
+                 staging: Optional[str] = None):
+        self.target = Path(output_dir).resolve()
+        self.nested = staging is not None
+        if self.nested:
+            self.path = Path(staging).resolve()
+        elif atomic and _stageable(self.target):
+            self.path = self.target.with_name(f".{self.target.name}.staging")
+        else:
+            self.path = self.target
+        self.staged = self.path != self.target
+        self.threads = threads
+        self._pool = None
+        self._futures: List[Any] = []
+        self._removed: set = set()
+    
+    def __enter__(self) -> 'OutputWriter':
+        from concurrent.futures import ThreadPoolExecutor
+        
+        self._pool = ThreadPoolExecutor(self.threads, thread_name_prefix='api-doc-writer')
+        try:
+            if self.staged and not self.nested:
+                self._stage()
+            else:
+                self.path.mkdir(parents=True, exist_ok=True)
+        except BaseException:
+            self._pool.shutdown()
+            self._discard()
+            raise
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._pool.shutdown(wait=True)
+            if exc_type is None:
+                for future in self._futures:
+                    future.result()
+        except BaseException:
+            self._discard()
+            raise
+        if exc_type is not None:
+            self._discard()
+        elif self.nested:
+            self._hand_over()
+        elif self.staged:
+            self._commit()
+    
+    def open(self, file_path: Path) -> 'OutputFile':
+        """Start writing file_path on the pool and return the handle that feeds it."""
+        import queue
+        
+        blocks = queue.Queue(OUTPUT_QUEUE_BLOCKS)
+        self._futures.append(self._pool.submit(_drain_output_file, file_path, blocks))
+        return OutputFile(blocks)
+    
+    def wait(self) -> None:
+        """Block until every queued write and task is done, raising the first error."""
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+    
+    def submit(self, func: Callable, *args: Any) -> None:
+        """Run a follow-up task (e.g. precompression) on the pool; errors surface on exit."""
+        self._futures.append(self._pool.submit(func, *args))
+    
+    def source(self, file_path: Path) -> Path:
+        """File a read of file_path (under self.path) sees: the staged file, else the current output's."""
+        if not self.staged or file_path.exists():
+            return file_path
+        relative = file_path.relative_to(self.path)
+        if relative in self._removed:
+            return file_path
+        return self.target / relative
+    
+    def remove(self, file_path: Path) -> None:
+        """Delete an output file (under self.path); staged builds delete it from the output on commit."""
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(file_path)
+        if self.staged:
+            self._removed.add(file_path.relative_to(self.path))
+    
+    def _stage(self) -> None:
+        """Create an empty staging directory, dropping one left behind."""
+        import shutil
+        
+        if self.path.exists():
+            # Left behind by a build that failed or was killed
+            shutil.rmtree(self.path)
+        self.target.parent.mkdir(parents=True, exist_ok=True)
+        self.path.mkdir()
+    
+    def _hand_over(self) -> None:
+        """List this build's removals for the enclosing writer to apply."""
+        if self._removed:
+            with open(self.path / STAGED_REMOVALS_FILE, 'w', encoding='utf-8') as f:
+                f.write("".join(f"{relative.as_posix()}\n" for relative in sorted(self._removed)))
+    
+    def _commit(self) -> None:
+        """Rename the staged files over the output, delete removed ones and drop the staging directory."""
+        import shutil
+        
+        if not self.target.exists():
+            os.rename(self.path, self.target)
+            return
+        
+        staged = []
+        removed = set(self._removed)
+        for root, _, files in os.walk(self.path):
+            directory = Path(root).relative_to(self.path)
+            (self.target / directory).mkdir(exist_ok=True)
+            for name in files:
+                if name == STAGED_REMOVALS_FILE:
+                    with open(Path(root) / name, 'r', encoding='utf-8') as f:
+                        removed.update(directory / line for line in f.read().splitlines())
+                else:
+                    staged.append(directory / name)
+        
+        # A manifest this build drops must not outlive the files it describes
+        removed.difference_update(staged)
+        for relative in [relative for relative in removed if _commit_rank(relative) == 3]:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.target / relative)
+            removed.discard(relative)
+        
+        # Every file lands after the ones it links to, see _commit_rank()
+        staged.sort(key=lambda relative: (_commit_rank(relative), -len(relative.parts)))
+        for relative in staged:
+            os.replace(self.path / relative, self.target / relative)
+        for relative in removed:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.target / relative)
+        shutil.rmtree(self.path, ignore_errors=True)
+    
+    def _discard(self) -> None:
+        """Drop the staging directory of a failed build."""
+        import shutil
+        
+        if self.staged:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+
+class OutputFile:
+    """Main-thread handle of a file being written by an OutputWriter thread.
+    
+    Blocks are queued with write(); close() queues the action to run once
+    the file is complete (e.g. renaming it into place) and abort() makes the
+    writer thread delete the partial file instead.
+    """
+    
+    def __init__(self, blocks: Any):
+        self._blocks = blocks
+    
+    def write(self, block: bytes) -> None:
+        """Queue a block, waiting while the writer is OUTPUT_QUEUE_BLOCKS behind."""
+        self._blocks.put(block)
+    
+    def close(self, then: Callable[[], None]) -> None:
+        """Finish the file and run then() on the writer thread after it is flushed."""
+        self._blocks.put(then)
+    
+    def abort(self) -> None:
+        """Finish the file and delete it."""
+        self._blocks.put(None)
+
+
+def _commit_rank(relative: Path) -> int:
+    """Commit order of a staged file: 0 assets, 1 pages, 2 entry pages, 3 build manifests.
+    
+    Pages reference (fingerprinted) assets and entry pages reference pages
+    and fragments, while manifests describe everything; a .gz sibling goes
+    with its file.
+    """
+    name = relative.name[:-3] if relative.name.endswith('.gz') else relative.name
+    if name in (MANIFEST_FILE, DELTA_MANIFEST_FILE):
+        return 3
+    if name in ('index.html', 'README.md'):
+        return 2
+    if name.endswith(('.html', '.md')):
+        return 1
+    return 0
+
+
+def _drain_output_file(file_path: Path, blocks: Any) -> None:
+    """Writer thread: write queued blocks until close() or abort(), then act on the file.
+    
+    The queue is always drained to the end, even after an I/O error, so the
+    rendering thread never blocks on a writer that gave up.
+    """
+    error: Optional[OSError] = None
+    f = None
+    try:
+        f = open(file_path, 'wb')
+    except OSError as e:
+        error = e
+    while True:
+        block = blocks.get()
+        if not isinstance(block, (bytes, bytearray)):
+            break
+        if error is None:
+            try:
+                f.write(block)
+            except OSError as e:
+                error = e
+    if f is not None:
+        try:
+            f.close()
+        except OSError as e:
+            error = error or e
+    
+    if error is not None or block is None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(file_path)
+        if error is not None:
+            raise error
+        return
+    block()
+
+
+def _publish_output(tmp_file: Path, file_path: Path, precompress: bool) -> None:
+    """Writer thread: rename a completed file into place and refresh its gzip sibling."""
+    os.replace(tmp_file, file_path)
+    if precompress:
+        _write_gzip_sibling(file_path, force=True)
+
+
+def _stageable(path: Path) -> bool:
+    """Whether files staged next to a directory can be renamed into it: it is not a mount point."""
+    return not os.path.ismount(path)
+
+
+def _is_url(value: Any) -> bool:
+    """Whether an input names a remote spec rather than a local path."""
+    return isinstance(value, str) and value.startswith(('http://', 'https://'))
+
+
+def _load_yaml(data: Any) -> Any:
+    """Parse YAML with libyaml's C loader when available (an order of magnitude faster)."""
+    import yaml
+    return yaml.load(data, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+def _load_json(data: bytes) -> Any:
+    """Parse JSON with orjson when installed, falling back to the stdlib decoder."""
+    try:
+        import orjson
+    except ImportError:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def _annotation_name(annotation: Any) -> Optional[str]:
+    """Render a runtime type annotation the way it reads in source (List[User])."""
+    if annotation is None:
+        return None
+    if isinstance(annotation, type):
+        return annotation.__name__
+    return _QUALIFIED_NAME.sub(r'\1', str(annotation))
+
+
+def _pydantic_models(annotation: Any) -> List[type]:
+    """Pydantic model classes used in a runtime annotation such as List[User] or Optional[Item]."""
+    if isinstance(annotation, type):
+        from pydantic import BaseModel
+        
+        return [annotation] if issubclass(annotation, BaseModel) else []
+    models = []
+    for argument in get_args(annotation):
+        models.extend(_pydantic_models(argument))
+    return models
+
+
+def _model_schemas(model: type) -> Dict[str, Any]:
+    """JSON schemas of a Pydantic model and the models it nests, by name; memoized per class."""
+    schemas = _MODEL_SCHEMAS.get(model)
+    if schemas is None:
+        if hasattr(model, 'model_json_schema'):
+            schema = model.model_json_schema(ref_template=MODEL_REF_TEMPLATE)
+            definitions = schema.pop('$defs', {})
+            if list(schema) == ['$ref']:
+                # A recursive model's schema is a reference to its own definition
+                schema = definitions.pop(model.__name__, schema)
+        else:
+            # Pydantic 1
+            schema = model.schema(ref_template=MODEL_REF_TEMPLATE)
+            definitions = schema.pop('definitions', {})
+        schemas = _MODEL_SCHEMAS[model] = dict(definitions, **{model.__name__: schema})
+    return schemas
+
+
+def _response_model_responses(model_name: Optional[str]) -> Dict[str, Any]:
+    """Build the responses entry recorded for a route's response_model."""
+    if not model_name:
+        return {}
+    return {'200': {'description': 'Successful Response', 'model': model_name}}
+
+
+def _literal(node: Optional[ast.AST], default: Any = None) -> Any:
+    """Evaluate a literal AST node, returning default for anything dynamic."""
+    if node is None:
+        return default
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return default
+
+
+def _dotted_ref(node: ast.AST) -> Optional[List[str]]:
+    """Turn a Name/Attribute chain such as users.router into ['users', 'router']."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return parts[::-1]
+
+
+def _static_parameters(func: ast.AST) -> List[Dict[str, Any]]:
+    """Describe a function's parameters from its signature in source."""
+    args = func.args
+    positional = args.posonlyargs + args.args
+    defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    parameters = []
+    for arg, default in list(zip(positional, defaults)) + list(zip(args.kwonlyargs, args.kw_defaults)):
+        if arg.arg in ['request', 'response']:
+            continue
+        parameters.append({
+            'name': arg.arg,
+            'type': ast.unparse(arg.annotation) if arg.annotation is not None else 'string',
+            'required': default is None,
+            'default': _literal(default, ast.unparse(default)) if default is not None else None
+        })
+    return parameters
+
+
+def _summarize_fastapi_module(source: bytes, filename: str) -> Dict[str, Any]:
+    """Extract FastAPI apps, routers, routes and include_router calls from module source.
+    
+    Only top-level statements are inspected. Routes and includes are kept as
+    events in source order, which is the order FastAPI registers them.
+    """
+    tree = ast.parse(source, filename)
+    summary: Dict[str, Any] = {'imports': {}, 'apps': {}, 'routers': {}, 'classes': {}, 'events': []}
+    
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            _record_static_import(node, summary['imports'])
+        
+        elif isinstance(node, ast.ClassDef):
+            # Any class may be a Pydantic model or the base of one; resolved when routes are built
+            summary['classes'][node.name] = {
+                'bases': [base for base in map(_dotted_ref, node.bases) if base],
+                'doc': ast.get_docstring(node),
+                'fields': [
+                    _static_model_field(statement) for statement in node.body
+                    if isinstance(statement, ast.AnnAssign) and isinstance(statement.target, ast.Name)
+                    and not statement.target.id.startswith('_')
+                    and (_dotted_ref(statement.annotation) or [''])[-1] != 'ClassVar'
+                    and not (isinstance(statement.annotation, ast.Subscript)
+                             and (_dotted_ref(statement.annotation.value) or [''])[-1] == 'ClassVar')
+                ]
+            }
+        
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)) and isinstance(node.value, ast.Call):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names = [target.id for target in targets if isinstance(target, ast.Name)]
+            callee = _dotted_ref(node.value.func) or ['']
+            kwargs = {kw.arg: kw.value for kw in node.value.keywords if kw.arg}
+            for name in names:
+                if callee[-1] == 'FastAPI':
+                    summary['apps'][name] = {
+                        key: _literal(kwargs.get(key)) for key in ['title', 'version', 'description']
+                    }
+                elif callee[-1] == 'APIRouter':
+                    summary['routers'][name] = {
+                        'prefix': _literal(kwargs.get('prefix'), ''),
+                        'tags': list(_literal(kwargs.get('tags'), []))
+                    }
+        
+        elif (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)
+              and isinstance(node.value.func, ast.Attribute)
+              and node.value.func.attr == 'include_router' and node.value.args):
+            owner = _dotted_ref(node.value.func.value)
+            router = _dotted_ref(node.value.args[0])
+            if owner and len(owner) == 1 and router:
+                kwargs = {kw.arg: kw.value for kw in node.value.keywords if kw.arg}
+                summary['events'].append({
+                    'kind': 'include',
+                    'owner': owner[0],
+                    'router': router,
+                    'prefix': _literal(kwargs.get('prefix'), ''),
+                    'tags': list(_literal(kwargs.get('tags'), []))
+                })
+        
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for decorator in node.decorator_list:
+                route = _static_route_decorator(decorator)
+                if route is None:
+                    continue
+                route.update({
+                    'name': node.name,
+                    'doc': ast.get_docstring(node, clean=False) or '',
+                    'parameters': _static_parameters(node)
+                })
+                summary['events'].append(route)
+    
+    return summary
+
+
+def _record_static_import(node: ast.AST, imports: Dict[str, List[Any]]) -> None:
+    """Record the names an import statement binds as [level, module, attribute]."""
+    if isinstance(node, ast.Import):
+        for alias in node.names:
+            if alias.asname:
+                imports[alias.asname] = [0, alias.name, None]
+            else:
+                top = alias.name.split('.')[0]
+                imports[top] = [0, top, None]
+    else:
+        for alias in node.names:
+            imports[alias.asname or alias.name] = [node.level, node.module or '', alias.name]
+
+
+def _static_route_decorator(decorator: ast.AST) -> Optional[Dict[str, Any]]:
+    """Parse @owner.get("/path", ...) style decorators into a route event."""
+    if not (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute)):
+        return None
+    verb = decorator.func.attr
+    owner = _dotted_ref(decorator.func.value)
+    if not owner or len(owner) != 1 or (verb not in FASTAPI_ROUTE_METHODS and verb != 'api_route'):
+        return None
+    
+    kwargs = {kw.arg: kw.value for kw in decorator.keywords if kw.arg}
+    path = _literal(decorator.args[0]) if decorator.args else _literal(kwargs.get('path'))
+    if not isinstance(path, str):
+        return None
+    if verb == 'api_route':
+        methods = [method.upper() for method in _literal(kwargs.get('methods'), ['GET'])]
+    else:
+        methods = [verb.upper()]
+    
+    response_model = kwargs.get('response_model')
+    return {
+        'kind': 'route',
+        'owner': owner[0],
+        'path': path,
+        'methods': methods,
+        'tags': list(_literal(kwargs.get('tags'), [])),
+        'response_model': ast.unparse(response_model) if response_model is not None else None
+    }
+
+
+def _static_fastapi_endpoint(event: Dict[str, Any], prefix: str, tags: List[str]) -> Dict[str, Any]:
+    """Build the same endpoint record parse_fastapi_app produces from a route event."""
+    return {
+        'path': prefix + event['path'],
+        'methods': list(event['methods']),
+        'name': event['name'],
+        'summary': event['name'].replace('_', ' ').title(),
+        'description': event['doc'],
+        'parameters': [dict(param, type=_QUALIFIED_NAME.sub(r'\1', param['type'])) for param in event['parameters']],
+        'responses': _response_model_responses(
+            _QUALIFIED_NAME.sub(r'\1', event['response_model']) if event['response_model'] else None
+        ),
+        'tags': tags + event['tags']
+    }
+
+
+def _static_model_field(node: ast.AnnAssign) -> Dict[str, Any]:
+    """Describe one annotated class attribute: annotation source, default and Field() options."""
+    field: Dict[str, Any] = {'name': node.target.id, 'annotation': ast.unparse(node.annotation), 'required': True}
+    value = node.value
+    if isinstance(value, ast.Call) and (_dotted_ref(value.func) or [''])[-1] == 'Field':
+        kwargs = {kw.arg: kw.value for kw in value.keywords if kw.arg}
+        for option in ['title', 'description']:
+            if isinstance(_literal(kwargs.get(option)), str):
+                field[option] = _literal(kwargs[option])
+        value = value.args[0] if value.args else kwargs.get('default')
+        if 'default_factory' in kwargs:
+            field['required'] = False
+    if value is not None and not (isinstance(value, ast.Constant) and value.value is Ellipsis):
+        field['required'] = False
+        default = _literal(value, field)
+        if default is not field:
+            # Pydantic reports defaults in their JSON form
+            field['default'] = list(default) if isinstance(default, (set, frozenset, tuple)) else default
+    return field
+
+
+def _is_static_model(target: tuple, load: Callable[[str], Dict[str, Any]], root: str, depth: int = 0) -> bool:
+    """Whether a statically parsed class derives from Pydantic's BaseModel."""
+    if depth > 10:
+        return False
+    for base in load(target[0])['classes'][target[1]]['bases']:
+        if base[-1] == 'BaseModel':
+            return True
+        parent = _resolve_static_ref(target[0], base, load, root, kind='classes')
+        if parent is not None and _is_static_model(parent, load, root, depth + 1):
+            return True
+    return False
+
+
+def _static_model_fields(target: tuple, load: Callable[[str], Dict[str, Any]], root: str,
+                         depth: int = 0) -> Dict[str, tuple]:
+    """Fields of a statically parsed model, inherited ones first, as (defining module, field) by name."""
+    info = load(target[0])['classes'][target[1]]
+    fields: Dict[str, tuple] = {}
+    if depth <= 10:
+        for base in reversed(info['bases']):
+            parent = _resolve_static_ref(target[0], base, load, root, kind='classes')
+            if parent is not None:
+                fields.update(_static_model_fields(parent, load, root, depth + 1))
+    for field in info['fields']:
+        fields.pop(field['name'], None)
+        fields[field['name']] = (target[0], field)
+    return fields
+
+
+def _static_type_schema(node: ast.AST, module_file: str, load: Callable[[str], Dict[str, Any]],
+                        root: str, models: List[tuple]) -> Dict[str, Any]:
+    """JSON schema Pydantic generates for an annotation in source; models it names are appended to models.
+    
+    Common builtins, typing generics, unions and models are understood;
+    anything else is left unconstrained ({}).
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        # Forward reference
+        try:
+            node = ast.parse(node.value, mode='eval').body
+        except SyntaxError:
+            return {}
+    if isinstance(node, ast.Constant) and node.value is None:
+        return {'type': 'null'}
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        return _static_union_schema([node.left, node.right], module_file, load, root, models)
+    
+    if isinstance(node, ast.Subscript):
+        name = (_dotted_ref(node.value) or [''])[-1]
+        arguments = node.slice.elts if isinstance(node.slice, ast.Tuple) else [node.slice]
+        if name == 'Optional':
+            return _static_union_schema(arguments + [ast.Constant(None)], module_file, load, root, models)
+        if name == 'Union':
+            return _static_union_schema(arguments, module_file, load, root, models)
+        if name == 'Annotated':
+            return _static_type_schema(arguments[0], module_file, load, root, models)
+        if name in ('List', 'list', 'Sequence', 'Set', 'set', 'FrozenSet', 'frozenset'):
+            schema = {'items': _static_type_schema(arguments[0], module_file, load, root, models), 'type': 'array'}
+            if name.lower() in ('set', 'frozenset'):
+                schema['uniqueItems'] = True
+            return schema
+        if name in ('Dict', 'dict', 'Mapping') and len(arguments) == 2:
+            return {
+                'additionalProperties': _static_type_schema(arguments[1], module_file, load, root, models),
+                'type': 'object'
+            }
+        return {}
+    
+    ref = _dotted_ref(node)
+    if not ref:
+        return {}
+    target = _resolve_static_ref(module_file, ref, load, root, kind='classes')
+    if target is not None and _is_static_model(target, load, root):
+        models.append(target)
+        return {'$ref': MODEL_REF_TEMPLATE.format(model=target[1])}
+    return dict(_STATIC_TYPE_SCHEMAS.get(ref[-1], {}))
+
+
+def _static_union_schema(members: List[ast.AST], module_file: str, load: Callable[[str], Dict[str, Any]],
+                         root: str, models: List[tuple]) -> Dict[str, Any]:
+    """anyOf schema of a Union/Optional, nested unions flattened as Pydantic does."""
+    schemas = []
+    for member in members:
+        schema = _static_type_schema(member, module_file, load, root, models)
+        for option in schema.get('anyOf', [schema]) if list(schema) == ['anyOf'] else [schema]:
+            if option not in schemas:
+                schemas.append(option)
+    return schemas[0] if len(schemas) == 1 else {'anyOf': schemas}
+
+
+def _static_model_schemas(target: tuple, load: Callable[[str], Dict[str, Any]], root: str,
+                          memo: Dict[tuple, Dict[str, Any]]) -> Dict[str, Any]:
+    """JSON schemas of a statically parsed model and the models it nests, by name, as _model_schemas builds them."""
+    if target in memo:
+        return memo[target]
+    # A recursive model reaches itself while its schema is being built
+    memo[target] = {}
+    
+    nested: Dict[str, Any] = {}
+    properties = {}
+    required = []
+    for name, (module_file, field) in _static_model_fields(target, load, root).items():
+        models: List[tuple] = []
+        try:
+            annotation = ast.parse(field['annotation'], mode='eval').body
+        except SyntaxError:
+            annotation = None
+        schema = _static_type_schema(annotation, module_file, load, root, models) if annotation else {}
+        for model in models:
+            if model != target:
+                nested.update(_static_model_schemas(model, load, root, memo))
+        
+        # Pydantic titles every field except a (nullable) reference to a model
+        options = schema.get('anyOf', [])
+        is_ref = '$ref' in schema or (len(options) == 2 and {'type': 'null'} in options
+                                      and any('$ref' in option for option in options))
+        if 'title' in field or not is_ref:
+            schema['title'] = field.get('title') or name.title().replace('_', ' ')
+        if 'default' in field:
+            schema['default'] = field['default']
+        if 'description' in field:
+            schema['description'] = field['description']
+        properties[name] = dict(sorted(schema.items()))
+        if field['required']:
+            required.append(name)
+    
+    info = load(target[0])['classes'][target[1]]
+    schema = {}
+    if info['doc']:
+        schema['description'] = info['doc']
+    schema['properties'] = properties
+    if required:
+        schema['required'] = required
+    schema.update({'title': target[1], 'type': 'object'})
+    nested.pop(target[1], None)
+    memo[target] = dict(sorted(nested.items()), **{target[1]: schema})
+    return memo[target]
+
+
+def _iter_statements(body: List[ast.stmt]) -> Iterator[ast.stmt]:
+    """Yield statements in source order, descending into functions and compound statements."""
+    for node in body:
+        yield node
+        if isinstance(node, ast.ClassDef):
+            continue
+        for field in ('body', 'orelse', 'finalbody'):
+            yield from _iter_statements(getattr(node, field, []))
+        for handler in getattr(node, 'handlers', []):
+            yield from _iter_statements(handler.body)
+
+
+def _summarize_flask_module(source: bytes, filename: str) -> Dict[str, Any]:
+    """Extract Flask apps, blueprints, routes and register_blueprint calls from module source.
+    
+    Unlike FastAPI modules, Flask apps are commonly assembled inside an
+    application factory, so statements nested in functions are inspected as
+    well (in one namespace). Events are kept in source order.
+    """
+    tree = ast.parse(source, filename)
+    summary: Dict[str, Any] = {'imports': {}, 'apps': {}, 'routers': {}, 'events': []}
+    statements = list(_iter_statements(tree.body))
+    
+    # add_url_rule may reference views defined further down
+    views = {
+        node.name: node for node in statements
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+    }
+    
+    for node in statements:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            _record_static_import(node, summary['imports'])
+        
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)) and isinstance(node.value, ast.Call):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names = [target.id for target in targets if isinstance(target, ast.Name)]
+            callee = _dotted_ref(node.value.func) or ['']
+            kwargs = {kw.arg: kw.value for kw in node.value.keywords if kw.arg}
+            for name in names:
+                if callee[-1] == 'Flask':
+                    summary['apps'].setdefault(name, {})
+                elif callee[-1] == 'Blueprint':
+                    blueprint = _literal(node.value.args[0] if node.value.args else kwargs.get('name'))
+                    summary['routers'][name] = {
+                        'prefix': _literal(kwargs.get('url_prefix'), '') or '',
+                        'tags': [blueprint] if isinstance(blueprint, str) else []
+                    }
+        
+        elif (isinstance(node, ast.Assign) and len(node.targets) == 1
+              and isinstance(node.targets[0], ast.Subscript)):
+            # app.config['API_TITLE'] = '...'
+            target = _dotted_ref(node.targets[0].value)
+            setting = _literal(node.targets[0].slice)
+            value = _literal(node.value)
+            if target and len(target) == 2 and target[1] == 'config' and isinstance(value, str):
+                for key, name in FLASK_METADATA_SETTINGS.items():
+                    if setting == name:
+                        summary['apps'].setdefault(target[0], {})[key] = value
+        
+        elif (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)
+              and isinstance(node.value.func, ast.Attribute)):
+            call = node.value
+            owner = _dotted_ref(call.func.value)
+            if not owner or len(owner) != 1:
+                continue
+            kwargs = {kw.arg: kw.value for kw in call.keywords if kw.arg}
+            
+            if call.func.attr == 'register_blueprint' and call.args:
+                router = _dotted_ref(call.args[0])
+                if router:
+                    summary['events'].append({
+                        'kind': 'include',
+                        'owner': owner[0],
+                        'router': router,
+                        'prefix': '',
+                        'tags': [],
+                        'url_prefix': _literal(kwargs.get('url_prefix'))
+                    })
+            
+            elif call.func.attr == 'add_url_rule':
+                route = _static_flask_url_rule(call, kwargs, views)
+                if route is not None:
+                    route['owner'] = owner[0]
+                    summary['events'].append(route)
+        
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for decorator in node.decorator_list:
+                route = _static_flask_route_decorator(decorator)
+                if route is None:
+                    continue
+                route['name'] = route['name'] or node.name
+                route['doc'] = ast.get_docstring(node, clean=False) or ''
+                summary['events'].append(route)
+    
+    return summary
+
+
+def _static_flask_route_decorator(decorator: ast.AST) -> Optional[Dict[str, Any]]:
+    """Parse @owner.route("/path", methods=[...]) and @owner.get("/path") style decorators."""
+    if not (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute)):
+        return None
+    verb = decorator.func.attr
+    owner = _dotted_ref(decorator.func.value)
+    if not owner or len(owner) != 1 or (verb not in FASTAPI_ROUTE_METHODS and verb != 'route'):
+        return None
+    
+    kwargs = {kw.arg: kw.value for kw in decorator.keywords if kw.arg}
+    path = _literal(decorator.args[0]) if decorator.args else _literal(kwargs.get('rule'))
+    if not isinstance(path, str):
+        return None
+    if verb == 'route':
+        methods = [method.upper() for method in _literal(kwargs.get('methods'), None) or ['GET']]
+    else:
+        methods = [verb.upper()]
+    
+    endpoint = _literal(kwargs.get('endpoint'))
+    return {
+        'kind': 'route',
+        'owner': owner[0],
+        'path': path,
+        'methods': methods,
+        'name': endpoint if isinstance(endpoint, str) else ''
+    }
+
+
+def _static_flask_url_rule(call: ast.Call, kwargs: Dict[str, ast.AST],
+                           views: Dict[str, ast.AST]) -> Optional[Dict[str, Any]]:
+    """Parse owner.add_url_rule("/path", endpoint, view_func, methods=[...]) into a route event."""
+    def argument(position: int, name: str) -> Optional[ast.AST]:
+        return call.args[position] if len(call.args) > position else kwargs.get(name)
+    
+    path = _literal(argument(0, 'rule'))
+    if not isinstance(path, str):
+        return None
+    endpoint = _literal(argument(1, 'endpoint'))
+    view_func = argument(2, 'view_func')
+    methods = _literal(kwargs.get('methods'), None)
+    
+    # view_func=UserAPI.as_view('users') documents the class and its HTTP verb methods
+    view = None
+    if (isinstance(view_func, ast.Call) and isinstance(view_func.func, ast.Attribute)
+            and view_func.func.attr == 'as_view'):
+        view = views.get('.'.join(_dotted_ref(view_func.func.value) or []))
+        if not isinstance(endpoint, str) and view_func.args:
+            endpoint = _literal(view_func.args[0])
+        if methods is None and isinstance(view, ast.ClassDef):
+            methods = [
+                item.name for item in view.body
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name in FASTAPI_ROUTE_METHODS
+            ]
+    elif view_func is not None:
+        reference = _dotted_ref(view_func)
+        view = views.get(reference[-1]) if reference else None
+        if not isinstance(endpoint, str) and reference:
+            endpoint = reference[-1]
+    
+    if not isinstance(endpoint, str):
+        return None
+    return {
+        'kind': 'route',
+        'path': path,
+        'methods': [method.upper() for method in methods or ['GET']],
+        'name': endpoint,
+        'doc': (ast.get_docstring(view, clean=False) or '') if view is not None else ''
+    }
+
+
+def _static_flask_endpoint(event: Dict[str, Any], prefix: str, tags: List[str]) -> Dict[str, Any]:
+    """Build the same endpoint record parse_flask_app produces from a route event."""
+    rule = re.sub(r'/{2,}', '/', prefix + event['path']) if prefix else event['path']
+    return _flask_endpoint(rule, event['methods'], '.'.join(tags + [event['name']]), event['doc'])
+
+
+def _flask_endpoint(rule: str, methods: Iterable[str], endpoint: str, doc: str) -> Dict[str, Any]:
+    """Build an endpoint record from a Flask URL rule, its methods and dotted endpoint name.
+    
+    <converter:name> segments become {name} path parameters and the
+    blueprint names of the endpoint become its tags. The HEAD and OPTIONS
+    methods Flask adds to every rule are left out.
+    """
+    parameters = []
+    
+    def parameter(match: re.Match) -> str:
+        converter, name = match.group(1) or 'string', match.group(2)
+        parameters.append({
+            'name': name,
+            'type': FLASK_CONVERTER_TYPES.get(converter, 'string'),
+            'required': True,
+            'in': 'path'
+        })
+        return '{' + name + '}'
+    
+    path = _FLASK_RULE_ARGUMENT.sub(parameter, rule)
+    verbs = sorted(method for method in methods if method not in ('HEAD', 'OPTIONS')) or sorted(methods)
+    *blueprints, name = endpoint.split('.')
+    return {
+        'path': path,
+        'methods': verbs,
+        'name': name,
+        'summary': name.replace('_', ' ').title(),
+        'description': doc,
+        'parameters': parameters,
+        'responses': {},
+        'tags': blueprints
+    }
+
+
+def _files_unchanged(files: Dict[str, str]) -> bool:
+    """Whether every file still has the recorded content hash."""
+    for path, digest in files.items():
+        try:
+            with open(path, 'rb') as f:
+                if hashlib.sha256(f.read()).hexdigest() != digest:
+                    return False
+        except OSError:
+            return False
+    return True
+
+
+def _find_module_file(importer: str, level: int, dotted: str, root: str) -> Optional[str]:
+    """Locate a local module's source file, or None for third-party/unknown modules."""
+    if level:
+        base = os.path.dirname(importer)
+        for _ in range(level - 1):
+            base = os.path.dirname(base)
+        bases = [base]
+    else:
+        bases = [root, os.path.dirname(importer)]
+    
+    relative = dotted.replace('.', os.sep)
+    for base in bases:
+        for candidate in [os.path.join(base, relative + '.py'), os.path.join(base, relative, '__init__.py')]:
+            if relative and os.path.isfile(candidate):
+                return os.path.abspath(candidate)
+    return None
+
+
+def _resolve_static_ref(module_file: str, ref: List[str], load: Callable[[str], Dict[str, Any]],
+                        root: str, depth: int = 0, kind: str = 'routers') -> Optional[tuple]:
+    """Resolve a router (or, with kind='classes', class) reference to the (module file, name) defining it."""
+    if depth > 10:
+        return None
+    summary = load(module_file)
+    name = ref[0]
+    if len(ref) == 1 and name in summary.get(kind, {}):
+        return module_file, name
+    if name not in summary['imports']:
+        return None
+    
+    level, module, attr = summary['imports'][name]
+    if attr is None:
+        # import package.module [as alias]; ref is alias.router
+        target = _find_module_file(module_file, level, module, root)
+        return (target, ref[1]) if target and len(ref) == 2 else None
+    
+    # from package import module; ref is module.router
+    submodule = _find_module_file(module_file, level, f"{module}.{attr}" if module else attr, root)
+    if submodule and len(ref) == 2:
+        return submodule, ref[1]
+    
+    # from module import router, possibly re-exported through a package
+    target = _find_module_file(module_file, level, module, root)
+    if target and len(ref) == 1:
+        return _resolve_static_ref(target, [attr], load, root, depth + 1, kind)
+    return None
+
+
+# Endpoint list of a render worker process, set once by _init_render_worker
+_worker_endpoints: List[Endpoint] = []
+_worker_theme: Optional['Theme'] = None
+
+
+def _init_render_worker(endpoints: List[Endpoint], theme: 'Theme') -> None:
+    """Process pool initializer: keep the endpoint list and theme for later batches."""
+    global _worker_endpoints, _worker_theme
+    _worker_endpoints = endpoints
+    _worker_theme = theme
+    _detach_profiler()
+
+
+def _render_worker_batch(kind: str, indices: List[int]) -> str:
+    """Render a batch of endpoints inside a worker process."""
+    return _render_fragments(_worker_theme, _worker_endpoints, kind, indices)
+
+
+def _render_fragments(theme: 'Theme', endpoints: List[Endpoint], kind: str, indices: Iterable[Any]) -> str:
+    """Render the endpoints at the given indices as one HTML or Markdown chunk.
+    
+    An (index, anchor) pair renders the endpoint under another anchor, for
+    the copies of a multi-tag endpoint outside its first tag's section.
+    """
+    render = theme.endpoint_renderer(kind)
+    return "".join([
+        render(endpoints[i], i) if isinstance(i, int) else render(endpoints[i[0]], i[1]) for i in indices
+    ])
+
+
+def _batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most size items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _interned_strings(values: Iterable[Any]) -> tuple:
+    """Tuple of values with every string interned."""
+    return tuple(sys.intern(value) if isinstance(value, str) else value for value in values)
+
+
+def _annotation_label(annotation: Any) -> str:
+    """Readable, memoized label of a parameter annotation."""
+    try:
+        label = _ANNOTATION_LABELS.get(annotation)
+    except TypeError:
+        return _annotation_name(annotation)
+    if label is None:
+        label = _ANNOTATION_LABELS[annotation] = sys.intern(_annotation_name(annotation))
+    return label
+
+
+def _assign_tag_slug(tag: Any, slugs: Dict[str, str], taken: set) -> str:
+    """Give a newly seen tag a unique URL-safe slug and record it in slugs and taken.
+    
+    taken is the caller's set of the slugs already in slugs, kept next to it
+    so that each new tag costs a set lookup rather than a pass over every tag.
+    """
+    slug = base = re.sub(r'[^a-z0-9]+', '-', str(tag).lower()).strip('-') or DEFAULT_TAG
+    suffix = len(slugs)
+    while slug in taken:
+        slug = f"{base}-{suffix}"
+        suffix += 1
+    slugs[tag] = slug
+    taken.add(slug)
+    return slug
+
+
+def _tag_anchor(index: int, endpoint: 'Endpoint', slug: str, slugs: Dict[str, str]) -> Any:
+    """Anchor of an endpoint inside a tag section: its index under its first tag, unique elsewhere."""
+    if slugs[(endpoint.tags or (DEFAULT_TAG,))[0]] == slug:
+        return index
+    return f"{index}-{slug}"
+
+
+def _encode_nav_row(row: List[Any]) -> str:
+    """Encode one navigation row as compact JSON that is safe inside a script block."""
+    return _NAV_ENCODER.encode(row).replace("</", "<\\/")
+
+
+def _operation_page(key: str) -> str:
+    """Stable, URL-safe page name of an operation key such as "GET /users/{id}"."""
+    slug = re.sub(r'[^a-z0-9]+', '-', key.lower()).strip('-')[:80]
+    return f"{slug}-{hashlib.sha1(key.encode()).hexdigest()[:8]}.html"
+
+
+def _load_delta_manifest(path: Path, required: bool = False) -> Dict[str, Any]:
+    """Load a delta manifest (or the one inside a directory); empty on a first publish."""
+    if path.is_dir():
+        path = path / DELTA_MANIFEST_FILE
+    try:
+        with open(path, 'rb') as f:
+            return json.loads(f.read())
+    except FileNotFoundError:
+        if required:
+            print(f"⚠️  Warning: No delta manifest at {path}, treating every operation as added")
+        return {}
+    except ValueError as e:
+        raise Exception(f"Failed to load delta manifest {path}: {e}")
+
+
+def _fingerprinted_name(name: str, content_hash: str) -> str:
+    """Insert a short content hash before the extension: styles.css -> styles.1a2b3c4d5e6f.css."""
+    stem, dot, extension = name.rpartition('.')
+    if not dot:
+        return f"{name}.{content_hash[:12]}"
+    return f"{stem}.{content_hash[:12]}.{extension}"
+
+
+def _write_gzip_sibling(file_path: Path, force: bool = False, directory: Optional[Path] = None) -> None:
+    """Write file_path.gz at maximum compression unless an up-to-date one exists.
+    
+    With directory, a new archive is written there instead of next to
+    file_path (a staging directory for a file kept from the previous build).
+    """
+    import gzip
+    
+    gz_path = file_path.with_name(file_path.name + '.gz')
+    if not force and gz_path.exists() and gz_path.stat().st_mtime_ns >= file_path.stat().st_mtime_ns:
+        return
+    if directory is not None:
+        gz_path = directory / gz_path.name
+    tmp_file = gz_path.with_name(f".{gz_path.name}.{os.getpid()}.tmp")
+    with open(file_path, 'rb') as source, open(tmp_file, 'wb') as raw:
+        # mtime=0 keeps the archive byte-identical across rebuilds of the same content
+        with gzip.GzipFile(filename='', mode='wb', compresslevel=9, fileobj=raw, mtime=0) as target:
+            while True:
+                chunk = source.read(WRITE_BUFFER_SIZE)
+                if not chunk:
+                    break
+                target.write(chunk)
+    os.replace(tmp_file, gz_path)
+    _profile_count('gzip_bytes_written', gz_path.stat().st_size)
+
+
+def _iter_spool(spool) -> Iterator[str]:
+    """Yield the contents of a spooled temporary file from the start."""
+    spool.seek(0)
+    while True:
+        chunk = spool.read(WRITE_BUFFER_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _identity(value: Any) -> Any:
+    """Return value unchanged."""
+    return value
+
+
+def _component_schema_name(pointer: str) -> Optional[str]:
+    """Return the schema name of a #/components/schemas/X or #/definitions/X pointer."""
+    match = re.fullmatch(r'/(?:components/schemas|definitions)/([^/]+)', pointer)
+    return match.group(1).replace('~1', '/').replace('~0', '~') if match else None
+
+
+def _openapi_parameter(param: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a resolved OpenAPI parameter to carry the name and type renderers use."""
+    if 'name' in param and 'type' in param:
+        return param
+    param = dict(param)
+    param.setdefault('name', str(param.get('$ref', '')).rsplit('/', 1)[-1] or 'unknown')
+    param.setdefault('type', _schema_label(param['schema']) if 'schema' in param else 'string')
+    return param
+
+
+def _schema_label(schema: Any) -> str:
+    """Short type label of a schema: its component name, array[...] or its type."""
+    if not isinstance(schema, dict):
+        return 'any'
+    if 'x-schema-name' in schema:
+        return schema['x-schema-name']
+    if '$ref' in schema:
+        return str(schema['$ref']).rsplit('/', 1)[-1]
+    if schema.get('type') == 'array':
+        return f"array[{_schema_label(schema.get('items'))}]"
+    for combinator in ['oneOf', 'anyOf', 'allOf']:
+        if combinator in schema:
+            separator = ' & ' if combinator == 'allOf' else ' | '
+            return separator.join(_schema_label(option) for option in schema[combinator])
+    return schema.get('type') or ('object' if 'properties' in schema else 'any')
+
+
+def _content_label(body: Dict[str, Any]) -> str:
+    """Label of a request body or response: its model name or first content schema."""
+    if body.get('model'):
+        return body['model']
+    if 'schema' in body:
+        return _schema_label(body['schema'])
+    content = body.get('content')
+    if isinstance(content, dict):
+        for media in content.values():
+            if isinstance(media, dict) and 'schema' in media:
+                return _schema_label(media['schema'])
+    return ''
+
+
+def _schema_link(label: str) -> str:
+    """Link a schema label to its section when it names a component schema (HTML-escaped)."""
+    if re.fullmatch(r'[\w.\-]+', label or '') and label not in SCHEMA_PRIMITIVES:
+        return f'<a href="#schema-{label}">{label}</a>'
+    return _escape_html(label)
+
+
+def _escape_html(value: Any) -> str:
+    """HTML-escape text exactly like template autoescaping; most text needs no change."""
+    text = value if isinstance(value, str) else str(value)
+    if _HTML_SPECIAL.search(text) is None:
+        return text
+    from markupsafe import escape
+    
+    return str(escape(text))
+
+
+def _schema_properties(schema: Any) -> List[tuple]:
+    """List (name, type label, required) for an object schema's properties."""
+    if not isinstance(schema, dict) or not isinstance(schema.get('properties'), dict):
+        return []
+    required = set(schema.get('required') or [])
+    return [(name, _schema_label(prop), name in required) for name, prop in schema['properties'].items()]
+
+
+@contextlib.contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Suspend cyclic GC while bulk-building objects, restoring its previous state."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric search tokens."""
+    return re.findall(r'[a-z0-9]+', str(text).lower())
+
+
+class Theme:
+    """Templates and branding options that shape the rendered documentation.
+    
+    Templates resolve from the theme's templates/ directory first and the
+    built-in TEMPLATES_DIR second, and HTML templates are autoescaped. Each
+    template is compiled once per process, and its bytecode is kept in the
+    template cache so later runs skip parsing. Pages, CSS and JS render once
+    per build, so branding adds nothing per endpoint. Endpoint fragments use
+    the compiled built-in renderers unless the theme supplies its own
+    endpoint.html / endpoint.md.
+    """
+    
+    def __init__(self, path: Optional[str] = None, options: Optional[Dict[str, Any]] = None,
+                 cache_dir: Optional[str] = None):
+        self.path = path
+        self.options = options or {}
+        self.cache_dir = cache_dir
+        self.search_path = ([os.path.join(path, 'templates')] if path else []) + [TEMPLATES_DIR]
+        self._environment = None
+        self._templates: Dict[str, Any] = {}
+        self._endpoint_renderers: Dict[str, Any] = {}
+        self._fingerprint: Optional[str] = None
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Compiled templates are not picklable; worker processes compile their own
+        return dict(self.__dict__, _environment=None, _templates={}, _endpoint_renderers={})
+    
+    @property
+    def environment(self) -> Any:
+        """The Jinja environment, created on first use."""
+        if self._environment is None:
+            import jinja2
+            from markupsafe import Markup
+            
+            bytecode_cache = None
+            if self.cache_dir:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                bytecode_cache = jinja2.FileSystemBytecodeCache(self.cache_dir)
+            environment = jinja2.Environment(
+                loader=jinja2.FileSystemLoader(self.search_path),
+                autoescape=jinja2.select_autoescape(['html']),
+                bytecode_cache=bytecode_cache,
+                auto_reload=False,
+                trim_blocks=True,
+                lstrip_blocks=True,
+                keep_trailing_newline=True
+            )
+            environment.globals.update(
+                theme=self.options,
+                content_label=_content_label,
+                schema_label=_schema_label,
+                schema_properties=_schema_properties,
+                schema_link=lambda label: Markup(_schema_link(label))
+            )
+            self._environment = environment
+        return self._environment
+    
+    def template(self, name: str) -> Any:
+        """Return a compiled template."""
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self.environment.get_template(name)
+        return template
+    
+    def render(self, name: str, **context: Any) -> str:
+        """Render a template to a string."""
+        return self.template(name).render(**context)
+    
+    def generate(self, name: str, **context: Any) -> Iterator[str]:
+        """Render a template in chunks; iterables in the context are consumed lazily."""
+        return self.template(name).generate(**context)
+    
+    def overrides(self, name: str) -> bool:
+        """Whether the theme supplies its own copy of a template."""
+        return bool(self.path) and os.path.isfile(os.path.join(self.path, 'templates', name))
+    
+    def endpoint_renderer(self, kind: str) -> Callable[['Endpoint', int], str]:
+        """Return render(endpoint, index) for 'html' or 'markdown' endpoint fragments.
         
-        nav {
-            width: 300px;
-            position: fixed;
-            top: 0;
-            left: 0;
-            height: 100vh;
-            background: white;
-            border-right: 1px solid #e9ecef;
-            padding: 1rem;
-            overflow-y: auto;
-            margin-top: 200px;
-        }
+        Without a theme override this is the compiled built-in renderer.
+        """
+        render = self._endpoint_renderers.get(kind)
+        if render is None:
+            name = ENDPOINT_TEMPLATES[kind]
+            if self.overrides(name):
+                template = self.template(name)
+                render = lambda endpoint, index: template.render(endpoint=endpoint, index=index)
+            elif kind == 'html':
+                render = APIDocumentationGenerator._render_endpoint_html
+            else:
+                render = APIDocumentationGenerator._render_endpoint_markdown
+            self._endpoint_renderers[kind] = render
+        return render
+    
+    def render_endpoint(self, kind: str, endpoint: 'Endpoint', index: Any) -> str:
+        """Render one endpoint fragment."""
+        return self.endpoint_renderer(kind)(endpoint, index)
+    
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the options and every template source, for incremental builds."""
+        if self._fingerprint is None:
+            digest = hashlib.sha256(json.dumps(self.options, sort_keys=True, default=str).encode())
+            for directory in self.search_path:
+                if not os.path.isdir(directory):
+                    continue
+                for name in sorted(os.listdir(directory)):
+                    file_path = os.path.join(directory, name)
+                    if os.path.isfile(file_path):
+                        with open(file_path, 'rb') as f:
+                            digest.update(f"\0{name}\0".encode() + f.read())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+
+# Themes by (path, options, cache dir), so batch services share compiled templates
+_THEMES: Dict[tuple, Theme] = {}
+
+
+def load_theme(setting: Any = None, cache_dir: Optional[str] = None) -> Theme:
+    """Return the Theme for a `theme` setting.
+    
+    The setting is a theme directory, or a mapping with an optional `path`
+    (or a `name` looked up under ./themes/) plus branding options such as
+    primary_color, secondary_color, font_family, logo and favicon. A theme
+    directory holds template overrides in templates/ and may set default
+    options in config.yaml.
+    """
+    if isinstance(setting, dict):
+        options = dict(setting)
+        path = options.pop('path', None)
+        name = options.pop('name', None)
+    else:
+        options = {}
+        path = setting
+        name = None
+    
+    if not path and name and name != 'default':
+        if os.path.isdir(os.path.join('themes', str(name))):
+            path = os.path.join('themes', str(name))
+        else:
+            print(f"⚠️  Warning: Theme '{name}' not found in ./themes, using the built-in theme")
+    if path:
+        if not os.path.isdir(path):
+            raise Exception(f"Theme directory not found: {path}")
+        theme_config = os.path.join(path, 'config.yaml')
+        if os.path.isfile(theme_config):
+            options = dict(load_config(theme_config) or {}, **options)
+        path = os.path.abspath(path)
+    
+    key = (path, json.dumps(options, sort_keys=True, default=str), cache_dir)
+    if key not in _THEMES:
+        _THEMES[key] = Theme(path, options, cache_dir)
+    return _THEMES[key]
+
+
+def load_config(config_path: str) -> Dict[str, Any]:
+    """Load configuration from YAML file."""
+    try:
+        with open(config_path, 'r') as f:
+            return _load_yaml(f)
+    except Exception as e:
+        print(f"⚠️  Warning: Failed to load config file: {e}")
+        return {}
+
+
+class LiveReloader:
+    """Version counter that wakes live-reload clients after each rebuild."""
+    
+    def __init__(self):
+        self.version = 0
+        self._condition = threading.Condition()
+    
+    def notify(self) -> None:
+        """Signal that the documentation on disk has changed."""
+        with self._condition:
+            self.version += 1
+            self._condition.notify_all()
+    
+    def wait(self, version: int, timeout: float) -> int:
+        """Block until the version moves past the given one or the timeout expires."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+
+class DocsFileCache:
+    """In-memory cache of served files with their gzip encoding and strong ETag.
+    
+    Entries are revalidated against the file's mtime and size on every
+    request, so rebuilds are visible immediately. Bodies larger than
+    SERVE_CACHE_MAX_FILE are served from disk and only their gzip encoding is
+    kept; least recently used entries are evicted beyond SERVE_CACHE_BYTES.
+    """
+    
+    def __init__(self, max_bytes: int = SERVE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._loading: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Return the current entry for a regular file, loading it on a miss."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        if not os.path.isfile(file_path):
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
         
-        #search {
-            width: 100%;
-            padding: 0.75rem;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            margin-bottom: 1rem;
-            font-size: 14px;
-        }
+        entry = self._lookup(file_path, stamp)
+        if entry is not None:
+            return entry
         
-        .nav-item {
-            padding: 0.75rem;
-            margin-bottom: 0.5rem;
-            border-radius: 4px;
-            cursor: pointer;
-            transition: background-color 0.2s;
-        }
+        # Concurrent misses on the same file wait for a single load
+        with self._lock:
+            loading = self._loading.setdefault(file_path, threading.Lock())
+        with loading:
+            entry = self._lookup(file_path, stamp)
+            if entry is None:
+                entry = self._load(file_path, stat)
+                self._store(file_path, entry)
+        return entry
+    
+    def _lookup(self, file_path: str, stamp: tuple) -> Optional[Dict[str, Any]]:
+        """Return a cached entry that still matches the file on disk."""
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is None or entry['stamp'] != stamp:
+                return None
+            # Re-insert to mark the entry as most recently used
+            self._entries[file_path] = self._entries.pop(file_path)
+            return entry
+    
+    def _load(self, file_path: str, stat: os.stat_result) -> Dict[str, Any]:
+        """Read a file and precompute its ETag and gzip encoding."""
+        import gzip
+        import mimetypes
         
-        .nav-item:hover {
-            background-color: #f8f9fa;
-        }
+        content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+        compressible = content_type.startswith('text/') or content_type in COMPRESSIBLE_TYPES
+        if content_type.startswith('text/'):
+            content_type += '; charset=utf-8'
         
-        .nav-path {
-            display: block;
-            font-weight: 600;
-            margin-bottom: 0.25rem;
-        }
+        with open(file_path, 'rb') as f:
+            body = f.read()
+        compressed = None
+        if compressible and len(body) >= GZIP_MIN_SIZE:
+            compressed = _read_gzip_sibling(file_path, stat)
+            if compressed is None:
+                compressed = gzip.compress(body, compresslevel=6, mtime=0)
+            if len(compressed) >= len(body):
+                compressed = None
         
-        .nav-methods {
-            font-size: 12px;
-            color: #6c757d;
+        return {
+            'stamp': (stat.st_mtime_ns, stat.st_size),
+            'type': content_type,
+            'mtime': stat.st_mtime,
+            'etag': hashlib.sha1(body).hexdigest(),
+            'immutable': bool(FINGERPRINTED_NAME.search(os.path.basename(file_path))),
+            'body': body if len(body) <= SERVE_CACHE_MAX_FILE else None,
+            'gzip': compressed
         }
+    
+    def _store(self, file_path: str, entry: Dict[str, Any]) -> None:
+        """Insert an entry and evict the least recently used ones over budget."""
+        entry['cost'] = len(entry['body'] or b'') + len(entry['gzip'] or b'')
+        with self._lock:
+            previous = self._entries.pop(file_path, None)
+            if previous is not None:
+                self.size -= previous['cost']
+            if entry['cost'] > self.max_bytes:
+                return
+            self._entries[file_path] = entry
+            self.size += entry['cost']
+            while self.size > self.max_bytes:
+                evicted = self._entries.pop(next(iter(self._entries)))
+                self.size -= evicted['cost']
+
+
+def _read_gzip_sibling(file_path: str, stat: os.stat_result) -> Optional[bytes]:
+    """Return the build-time file.gz encoding when it is at least as new as the file."""
+    try:
+        gz_stat = os.stat(file_path + '.gz')
+        if gz_stat.st_mtime_ns < stat.st_mtime_ns:
+            return None
+        with open(file_path + '.gz', 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+class SearchService:
+    """In-memory search index over endpoints and schemas, queried by the docs server.
+    
+    Every token maps to three parallel sequences: document numbers, which
+    only grow and so keep each posting list sorted, the document's token
+    weight and its field mask. A query term matches a token exactly or as a
+    prefix, and within one edit when it ends in ~ or matches nothing else;
+    field:term scopes a term to one field. type: and service: filters are
+    indexed as reserved tokens no query word can produce, so they intersect
+    like terms. Weights are stored scaled by 4: exact matches score them as
+    stored, prefix and fuzzy matches shift them right by 1 and 2. Posting
+    lists become scores through dict.update over zip/compress iterators, and
+    terms are intersected rarest first, probing long posting lists by binary
+    search when only a few candidates are left.
+    
+    update() replaces the documents of one scope (a batch service)
+    incrementally: unchanged documents keep their postings, changed and
+    removed ones become tombstones that are purged once they outnumber half
+    of the live documents. Queries and updates are serialized by a lock.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, tuple] = {}
+        self._terms: List[str] = []
+        self._docs: List[Optional[Dict[str, Any]]] = []
+        self._fingerprints: List[int] = []
+        self._keys: Dict[str, int] = {}
+        self._scopes: Dict[str, set] = {}
+        self._dead: set = set()
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def update(self, documents: Iterable[Dict[str, Any]], scope: str = '') -> Dict[str, int]:
+        """Make documents the full content of a scope, re-indexing only new and changed ones."""
+        added = changed = 0
+        with self._lock:
+            vocabulary = len(self._postings)
+            seen = set()
+            for document in documents:
+                key = f"{scope}\0{document['key']}"
+                if key in seen:
+                    # Operations sharing a path and methods stay separate documents
+                    key = f"{key}\0{len(seen)}"
+                seen.add(key)
+                result = dict(document['result'], service=scope) if scope else document['result']
+                fingerprint = hash((tuple(document['fields'].values()), tuple(result.values())))
+                doc = self._keys.get(key)
+                if doc is not None:
+                    if self._fingerprints[doc] == fingerprint:
+                        continue
+                    self._remove(doc)
+                    changed += 1
+                else:
+                    added += 1
+                self._add(key, document['fields'], result, fingerprint)
+            
+            removed = self._scopes.get(scope, set()) - seen
+            for key in removed:
+                self._remove(self._keys.pop(key))
+            self._scopes[scope] = seen
+            
+            if len(self._dead) > max(len(self._keys) // 2, 1000):
+                self._purge()
+            elif len(self._postings) != vocabulary:
+                self._terms = sorted(self._postings)
+        return {'added': added, 'changed': changed, 'removed': len(removed), 'documents': len(self._keys)}
+    
+    def _add(self, key: str, fields: Dict[str, str], result: Dict[str, Any], fingerprint: int) -> None:
+        """Index a document under the next document number."""
+        doc = len(self._docs)
+        weights: Dict[str, int] = {}
+        masks: Dict[str, int] = {}
+        for bit, field in enumerate(SEARCH_FIELDS):
+            text = fields.get(field)
+            if not text:
+                continue
+            weight, flag = SEARCH_FIELD_WEIGHTS[field], 1 << bit
+            for token in set(_tokenize(text)):
+                weights[token] = weights.get(token, 0) + weight
+                masks[token] = masks.get(token, 0) | flag
+        for name in SEARCH_FILTERS:
+            if result.get(name):
+                weights[_search_filter_token(name, result[name])] = 0
         
-        main {
-            margin-left: 300px;
-            padding: 2rem;
-            margin-top: 200px;
-        }
+        postings = self._postings
+        for token, weight in weights.items():
+            entry = postings.get(token)
+            if entry is None:
+                entry = postings[token] = ([], array('H'), array('H'))
+            entry[0].append(doc)
+            entry[1].append(weight << SEARCH_FUZZY_SHIFT)
+            entry[2].append(masks.get(token, 0))
         
-        .endpoint {
-            background: white;
-            border-radius: 8px;
-            margin-bottom: 2rem;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            overflow: hidden;
+        self._docs.append(result)
+        self._fingerprints.append(fingerprint)
+        self._keys[key] = doc
+    
+    def _remove(self, doc: int) -> None:
+        """Turn a document into a tombstone; its postings are dropped from results until purged."""
+        self._docs[doc] = None
+        self._dead.add(doc)
+    
+    def _purge(self) -> None:
+        """Drop tombstoned documents from every posting list."""
+        dead = self._dead
+        for token, (docs, weights, masks) in list(self._postings.items()):
+            kept = [i for i, doc in enumerate(docs) if doc not in dead]
+            if not kept:
+                del self._postings[token]
+            elif len(kept) < len(docs):
+                self._postings[token] = (
+                    [docs[i] for i in kept],
+                    array('H', [weights[i] for i in kept]),
+                    array('H', [masks[i] for i in kept])
+                )
+        self._terms = sorted(self._postings)
+        self._dead = set()
+    
+    def query(self, text: str, offset: int = 0, limit: int = SEARCH_PAGE_SIZE) -> Dict[str, Any]:
+        """Return one page of ranked results for a query, with the total match count."""
+        started = time.perf_counter()
+        terms = _parse_search_query(text)
+        with self._lock:
+            scores = self._match(terms) if terms else {}
+            top = heapq.nlargest(offset + limit, scores, key=scores.__getitem__)[offset:]
+            results = [dict(self._docs[doc], score=scores[doc]) for doc in top]
+        return {
+            'query': text,
+            'total': len(scores),
+            'offset': offset,
+            'limit': limit,
+            'results': results,
+            'took_ms': round((time.perf_counter() - started) * 1000, 3)
         }
+    
+    def _match(self, terms: List[tuple]) -> Dict[int, int]:
+        """Score the live documents matching every term, starting from the rarest term."""
+        expanded = []
+        for token, field, mode in terms:
+            expansions = self._expand(token, mode)
+            if not expansions:
+                return {}
+            size = sum(len(self._postings[candidate][0]) for candidate, _ in expansions)
+            expanded.append((size, expansions, field))
+        expanded.sort(key=lambda item: item[0])
         
-        .endpoint-header {
-            padding: 1.5rem;
-            background-color: #f8f9fa;
-            border-bottom: 1px solid #e9ecef;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
+        size, expansions, field = expanded[0]
+        scores = self._term_scores(expansions, field)
+        for size, expansions, field in expanded[1:]:
+            if not scores:
+                break
+            # A binary search costs about as much as scanning a few dozen postings
+            if len(scores) * len(expansions) * 32 < size:
+                term = self._probe_scores(expansions, field, scores)
+            else:
+                term = self._term_scores(expansions, field)
+            scores = {doc: score + term[doc] for doc, score in scores.items() if doc in term}
         
-        .endpoint-header h3 {
-            font-family: 'Monaco', 'Courier New', monospace;
-            font-size: 1.2rem;
-            color: #495057;
-        }
+        dead = self._dead
+        if dead:
+            if len(dead) < len(scores):
+                for doc in dead:
+                    scores.pop(doc, None)
+            else:
+                scores = {doc: score for doc, score in scores.items() if doc not in dead}
+        return scores
+    
+    def _expand(self, token: str, mode: str) -> List[tuple]:
+        """Return the (indexed token, weight shift) pairs a query token matches, weakest first."""
+        postings = self._postings
+        if mode == 'filter':
+            return [(token, 0)] if token in postings else []
+        expansions = []
+        terms = self._terms
+        start = bisect.bisect_right(terms, token)
+        for candidate in terms[start:start + SEARCH_PREFIX_EXPANSIONS]:
+            if not candidate.startswith(token):
+                break
+            expansions.append((candidate, SEARCH_PREFIX_SHIFT))
+        if token in postings:
+            expansions.append((token, 0))
+        if (mode == 'fuzzy' or not expansions) and len(token) >= SEARCH_FUZZY_MIN_LENGTH:
+            fuzzy = [(candidate, SEARCH_FUZZY_SHIFT) for candidate in _single_edits(token)
+                     if candidate in postings and not candidate.startswith(token)]
+            expansions = fuzzy + expansions
+        return expansions
+    
+    def _term_scores(self, expansions: List[tuple], field: Optional[str]) -> Dict[int, int]:
+        """Score every document one term matches; the strongest kind of match wins."""
+        scores: Dict[int, int] = {}
+        if field:
+            flag = 1 << SEARCH_FIELDS.index(field)
+            for token, shift in expansions:
+                docs, _, masks = self._postings[token]
+                scores.update(dict.fromkeys(itertools.compress(docs, map(flag.__and__, masks)),
+                                            SEARCH_FIELD_WEIGHTS[field] << SEARCH_FUZZY_SHIFT >> shift))
+        else:
+            for token, shift in expansions:
+                docs, weights, _ = self._postings[token]
+                if shift:
+                    weights = map(operator.rshift, weights, itertools.repeat(shift))
+                scores.update(zip(docs, weights))
+        return scores
+    
+    def _probe_scores(self, expansions: List[tuple], field: Optional[str],
+                      candidates: Dict[int, int]) -> Dict[int, int]:
+        """Like _term_scores, but binary-searching the postings for the candidates only."""
+        flag = 1 << SEARCH_FIELDS.index(field) if field else 0
+        scores: Dict[int, int] = {}
+        for token, shift in expansions:
+            docs, weights, masks = self._postings[token]
+            end = len(docs)
+            for doc in candidates:
+                i = bisect.bisect_left(docs, doc)
+                if i < end and docs[i] == doc:
+                    if not flag:
+                        scores[doc] = weights[i] >> shift
+                    elif masks[i] & flag:
+                        scores[doc] = SEARCH_FIELD_WEIGHTS[field] << SEARCH_FUZZY_SHIFT >> shift
+        return scores
+
+
+def _search_filter_token(name: str, value: Any) -> str:
+    """Reserved index token for a type:/service: filter; tokenized words never start with '='."""
+    return f"={name}:{str(value).lower()}"
+
+
+def _parse_search_query(text: str) -> List[tuple]:
+    """Split a query into (token, field, mode) terms, mode being 'match', 'fuzzy' or 'filter'."""
+    terms = []
+    for word in text.split():
+        name, colon, value = word.partition(':')
+        name = name.lower()
+        field = None
+        if colon and name in SEARCH_FILTERS:
+            terms.append((_search_filter_token(name, value), None, 'filter'))
+            continue
+        if colon and SEARCH_FIELD_ALIASES.get(name, name) in SEARCH_FIELDS:
+            field, word = SEARCH_FIELD_ALIASES.get(name, name), value
+        mode = 'fuzzy' if word.endswith('~') else 'match'
+        terms.extend((token, field, mode) for token in _tokenize(word))
+    return terms
+
+
+def _single_edits(word: str) -> set:
+    """Strings one deletion, transposition, replacement or insertion away from word."""
+    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+    edits = {left + right[1:] for left, right in splits if right}
+    edits.update(left + right[1] + right[0] + right[2:] for left, right in splits if len(right) > 1)
+    edits.update(left + ch + right[1:] for left, right in splits if right for ch in _SEARCH_ALPHABET)
+    edits.update(left + ch + right for left, right in splits for ch in _SEARCH_ALPHABET)
+    edits.discard(word)
+    return edits
+
+
+def _docs_page(output_format: str) -> str:
+    """Entry page of a build in the given output format."""
+    return 'README.md' if output_format == 'markdown' else 'index.html'
+
+
+def serve_documentation(output_dir: str, port: int, reloader: Optional[LiveReloader] = None,
+                        search: Optional[SearchService] = None):
+    """Create a threaded HTTP/1.1 server for the output directory.
+    
+    Connections are kept alive, text responses are gzip-encoded when the
+    client accepts it, and every response carries a strong ETag so browsers
+    revalidate with a cheap 304. Files are read from output_dir (no chdir)
+    through a DocsFileCache shared by all request threads.
+    
+    With a reloader, GET /__livereload streams a server-sent event to connected
+    browsers whenever the documentation is rebuilt. With a search service,
+    GET /__search?q=...&offset=...&limit=... answers one page of results as JSON.
+    """
+    import http.server
+    import shutil
+    from email.utils import formatdate
+    
+    files = DocsFileCache()
+    
+    class DocsRequestHandler(http.server.SimpleHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Idle keep-alive connections release their thread after this many seconds
+        timeout = SERVE_KEEPALIVE_TIMEOUT
         
-        .methods {
-            display: flex;
-            gap: 0.5rem;
-        }
+        def __init__(self, *handler_args, **handler_kwargs):
+            super().__init__(*handler_args, directory=output_dir, **handler_kwargs)
         
-        .method-badge {
-            padding: 0.25rem 0.75rem;
-            border-radius: 20px;
-            font-size: 12px;
-            font-weight: 600;
-            text-transform: uppercase;
-        }
+        def do_GET(self):
+            if reloader is not None and self.path == LIVE_RELOAD_PATH:
+                self._stream_reload_events()
+            elif search is not None and self.path.split('?', 1)[0] == SEARCH_API_PATH:
+                self._send_search()
+            else:
+                self._send_file(head_only=False)
         
-        .method-get { background-color: #28a745; color: white; }
-        .method-post { background-color: #007bff; color: white; }
-        .method-put { background-color: #ffc107; color: black; }
-        .method-delete { background-color: #dc3545; color: white; }
-        .method-patch { background-color: #6f42c1; color: white; }
+        def do_HEAD(self):
+            self._send_file(head_only=True)
         
-        .endpoint-content {
-            padding: 1.5rem;
-        }
+        def _send_file(self, head_only: bool):
+            file_path = self.translate_path(self.path)
+            if os.path.isdir(file_path):
+                if not self.path.split('?', 1)[0].split('#', 1)[0].endswith('/'):
+                    # Same redirect SimpleHTTPRequestHandler issues, so relative links resolve
+                    location = self.path.split('?', 1)
+                    location[0] += '/'
+                    self.send_response(301)
+                    self.send_header('Location', '?'.join(location))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                file_path = os.path.join(file_path, 'index.html')
+            
+            entry = files.get(file_path)
+            if entry is None:
+                self.send_error(404, "File not found")
+                return
+            
+            encoded = entry['gzip'] is not None and self._accepts_gzip()
+            etag = f'"{entry["etag"]}-gzip"' if encoded else f'"{entry["etag"]}"'
+            if self._etag_matches(etag):
+                self.send_response(304)
+                self._send_cache_headers(entry, etag)
+                self.end_headers()
+                return
+            
+            body = entry['gzip'] if encoded else entry['body']
+            self.send_response(200)
+            self.send_header('Content-Type', entry['type'])
+            self.send_header('Content-Length', str(len(body) if body is not None else entry['stamp'][1]))
+            self.send_header('Last-Modified', formatdate(entry['mtime'], usegmt=True))
+            if encoded:
+                self.send_header('Content-Encoding', 'gzip')
+            self._send_cache_headers(entry, etag)
+            self.end_headers()
+            if head_only:
+                return
+            
+            if body is not None:
+                self.wfile.write(body)
+            else:
+                # Too large to keep in memory; stream the identity encoding from disk
+                with open(file_path, 'rb') as f:
+                    shutil.copyfileobj(f, self.wfile, WRITE_BUFFER_SIZE)
         
-        .summary {
-            font-size: 1.1rem;
-            font-weight: 600;
-            margin-bottom: 0.5rem;
-            color: #495057;
-        }
+        def _send_cache_headers(self, entry: Dict[str, Any], etag: str):
+            self.send_header('ETag', etag)
+            # Content-hashed names never change content; everything else revalidates
+            self.send_header('Cache-Control', 'public, max-age=31536000, immutable' if entry['immutable'] else 'no-cache')
+            if entry['gzip'] is not None:
+                self.send_header('Vary', 'Accept-Encoding')
         
-        .description {
-            color: #6c757d;
-            margin-bottom: 1rem;
-            line-height: 1.6;
-        }
+        def _accepts_gzip(self) -> bool:
+            for coding in self.headers.get('Accept-Encoding', '').split(','):
+                name, _, params = coding.strip().partition(';')
+                if name.strip().lower() in ('gzip', '*'):
+                    return params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+            return False
         
-        .endpoint-content h4 {
-            margin-top: 1rem;
-            margin-bottom: 0.5rem;
-            color: #495057;
-        }
+        def _etag_matches(self, etag: str) -> bool:
+            candidates = [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]
+            return etag in candidates or '*' in candidates
         
-        .endpoint-content ul {
-            margin-left: 1rem;
-        }
+        def _send_search(self):
+            from urllib.parse import urlsplit, parse_qs
+            
+            params = parse_qs(urlsplit(self.path).query)
+            try:
+                offset = int(params.get('offset', ['0'])[0])
+                limit = int(params.get('limit', [str(SEARCH_PAGE_SIZE)])[0])
+                if offset < 0 or limit < 0:
+                    raise ValueError
+            except ValueError:
+                self._send_json(400, {'error': 'offset and limit must be non-negative integers'})
+                return
+            self._send_json(200, search.query(params.get('q', [''])[0], offset, min(limit, SEARCH_MAX_PAGE_SIZE)))
         
-        .endpoint-content li {
-            margin-bottom: 0.25rem;
-        }
+        def _send_json(self, status: int, data: Dict[str, Any]):
+            import gzip
+            
+            body = _NAV_ENCODER.encode(data).encode('utf-8')
+            encoded = len(body) >= GZIP_MIN_SIZE and self._accepts_gzip()
+            if encoded:
+                body = gzip.compress(body, compresslevel=6, mtime=0)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-store')
+            self.send_header('Vary', 'Accept-Encoding')
+            if encoded:
+                self.send_header('Content-Encoding', 'gzip')
+            self.end_headers()
+            self.wfile.write(body)
         
-        code {
-            background-color: #f8f9fa;
-            padding: 0.2rem 0.4rem;
-            border-radius: 3px;
-            font-family: 'Monaco', 'Courier New', monospace;
-            font-size: 0.9rem;
-        }
+        def _stream_reload_events(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            self.close_connection = True
+            version = reloader.version
+            try:
+                while True:
+                    latest = reloader.wait(version, timeout=15)
+                    if latest != version:
+                        version = latest
+                        self.wfile.write(b"data: reload\n\n")
+                    else:
+                        self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+    
+    class DocsServer(http.server.ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = SERVE_BACKLOG
+    
+    return DocsServer(("", port), DocsRequestHandler)
+
+
+def build_documentation(args: argparse.Namespace, config: Dict[str, Any]) -> Optional[APIDocumentationGenerator]:
+    """Parse the selected source and write the requested output formats."""
+    metadata = {'title': args.title, 'version': args.version, 'description': args.description}
+    return generate_documentation(
+        config, args.source, args.input, args.output, args.format, args.static, metadata
+    )
+
+
+def generate_documentation(config: Dict[str, Any], source: str, input_path: str, output_dir: str,
+                           output_format: str = 'html', static: bool = False,
+                           metadata: Optional[Dict[str, Any]] = None) -> APIDocumentationGenerator:
+    """Parse one source and write its documentation."""
+    generator = APIDocumentationGenerator(config)
+    
+    # Override metadata if provided
+    for key, value in (metadata or {}).items():
+        if value:
+            generator.metadata[key] = value
+    
+    # Large JSON specs are rendered while they are read, one path item at a time
+    if source == 'openapi' and config.get('stream') and config.get('delta') is None:
+        generator.generate_streamed_documentation(input_path, output_dir, output_format)
+        return generator
+    
+    # Parse source
+    if source == 'fastapi' and static:
+        generator.parse_fastapi_source(input_path)
+    elif source == 'fastapi':
+        generator.parse_fastapi_app(input_path)
+    elif source == 'openapi':
+        generator.parse_openapi_spec(input_path)
+    elif source == 'flask' and static:
+        generator.parse_flask_source(input_path)
+    elif source == 'flask':
+        generator.parse_flask_app(input_path)
+    
+    # Delta publishing writes only the operation pages that changed
+    if config.get('delta') is not None:
+        generator.generate_delta_documentation(output_dir, config['delta'] or None)
+        return generator
+    
+    # Generate output; both formats are staged and applied together
+    with generator._output(output_dir):
+        if output_format in ['html', 'both']:
+            generator.generate_html_documentation(output_dir)
         
-        @media (max-width: 768px) {
-            nav {
-                display: none;
-            }
-            
-            main {
-                margin-left: 0;
-                margin-top: 0;
-            }
-        }
-        """
+        if output_format in ['markdown', 'both']:
+            generator.generate_markdown_documentation(output_dir)
     
-    def _generate_javascript(self) -> str:
-        """Generate JavaScript for interactive features."""
-        return """
-        // Search functionality
-        document.getElementById('search').addEventListener('input', function(e) {
-            const query = e.target.value.toLowerCase();
-            const navItems = document.querySelectorAll('.nav-item');
-            const endpoints = document.querySelectorAll('.endpoint');
-            
-            navItems.forEach((item, index) => {
-                const path = item.querySelector('.nav-path').textContent.toLowerCase();
-                const methods = item.querySelector('.nav-methods').textContent.toLowerCase();
+    return generator
+
+
+def build_batch(manifest_path: Union[str, Dict[str, Any]], output_dir: str, config: Dict[str, Any],
+                jobs: int = 1, output_format: str = 'html',
+                search: Optional[SearchService] = None) -> List[Dict[str, Any]]:
+    """Document every service listed in a batch manifest under one portal.
+    
+    The manifest (YAML or JSON) holds an optional portal title/description
+    and a list of services, each with an input plus optional name, source,
+    format, static and title/version/description overrides. Input paths are
+    relative to the manifest (or to the working directory when the manifest
+    is passed already loaded); URL inputs are fetched up front, concurrently
+    and revalidated against the cache. Services are built on a bounded process pool;
+    styles.css and script.js are written once at the portal root. The whole
+    portal is staged and applied at once, services staging their files
+    inside the portal's staging directory. With a search service, each service's
+    endpoints and schemas are indexed under its slug.
+    """
+    if isinstance(manifest_path, dict):
+        batch = manifest_path
+        base_dir = os.getcwd()
+    else:
+        with open(manifest_path, 'rb') as f:
+            data = f.read()
+        batch = _load_json(data) if manifest_path.endswith('.json') else _load_yaml(data)
+        base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    
+    portal = APIDocumentationGenerator(config)
+    portal.metadata.update({
+        'title': batch.get('title', 'API Portal'),
+        'description': batch.get('description', '')
+    })
+    with portal._output(output_dir) as output_path:
+        manifest = BuildManifest(portal._writer, config.get('incremental', False))
+        portal._write_assets(manifest)
+        
+        # Parallelism comes from the service pool, so services render sequentially
+        service_config = dict(config, shared_assets=True, asset_prefix='../', jobs=1, atomic_output=False)
+        tasks = []
+        used = set()
+        for service in batch.get('services', []):
+            service = dict(service)
+            if _is_url(service['input']):
+                from urllib.parse import urlsplit
                 
-                if (path.includes(query) || methods.includes(query)) {
-                    item.style.display = 'block';
-                    endpoints[index].style.display = 'block';
-                } else {
-                    item.style.display = 'none';
-                    endpoints[index].style.display = 'none';
-                }
-            });
-        });
-        
-        // Scroll to endpoint
-        function scrollToEndpoint(index) {
-            const endpoints = document.querySelectorAll('.endpoint');
-            if (endpoints[index]) {
-                endpoints[index].scrollIntoView({ behavior: 'smooth' });
-            }
-        }
+                parts = urlsplit(service['input'])
+                name = service.get('name') or f"{parts.netloc} {Path(parts.path).stem}".strip()
+            else:
+                service['input'] = os.path.join(base_dir, service['input'])
+                name = service.get('name') or Path(service['input']).stem
+            slug = re.sub(r'[^a-z0-9]+', '-', str(name).lower()).strip('-') or 'service'
+            while slug in used:
+                slug += '-'
+            used.add(slug)
+            service.setdefault('name', name)
+            service.setdefault('format', output_format)
+            # A staged portal has each service stage into its staging directory
+            task_config = service_config
+            if portal._writer.staged:
+                task_config = dict(service_config, output_staging=str(output_path / slug))
+            tasks.append((service, str(Path(output_dir) / slug), slug, task_config, search is not None))
         
-        // Highlight active nav item
-        window.addEventListener('scroll', function() {
-            const endpoints = document.querySelectorAll('.endpoint');
-            const navItems = document.querySelectorAll('.nav-item');
-            
-            let current = 0;
-            endpoints.forEach((endpoint, index) => {
-                if (endpoint.getBoundingClientRect().top <= 100) {
-                    current = index;
-                }
-            });
-            
-            navItems.forEach(item => item.classList.remove('active'));
-            if (navItems[current]) {
-                navItems[current].classList.add('active');
-            }
-        });
-        """
+        # Forked service workers inherit the fetched files instead of fetching again
+        with remote_specs(portal._cache_dir()) as fetcher:
+            fetcher.fetch_all(task[0]['input'] for task in tasks if _is_url(task[0]['input']))
+            if jobs > 1 and len(tasks) > 1:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(min(jobs, len(tasks)), initializer=_detach_profiler) as pool:
+                    results = list(pool.map(_build_batch_service, *zip(*tasks)))
+            else:
+                results = [_build_batch_service(*task) for task in tasks]
+        for task, result in zip(tasks, results):
+            documents = result.pop('search_documents', None)
+            if search is not None and documents is not None:
+                search.update(documents, scope=task[2])
+        
+        portal._write_output(
+            manifest, 'index.html', lambda: portal._iter_portal_index(results),
+            [json.dumps(results, sort_keys=True)]
+        )
+        portal._save_manifest(manifest)
     
-    def _generate_markdown_template(self) -> str:
-        """Generate Markdown template for documentation."""
-        content = f"""# {self.metadata['title']}
+    built = sum(1 for result in results if not result['error'])
+    print(f"✅ Documented {built}/{len(results)} services in {output_dir}")
+    return results
 
-Version: {self.metadata['version']}
 
-{self.metadata['description']}
+def _build_batch_service(service: Dict[str, Any], output_dir: str, slug: str,
+                         config: Dict[str, Any], search: bool = False) -> Dict[str, Any]:
+    """Build one batch service, reporting failures instead of aborting the batch."""
+    result = {
+        'name': service['name'],
+        'title': service.get('title') or service['name'],
+        'version': service.get('version', ''),
+        'description': service.get('description', ''),
+        'link': f"{slug}/{_docs_page(service['format'])}",
+        'endpoints': 0,
+        'error': None
+    }
+    try:
+        source = service.get('source', 'openapi')
+        if source not in SOURCES:
+            raise ValueError(f"Unsupported source {source!r}; expected one of {', '.join(SOURCES)}")
+        metadata = {key: service.get(key) for key in ['title', 'version', 'description']}
+        generator = generate_documentation(
+            config, source, service['input'], output_dir,
+            service['format'], service.get('static', False), metadata
+        )
+        result.update({key: generator.metadata[key] for key in ['title', 'version', 'description']})
+        result['endpoints'] = len(generator.endpoints)
+        if search:
+            result['search_documents'] = generator._search_documents(result['link'])
+    except Exception as e:
+        print(f"❌ {service['name']}: {e}")
+        result['error'] = str(e)
+    return result
 
-## Endpoints
 
-"""
+def watch_and_rebuild(args: argparse.Namespace, config: Dict[str, Any],
+                      generator: APIDocumentationGenerator,
+                      reloader: Optional[LiveReloader] = None,
+                      search: Optional[SearchService] = None) -> None:
+    """Poll the source files and incrementally rebuild whenever one changes."""
+    watched = list(generator.source_files) + ([args.config] if args.config else [])
+    snapshot = _mtime_snapshot(watched)
+    print(f"👀 Watching {len(watched)} file(s) for changes (Ctrl+C to stop)")
+    
+    while True:
+        time.sleep(WATCH_INTERVAL)
+        current = _mtime_snapshot(watched)
+        if current == snapshot:
+            continue
         
-        for endpoint in self.endpoints:
-            methods = ", ".join(endpoint['methods'])
-            content += f"""### {endpoint['path']}
+        changed = [path for path in watched if current.get(path) != snapshot.get(path)]
+        snapshot = current
+        print(f"🔄 Change detected in {', '.join(os.path.basename(path) for path in changed)}, rebuilding...")
+        
+        # Re-execute only the application's own modules; framework imports stay loaded
+        _unload_modules(generator.source_files)
+        started = time.perf_counter()
+        try:
+            if args.config and args.config in changed:
+                config.update(load_config(args.config) or {})
+            generator = build_documentation(args, config) or generator
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            continue
+        
+        watched = list(generator.source_files) + ([args.config] if args.config else [])
+        snapshot = _mtime_snapshot(watched)
+        print(f"✅ Rebuilt in {(time.perf_counter() - started) * 1000:.0f} ms")
+        if search is not None:
+            stats = search.update(generator._search_documents(_docs_page(args.format)))
+            print(f"🔎 Search index: {stats['added']} added, {stats['changed']} changed, "
+                  f"{stats['removed']} removed ({stats['documents']} documents)")
+        if reloader is not None:
+            reloader.notify()
 
-**Methods:** {methods}
 
-**Summary:** {endpoint['summary']}
+def _mtime_snapshot(paths: Iterable[str]) -> Dict[str, Optional[int]]:
+    """Map each path to its modification time, or None when it is missing."""
+    snapshot = {}
+    for path in paths:
+        try:
+            snapshot[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            snapshot[path] = None
+    return snapshot
 
-**Description:** {endpoint['description']}
 
-"""
-            
-            if endpoint['parameters']:
-                content += "**Parameters:**\n\n"
-                for param in endpoint['parameters']:
-                    param_type = param.get('type', 'string')
-                    required = "✅ Required" if param.get('required', False) else "❌ Optional"
-                    content += f"- `{param['name']}` ({param_type}) - {required}\n"
-                content += "\n"
-            
-            content += "---\n\n"
-        
-        return content
+def _local_module_files(root: str) -> List[str]:
+    """Return the files of imported modules that live under root."""
+    root = os.path.abspath(root)
+    own_file = os.path.abspath(__file__)
+    files = []
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, '__file__', None)
+        if not module_file or name == '__main__' or os.path.abspath(module_file) == own_file:
+            continue
+        if os.path.abspath(module_file).startswith(root + os.sep):
+            files.append(module_file)
+    return files
 
 
-def load_config(config_path: str) -> Dict[str, Any]:
-    """Load configuration from YAML file."""
-    try:
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
-    except Exception as e:
-        print(f"⚠️  Warning: Failed to load config file: {e}")
-        return {}
+def _unload_modules(files: Iterable[str]) -> None:
+    """Drop the modules loaded from the given files so the next import re-executes them."""
+    targets = {os.path.abspath(path) for path in files}
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, '__file__', None)
+        if module_file and os.path.abspath(module_file) in targets:
+            del sys.modules[name]
+
+
+def config_from_args(args: argparse.Namespace) -> Dict[str, Any]:
+    """Load the configuration file, if any, and apply CLI overrides."""
+    config = {}
+    if args.config:
+        config = load_config(args.config)
+    
+    # Override config with CLI arguments
+    if args.title:
+        config['title'] = args.title
+    if args.version:
+        config['version'] = args.version
+    if args.description:
+        config['description'] = args.description
+    if args.split_by_tag:
+        config['split_by_tag'] = True
+    if args.incremental:
+        config['incremental'] = True
+    if args.jobs > 1:
+        config['jobs'] = args.jobs
+    if args.stream:
+        config['stream'] = True
+    if args.fingerprint:
+        config['fingerprint'] = True
+    if args.precompress:
+        config['precompress'] = True
+    if args.delta is not None:
+        config['delta'] = args.delta
+    if args.in_place:
+        config['atomic_output'] = False
+    if args.theme:
+        theme = config.get('theme')
+        config['theme'] = dict(theme, path=args.theme) if isinstance(theme, dict) else args.theme
+    if args.cache_dir:
+        config['cache_dir'] = args.cache_dir
+    if args.no_cache:
+        config['cache'] = False
+    if args.serve:
+        # The server answers searches, so streamed builds keep their endpoints' search documents
+        config['search_api'] = True
+    if args.watch:
+        # Rebuilds only rewrite what changed; the page listens for reloads when served
+        config['incremental'] = True
+        config['live_reload'] = args.serve
+    return config
 
 
 def main():
     """Main CLI function."""
     parser = argparse.ArgumentParser(description='Generate API documentation from code annotations')
-    parser.add_argument('--input', '-i', required=True, help='Input file or directory')
+    parser.add_argument('--input', '-i', help='Input file or directory, or comma-separated spec URLs')
+    parser.add_argument('--batch', help='Manifest of many services to document in one run')
     parser.add_argument('--output', '-o', default='./docs', help='Output directory')
-    parser.add_argument('--source', '-s', choices=['fastapi', 'flask', 'openapi'], default='fastapi', help='Source type')
+    parser.add_argument('--source', '-s', choices=SOURCES, default='fastapi', help='Source type')
+    parser.add_argument('--static', action='store_true', help='Read routes from source with ast instead of importing the app')
     parser.add_argument('--format', '-f', choices=['html', 'markdown', 'both'], default='html', help='Output format')
     parser.add_argument('--config', '-c', help='Configuration file path')
     parser.add_argument('--title', help='API title')
     parser.add_argument('--version', help='API version')
     parser.add_argument('--description', help='API description')
+    parser.add_argument('--split-by-tag', action='store_true', help='Write one lazily loaded HTML page per tag')
+    parser.add_argument('--incremental', action='store_true', help='Only re-render files whose inputs changed')
+    parser.add_argument('--stream', action='store_true', help='Render a large JSON OpenAPI spec without loading it whole')
+    parser.add_argument('--fingerprint', action='store_true', help='Content-hash asset file names for immutable caching')
+    parser.add_argument('--precompress', action='store_true', help='Write a .gz sibling next to every output file')
+    parser.add_argument('--profile', nargs='?', const=PROFILE_REPORT_FILE, metavar='REPORT',
+                        help=f'Write per-phase timings, peak allocations and counters as JSON (default: {PROFILE_REPORT_FILE})')
+    parser.add_argument('--profile-no-alloc', action='store_true',
+                        help='With --profile, skip allocation tracing so timings carry no tracemalloc overhead')
+    parser.add_argument('--delta', nargs='?', const='', metavar='PREVIOUS',
+                        help=f'Write only changed operation pages plus {DELTA_MANIFEST_FILE} and {CHANGELOG_FILE}, '
+                             f'compared against PREVIOUS (default: the manifest already in --output)')
+    parser.add_argument('--in-place', action='store_true',
+                        help='Write into --output directly instead of staging the build and applying it at the end')
+    parser.add_argument('--theme', help='Theme directory whose templates/ override the built-in templates')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Render endpoints on N worker processes')
     parser.add_argument('--serve', action='store_true', help='Serve documentation locally')
     parser.add_argument('--port', type=int, default=8080, help='Server port')
+    parser.add_argument('--watch', action='store_true', help='Rebuild on source changes (live reload with --serve)')
+    parser.add_argument('--cache-dir', help=f'Parsed-spec cache directory (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the parsed-spec cache')
     
     args = parser.parse_args()
-    
-    # Load configuration
-    config = {}
-    if args.config:
-        config = load_config(args.config)
-    
-    # Override config with CLI arguments
-    if args.title:
-        config['title'] = args.title
-    if args.version:
-        config['version'] = args.version
-    if args.description:
-        config['description'] = args.description
-    
-    # Initialize generator
-    generator = APIDocumentationGenerator(config)
-    
-    # Override metadata if provided
-    if args.title:
-        generator.metadata['title'] = args.title
-    if args.version:
-        generator.metadata['version'] = args.version
-    if args.description:
-        generator.metadata['description'] = args.description
-    
-    print(f"🚀 Generating documentation from {args.source} source...")
+    if not args.input and not args.batch:
+        parser.error("one of --input or --batch is required")
+    batch = args.batch
+    if _is_url(args.input):
+        # Remote inputs are OpenAPI specs; several URLs are documented as one portal
+        urls = [url.strip() for url in args.input.split(',') if url.strip()]
+        if not all(_is_url(url) for url in urls):
+            parser.error("comma-separated --input values must all be URLs")
+        if args.watch:
+            parser.error("--watch cannot poll URL inputs")
+        args.source = 'openapi'
+        if len(urls) > 1 and not batch:
+            batch = {'title': 'API Portal', 'services': [{'input': url, 'source': 'openapi'} for url in urls]}
+    if batch and args.watch:
+        parser.error("--watch cannot be combined with --batch")
+    if args.delta is not None and (batch or args.stream):
+        parser.error("--delta cannot be combined with --batch, several URLs or --stream")
     
     try:
-        # Parse source
-        if args.source == 'fastapi':
-            generator.parse_fastapi_app(args.input)
-        elif args.source == 'openapi':
-            generator.parse_openapi_spec(args.input)
-        elif args.source == 'flask':
-            print("Flask support coming soon!")
-            return
+        profile = profiling(args.profile, not args.profile_no_alloc) if args.profile else contextlib.nullcontext()
+        with profile as profiler:
+            phase = profiler.phase if profiler else (lambda name: contextlib.nullcontext())
+            
+            with phase('main.configure'):
+                config = config_from_args(args)
+            
+            search = SearchService() if args.serve else None
+            with phase('main.batch' if batch else 'main.build'):
+                if batch:
+                    print(f"🚀 Generating documentation for services in {args.batch or 'the given URLs'}...")
+                    build_batch(batch, args.output, config, args.jobs, args.format, search)
+                else:
+                    print(f"🚀 Generating documentation from {args.source} source...")
+                    generator = build_documentation(args, config)
+            
+            if search is not None and not batch and generator is not None:
+                with phase('main.search_index'):
+                    search.update(generator._search_documents(_docs_page(args.format)))
         
-        # Generate output
-        if args.format in ['html', 'both']:
-            generator.generate_html_documentation(args.output)
+        if args.profile:
+            print(f"📊 Profile written to {args.profile}")
+        if not batch and generator is None:
+            return
         
-        if args.format in ['markdown', 'both']:
-            generator.generate_markdown_documentation(args.output)
+        reloader = LiveReloader() if args.watch else None
         
         # Serve documentation
         if args.serve:
-            import http.server
-            import socketserver
             import webbrowser
-            import os
             
-            os.chdir(args.output)
-            
-            Handler = http.server.SimpleHTTPRequestHandler
-            with socketserver.TCPServer(("", args.port), Handler) as httpd:
-                url = f"http://localhost:{args.port}"
-                print(f"🌐 Serving documentation at {url}")
-                webbrowser.open(url)
-                httpd.serve_forever()
+            httpd = serve_documentation(args.output, args.port, reloader, search)
+            url = f"http://localhost:{args.port}"
+            print(f"🌐 Serving documentation at {url} (search API: {url}{SEARCH_API_PATH}?q=..., "
+                  f"{len(search)} documents)")
+            webbrowser.open(url)
+            if not args.watch:
+                with httpd:
+                    httpd.serve_forever()
+                return
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        
+        if args.watch:
+            watch_and_rebuild(args, config, generator, reloader, search)
     
+    except KeyboardInterrupt:
+        print("👋 Stopped")
     except Exception as e:
         print(f"❌ Error: {e}")
         sys.exit(1)
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Generates synthetic OpenAPI specs and FastAPI/Flask apps, times each phase of
+parsing and rendering, records peak memory and compares the results against
+stored baselines, failing on throughput or memory regressions.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import contextlib
+import io
+import subprocess
+import tempfile
+from typing import List, Dict, Any
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Stored results that later runs are compared against
+DEFAULT_BASELINE = os.path.join(HERE, 'benchmark_baseline.json')
+
+# Allowed slowdown / memory growth relative to the baseline before failing
+DEFAULT_TIME_THRESHOLD = 0.25
+DEFAULT_MEMORY_THRESHOLD = 0.20
+
+# Phases shorter than this are too noisy to gate on
+MIN_GATED_SECONDS = 0.05
+
+SOURCES = ['openapi', 'openapi-yaml', 'openapi-stream', 'openapi-remote', 'fastapi-static', 'fastapi', 'flask-static', 'flask']
+HTTP_METHODS = ['get', 'post', 'put', 'delete', 'patch']
+
+
+def generate_openapi_spec(operations: int, depth: int, tags: int) -> Dict[str, Any]:
+    """Build a synthetic OpenAPI 3 document with nested component schemas."""
+    schemas = {}
+    for tag in range(tags):
+        for level in range(depth):
+            properties = {
+                'id': {'type': 'integer'},
+                'name': {'type': 'string', 'description': f'Name of level {level}'},
+                'labels': {'type': 'array', 'items': {'type': 'string'}}
+            }
+            if level + 1 < depth:
+                properties['child'] = {'$ref': f'#/components/schemas/Model{tag}L{level + 1}'}
+            schemas[f'Model{tag}L{level}'] = {
+                'type': 'object',
+                'required': ['id'],
+                'description': f'Model {tag} at depth {level}',
+                'properties': properties
+            }
+
+    paths: Dict[str, Any] = {}
+    for i in range(operations):
+        tag = i % tags
+        method = HTTP_METHODS[i % len(HTTP_METHODS)]
+        path = f'/tag{tag}/resource{i // len(HTTP_METHODS)}/{{item_id}}'
+        model = {'$ref': f'#/components/schemas/Model{tag}L0'}
+        operation = {
+            'summary': f'{method.title()} resource {i}',
+            'description': f'Synthetic operation {i} in tag {tag}.',
+            'operationId': f'op_{i}',
+            'tags': [f'tag{tag}'],
+            'parameters': [
+                {'name': 'item_id', 'in': 'path', 'required': True, 'schema': {'type': 'integer'}},
+                {'$ref': '#/components/parameters/Limit'},
+                {'name': f'filter{i % 10}', 'in': 'query', 'schema': {'type': 'string'}}
+            ],
+            'responses': {
+                '200': {'description': 'OK', 'content': {'application/json': {'schema': model}}},
+                '404': {'$ref': '#/components/responses/NotFound'}
+            }
+        }
+        if method in ['post', 'put', 'patch']:
+            operation['requestBody'] = {'required': True, 'content': {'application/json': {'schema': model}}}
+        paths.setdefault(path, {})[method] = operation
+
+    return {
+        'openapi': '3.0.3',
+        'info': {'title': 'Synthetic API', 'version': '1.0.0', 'description': 'Benchmark fixture'},
+        'paths': paths,
+        'components': {
+            'schemas': schemas,
+            'parameters': {'Limit': {'name': 'limit', 'in': 'query', 'schema': {'type': 'integer'}}},
+            'responses': {'NotFound': {'description': 'Not found'}}
+        }
+    }
+
+
+def generate_fastapi_app(app_dir: str, operations: int, depth: int, tags: int) -> str:
+    """Write a synthetic FastAPI app (one router module per tag) and return main.py."""
+    os.makedirs(os.path.join(app_dir, 'routers'), exist_ok=True)
+
+    models = ["from typing import List, Optional", "from pydantic import BaseModel", ""]
+    for tag in range(tags):
+        for level in reversed(range(depth)):
+            models.append(f"class Model{tag}L{level}(BaseModel):")
+            models.append("    id: int")
+            models.append("    name: str = ''")
+            models.append("    labels: List[str] = []")
+            if level + 1 < depth:
+                models.append(f"    child: Optional[Model{tag}L{level + 1}] = None")
+            models.append("")
+    with open(os.path.join(app_dir, 'models.py'), 'w') as f:
+        f.write("\n".join(models) + "\n")
+
+    routers: Dict[int, List[str]] = {tag: [] for tag in range(tags)}
+    for i in range(operations):
+        tag = i % tags
+        method = HTTP_METHODS[i % len(HTTP_METHODS)]
+        routers[tag] += [
+            f"@router.{method}('/resource{i // len(HTTP_METHODS)}/{{item_id}}', response_model=Model{tag}L0)",
+            f"def {method}_resource_{i}(item_id: int, limit: int = 10, filter{i % 10}: Optional[str] = None):",
+            f"    \"\"\"Synthetic operation {i} in tag {tag}.\"\"\"",
+            "    return None",
+            ""
+        ]
+
+    open(os.path.join(app_dir, 'routers', '__init__.py'), 'w').close()
+    for tag, lines in routers.items():
+        header = [
+            "from typing import Optional",
+            "from fastapi import APIRouter",
+            f"from models import Model{tag}L0",
+            "",
+            f"router = APIRouter(prefix='/tag{tag}', tags=['tag{tag}'])",
+            ""
+        ]
+        with open(os.path.join(app_dir, 'routers', f'tag{tag}.py'), 'w') as f:
+            f.write("\n".join(header + lines) + "\n")
+
+    main = ["from fastapi import FastAPI", ""]
+    main += [f"from routers import tag{tag}" for tag in range(tags)]
+    main += ["", "app = FastAPI(title='Synthetic API', version='1.0.0')", ""]
+    main += [f"app.include_router(tag{tag}.router)" for tag in range(tags)]
+    main_file = os.path.join(app_dir, 'main.py')
+    with open(main_file, 'w') as f:
+        f.write("\n".join(main) + "\n")
+    return main_file
+
+
+def generate_flask_app(app_dir: str, operations: int, tags: int) -> str:
+    """Write a synthetic Flask app (one blueprint module per tag, registered by a factory) and return app.py."""
+    os.makedirs(os.path.join(app_dir, 'blueprints'), exist_ok=True)
+
+    blueprints: Dict[int, List[str]] = {tag: [] for tag in range(tags)}
+    for i in range(operations):
+        tag = i % tags
+        method = HTTP_METHODS[i % len(HTTP_METHODS)]
+        blueprints[tag] += [
+            f"@bp.route('/resource{i // len(HTTP_METHODS)}/<int:item_id>', methods=['{method.upper()}'])",
+            f"def {method}_resource_{i}(item_id):",
+            f"    \"\"\"Synthetic operation {i} in tag {tag}.\"\"\"",
+            "    return ''",
+            ""
+        ]
+
+    open(os.path.join(app_dir, 'blueprints', '__init__.py'), 'w').close()
+    for tag, lines in blueprints.items():
+        header = ["from flask import Blueprint", "", f"bp = Blueprint('tag{tag}', __name__, url_prefix='/tag{tag}')", ""]
+        with open(os.path.join(app_dir, 'blueprints', f'tag{tag}.py'), 'w') as f:
+            f.write("\n".join(header + lines) + "\n")
+
+    main = ["from flask import Flask", "", "", "def create_app():", "    app = Flask(__name__)"]
+    for tag in range(tags):
+        main += [f"    from blueprints.tag{tag} import bp as tag{tag}", f"    app.register_blueprint(tag{tag})"]
+    main += ["    return app"]
+    main_file = os.path.join(app_dir, 'app.py')
+    with open(main_file, 'w') as f:
+        f.write("\n".join(main) + "\n")
+    return main_file
+
+
+def scenario_key(scenario: Dict[str, Any]) -> str:
+    """Stable baseline key of a scenario."""
+    return f"{scenario['source']}/{scenario['operations']}ops/depth{scenario['depth']}/tags{scenario['tags']}"
+
+
+def write_fixture(scenario: Dict[str, Any], fixture_dir: str) -> str:
+    """Generate the input a scenario parses and return its path."""
+    operations, depth, tags = scenario['operations'], scenario['depth'], scenario['tags']
+    if scenario['source'].startswith('fastapi'):
+        return generate_fastapi_app(os.path.join(fixture_dir, 'app'), operations, depth, tags)
+    if scenario['source'].startswith('flask'):
+        return generate_flask_app(os.path.join(fixture_dir, 'app'), operations, tags)
+
+    spec = generate_openapi_spec(operations, depth, tags)
+    if scenario['source'] == 'openapi-yaml':
+        import yaml
+        spec_file = os.path.join(fixture_dir, 'spec.yaml')
+        with open(spec_file, 'w') as f:
+            yaml.dump(spec, f, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper), sort_keys=False)
+    else:
+        spec_file = os.path.join(fixture_dir, 'spec.json')
+        with open(spec_file, 'w') as f:
+            json.dump(spec, f)
+    return spec_file
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+@contextlib.contextmanager
+def _phase(phases: Dict[str, Any], name: str):
+    """Record the wall time of a phase and the peak RSS reached by its end."""
+    start = time.perf_counter()
+    yield
+    phases[name] = {'seconds': time.perf_counter() - start, 'peak_rss_mb': _peak_rss_mb()}
+
+
+def run_scenario(scenario: Dict[str, Any], input_path: str) -> Dict[str, Any]:
+    """Parse and render one fixture in this process, timing every phase."""
+    sys.path.insert(0, HERE)
+    import api_doc_gen
+
+    generator = api_doc_gen.APIDocumentationGenerator({'cache': False})
+    phases: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as output_dir, contextlib.redirect_stdout(io.StringIO()):
+        if scenario['source'] == 'openapi-remote':
+            # The fixture is served by the documentation server standing in for a remote service
+            import threading
+            httpd = api_doc_gen.serve_documentation(os.path.dirname(input_path), 0)
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{httpd.server_address[1]}/{os.path.basename(input_path)}"
+            config = {'cache_dir': os.path.join(output_dir, 'cache')}
+            with _phase(phases, 'fetch'):
+                api_doc_gen.APIDocumentationGenerator(config).parse_openapi_spec(url)
+            # A second build only revalidates: 304 Not Modified and a parsed-spec cache hit
+            generator = api_doc_gen.APIDocumentationGenerator(config)
+            with _phase(phases, 'revalidate'):
+                generator.parse_openapi_spec(url)
+            httpd.shutdown()
+        elif scenario['source'] == 'openapi-stream':
+            with _phase(phases, 'stream'):
+                generator.generate_streamed_documentation(input_path, output_dir, 'both')
+        else:
+            with _phase(phases, 'parse'):
+                if scenario['source'] == 'fastapi-static':
+                    generator.parse_fastapi_source(input_path)
+                elif scenario['source'] == 'fastapi':
+                    generator.parse_fastapi_app(input_path)
+                elif scenario['source'] == 'flask-static':
+                    generator.parse_flask_source(input_path)
+                elif scenario['source'] == 'flask':
+                    generator.parse_flask_app(input_path)
+                else:
+                    generator.parse_openapi_spec(input_path)
+            with _phase(phases, 'render_html'):
+                generator.generate_html_documentation(output_dir)
+            with _phase(phases, 'render_markdown'):
+                generator.generate_markdown_documentation(output_dir)
+
+    for metrics in phases.values():
+        metrics['ops_per_second'] = scenario['operations'] / max(metrics['seconds'], 1e-9)
+    return {'phases': phases, 'endpoints': len(generator.endpoints), 'peak_rss_mb': _peak_rss_mb()}
+
+
+def measure(scenario: Dict[str, Any], input_path: str, repeat: int) -> Dict[str, Any]:
+    """Run a scenario in fresh interpreters and keep the fastest run of each phase."""
+    best: Dict[str, Any] = {}
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--worker', json.dumps(scenario), input_path],
+            cwd=os.path.dirname(input_path), capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'worker failed')
+        run = json.loads(result.stdout)
+        if not best:
+            best = run
+            continue
+        for name, metrics in run['phases'].items():
+            if metrics['seconds'] < best['phases'][name]['seconds']:
+                best['phases'][name].update(seconds=metrics['seconds'], ops_per_second=metrics['ops_per_second'])
+        best['peak_rss_mb'] = min(best['peak_rss_mb'], run['peak_rss_mb'])
+    return best
+
+
+def compare(key: str, result: Dict[str, Any], baseline: Dict[str, Any],
+            time_threshold: float, memory_threshold: float) -> List[str]:
+    """Return the regressions of one scenario against its baseline."""
+    regressions = []
+    for name, metrics in result['phases'].items():
+        previous = baseline['phases'].get(name)
+        if previous is None or previous['seconds'] < MIN_GATED_SECONDS:
+            continue
+        if metrics['seconds'] > previous['seconds'] * (1 + time_threshold):
+            regressions.append(
+                f"{key} {name}: {metrics['ops_per_second']:.0f} ops/s vs baseline "
+                f"{previous['ops_per_second']:.0f} ops/s ({metrics['seconds'] / previous['seconds'] - 1:+.0%} time)"
+            )
+    if result['peak_rss_mb'] > baseline['peak_rss_mb'] * (1 + memory_threshold):
+        regressions.append(
+            f"{key} memory: {result['peak_rss_mb']:.1f} MB peak vs baseline {baseline['peak_rss_mb']:.1f} MB "
+            f"({result['peak_rss_mb'] / baseline['peak_rss_mb'] - 1:+.0%})"
+        )
+    return regressions
+
+
+def _module_available(name: str) -> bool:
+    """Whether an optional dependency can be imported."""
+    import importlib.util
+    return importlib.util.find_spec(name) is not None
+
+
+def main():
+    """Main CLI function."""
+    parser = argparse.ArgumentParser(description='Benchmark api_doc_gen parsing and rendering')
+    parser.add_argument('--sizes', default='1000,10000',
+                        help='Comma-separated operation counts (e.g. 1000,10000,100000)')
+    parser.add_argument('--depth', type=int, default=3, help='Nesting depth of component schemas')
+    parser.add_argument('--tags', type=int, default=10, help='Number of tags (and schema families)')
+    parser.add_argument('--sources', default='openapi,openapi-stream,fastapi-static,fastapi',
+                        help=f"Comma-separated scenarios: {', '.join(SOURCES)}")
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per scenario; the fastest is kept')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline results file')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--time-threshold', type=float, default=DEFAULT_TIME_THRESHOLD,
+                        help='Allowed phase slowdown before failing (0.25 = 25%%)')
+    parser.add_argument('--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help='Allowed peak memory growth before failing (0.20 = 20%%)')
+    parser.add_argument('--report', help='Write the results as JSON to this file')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('input', nargs='?', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_scenario(json.loads(args.worker), args.input)))
+        return
+
+    sources = [source.strip() for source in args.sources.split(',') if source.strip()]
+    unknown = [source for source in sources if source not in SOURCES]
+    if unknown:
+        parser.error(f"unknown sources: {', '.join(unknown)}")
+
+    baselines: Dict[str, Any] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baselines = json.load(f)
+
+    results: Dict[str, Any] = {}
+    regressions: List[str] = []
+    print(f"{'scenario':<44} {'phase':<16} {'seconds':>9} {'ops/s':>11} {'peak MB':>9}")
+    for operations in [int(size) for size in args.sizes.split(',')]:
+        for source in sources:
+            scenario = {'source': source, 'operations': operations, 'depth': args.depth, 'tags': args.tags}
+            key = scenario_key(scenario)
+            if source == 'fastapi' and not (_module_available('fastapi') and _module_available('pydantic')):
+                print(f"⚠️  Skipping {key}: FastAPI is not installed")
+                continue
+            if source == 'flask' and not _module_available('flask'):
+                print(f"⚠️  Skipping {key}: Flask is not installed")
+                continue
+            if source == 'openapi-yaml' and not _module_available('yaml'):
+                print(f"⚠️  Skipping {key}: PyYAML is not installed")
+                continue
+
+            with tempfile.TemporaryDirectory() as fixture_dir:
+                try:
+                    result = measure(scenario, write_fixture(scenario, fixture_dir), args.repeat)
+                except RuntimeError as e:
+                    print(f"❌ {key}: {e}")
+                    regressions.append(f"{key} failed: {e}")
+                    continue
+
+            results[key] = result
+            for name, metrics in result['phases'].items():
+                print(f"{key:<44} {name:<16} {metrics['seconds']:>9.3f} "
+                      f"{metrics['ops_per_second']:>11.0f} {metrics['peak_rss_mb']:>9.1f}")
+            if key in baselines and not args.save_baseline:
+                regressions += compare(key, result, baselines[key], args.time_threshold, args.memory_threshold)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        baselines.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"✅ Saved {len(results)} baselines to {args.baseline}")
+        return
+
+    missing = [key for key in results if key not in baselines]
+    if missing:
+        print(f"⚠️  No baseline for {len(missing)} scenarios; record one with --save-baseline")
+    if regressions:
+        for regression in regressions:
+            print(f"❌ {regression}")
+        sys.exit(1)
+    print("✅ No regressions against baseline")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Startup Budget Check
+Measures the cold import time of api_doc_gen and fails when it exceeds the
+budget or when lazily loaded dependencies are imported eagerly again.
+"""
+
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+from api_doc_gen import IMPORT_TIME_BUDGET_MS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that only specific sources or modes need and must stay lazy
+LAZY_MODULES = ['fastapi', 'flask', 'yaml', 'jinja2', 'markupsafe', 'asyncio', 'http.server', 'socketserver', 'webbrowser',
+                'concurrent.futures', 'ctypes', 'http.client']
+
+
+def _run_python(args, env) -> subprocess.CompletedProcess:
+    """Run a fresh interpreter in the generator's directory."""
+    return subprocess.run(
+        [sys.executable] + args, cwd=HERE, env=env,
+        capture_output=True, text=True, check=True
+    )
+
+
+def measure_import_time(runs: int) -> float:
+    """Return the median cumulative `import api_doc_gen` time in milliseconds."""
+    with tempfile.TemporaryDirectory() as pycache:
+        # Measure against warm bytecode, as an installed tool would run
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=pycache)
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+
+        samples = []
+        for _ in range(runs + 1):
+            result = _run_python(['-X', 'importtime', '-c', 'import api_doc_gen'], env)
+            match = re.search(r'\|\s*(\d+)\s*\|\s*api_doc_gen\s*$', result.stderr, re.M)
+            if not match:
+                raise RuntimeError("Could not find api_doc_gen in -X importtime output")
+            samples.append(int(match.group(1)) / 1000)
+
+        # The first run only populates the bytecode cache
+        return statistics.median(samples[1:])
+
+
+def find_eager_imports() -> list:
+    """Return the lazy modules that a bare `import api_doc_gen` pulls in."""
+    code = "import sys, api_doc_gen; print('\\n'.join(sys.modules))"
+    loaded = set(_run_python(['-c', code], dict(os.environ)).stdout.split())
+    return [module for module in LAZY_MODULES if module in loaded]
+
+
+def main():
+    """Main CLI function."""
+    parser = argparse.ArgumentParser(description='Check the api_doc_gen cold-start budget')
+    parser.add_argument('--runs', type=int, default=7, help='Number of measured interpreter starts')
+    parser.add_argument('--budget', type=float, default=IMPORT_TIME_BUDGET_MS, help='Import time budget in ms')
+    args = parser.parse_args()
+
+    import_ms = measure_import_time(args.runs)
+    eager = find_eager_imports()
+
+    print(f"⏱️  import api_doc_gen: {import_ms:.1f} ms (budget {args.budget:.0f} ms, median of {args.runs})")
+    if eager:
+        print(f"❌ Eagerly imported: {', '.join(eager)}")
+    if import_ms > args.budget:
+        print("❌ Import time budget exceeded")
+
+    if eager or import_ms > args.budget:
+        sys.exit(1)
+    print("✅ Startup within budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+// Search functionality backed by the prebuilt index, or the docs server's search API when one answers
+const SEARCH_DEBOUNCE_MS = 120;
+const MAX_RESULTS = 100;
+const searchInput = document.getElementById('search');
+const searchResults = document.getElementById('search-results');
+const endpointList = document.getElementById('endpoint-list');
+let searchIndex = null;
+let searchApi = null;
+let searchTimer = null;
+
+const SEARCH_INDEX_URL = document.currentScript.dataset.searchIndex || 'search-index.json';
+const SEARCH_API_URL = document.currentScript.dataset.searchApi;
+
+// Probe the docs server's search API; static hosts don't have one and get the prebuilt index
+function probeSearchApi() {
+    if (!SEARCH_API_URL || !location.protocol.startsWith('http')) {
+        return Promise.reject(new Error('no search API'));
+    }
+    return fetch(`${SEARCH_API_URL}?q=&limit=1`)
+        .then(response => response.ok ? response.json() : Promise.reject(new Error(response.statusText)))
+        .then(page => {
+            if (typeof page.total !== 'number') {
+                throw new Error('not a search API');
+            }
+            searchApi = SEARCH_API_URL;
+        });
+}
+
+probeSearchApi()
+    .catch(() => fetch(SEARCH_INDEX_URL)
+        .then(response => response.json())
+        .then(index => { searchIndex = index; }))
+    .catch(() => { searchIndex = null; });
+
+function escapeHtml(text) {
+    return String(text).replace(/[&<>"']/g, ch => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    })[ch]);
+}
+
+function lowerBound(terms, token) {
+    let lo = 0;
+    let hi = terms.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (terms[mid] < token) {
+            lo = mid + 1;
+        } else {
+            hi = mid;
+        }
+    }
+    return lo;
+}
+
+// Every query token must prefix-match a term; exact matches rank higher
+function searchEndpoints(query) {
+    const tokens = query.toLowerCase().match(/[a-z0-9]+/g) || [];
+    const terms = searchIndex.terms;
+    let scores = null;
+
+    tokens.forEach(token => {
+        const matched = new Map();
+        for (let t = lowerBound(terms, token); t < terms.length && terms[t].startsWith(token); t++) {
+            const boost = terms[t] === token ? 2 : 1;
+            const postings = searchIndex.postings[t];
+            for (let p = 0; p < postings.length; p += 2) {
+                const score = postings[p + 1] * boost;
+                if (score > (matched.get(postings[p]) || 0)) {
+                    matched.set(postings[p], score);
+                }
+            }
+        }
+        if (scores === null) {
+            scores = matched;
+            return;
+        }
+        for (const [doc, score] of scores) {
+            if (matched.has(doc)) {
+                scores.set(doc, score + matched.get(doc));
+            } else {
+                scores.delete(doc);
+            }
+        }
+    });
+
+    return Array.from(scores || [])
+        .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+        .slice(0, MAX_RESULTS)
+        .map(entry => entry[0]);
+}
+
+function renderResults(docs) {
+    renderRows(docs.map(index => {
+        const doc = searchIndex.docs[index];
+        return { path: doc[0], methods: doc[1], summary: doc[2], index: index, section: doc[3] };
+    }));
+}
+
+function renderRows(rows) {
+    searchResults.innerHTML = rows.map(row => {
+        const target = row.index === undefined ? '' : ` data-index="${row.index}" data-section="${escapeHtml(row.section)}"`;
+        return `<a class="nav-item" href="${escapeHtml(row.url || '#endpoint-' + row.index)}" title="${escapeHtml(row.summary)}"${target}>
+            <span class="nav-path">${escapeHtml(row.path)}</span>
+            <span class="nav-methods">${escapeHtml(row.methods)}</span>
+        </a>`;
+    }).join('') || '<div class="no-results">No matching endpoints</div>';
+}
+
+// Page a URL points at, with a directory URL standing for its index.html
+function pagePath(url) {
+    const path = new URL(url, location.href).pathname;
+    return path.endsWith('/') ? path + 'index.html' : path;
+}
+
+// Link to an endpoint on another page; ?section= lets that page load its tag section first
+function endpointUrl(url, section) {
+    const target = new URL(url, location.href);
+    if (section) {
+        target.searchParams.set('section', section);
+    }
+    return target.pathname + target.search + target.hash;
+}
+
+// Server-side search: endpoints of this page open in place, other results navigate
+function searchServer(query) {
+    fetch(`${searchApi}?q=${encodeURIComponent(query)}&limit=${MAX_RESULTS}`)
+        .then(response => response.json())
+        .then(page => {
+            if (searchInput.value.trim() !== query) {
+                return;
+            }
+            renderRows(page.results.map(result => {
+                const local = result.type === 'endpoint' && pagePath(result.url) === pagePath(location.href);
+                return result.type === 'endpoint' ? {
+                    path: result.path,
+                    methods: (result.service ? result.service + ' · ' : '') + result.methods.join(', '),
+                    summary: result.summary,
+                    url: local ? result.url : endpointUrl(result.url, result.section),
+                    index: local ? result.index : undefined,
+                    section: result.section
+                } : {
+                    path: result.name,
+                    methods: (result.service ? result.service + ' · ' : '') + 'schema',
+                    summary: result.description,
+                    url: result.url
+                };
+            }));
+        })
+        .catch(() => filterNavItems(query.toLowerCase()));
+}
+
+searchResults.addEventListener('click', function(e) {
+    const item = e.target.closest('.nav-item[data-index]');
+    if (item) {
+        e.preventDefault();
+        showEndpoint(Number(item.dataset.index), item.dataset.section);
+    }
+});
+
+// Fallback when the index cannot be fetched (e.g. opened from file://)
+function filterNavItems(query) {
+    setNavRows(query ? navData.filter(row => (row[0] + ' ' + row[1]).toLowerCase().includes(query)) : navData);
+}
+
+function runSearch(query) {
+    if (!searchIndex && !searchApi) {
+        filterNavItems(query.toLowerCase());
+        return;
+    }
+    if (!query) {
+        searchResults.style.display = 'none';
+        endpointList.style.display = 'block';
+        return;
+    }
+    if (searchApi) {
+        searchServer(query);
+    } else {
+        renderResults(searchEndpoints(query));
+    }
+    endpointList.style.display = 'none';
+    searchResults.style.display = 'block';
+}
+
+searchInput.addEventListener('input', function(e) {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => runSearch(e.target.value.trim()), SEARCH_DEBOUNCE_MS);
+});
+
+// Lazy-load tag sections of split output when they are opened
+const sectionLoads = new Map();
+
+function loadSection(section) {
+    if (!sectionLoads.has(section)) {
+        sectionLoads.set(section, fetch(section.dataset.src)
+            .then(response => response.text())
+            .then(html => {
+                section.querySelector('.tag-endpoints').innerHTML = html;
+            })
+            .catch(() => {
+                sectionLoads.delete(section);
+            }));
+    }
+    return sectionLoads.get(section);
+}
+
+document.querySelectorAll('.tag-section').forEach(section => {
+    section.addEventListener('toggle', function() {
+        if (section.open) {
+            loadSection(section);
+        }
+    });
+});
+
+function openTag(slug) {
+    const section = document.getElementById('tag-' + slug);
+    if (section) {
+        section.open = true;
+        section.scrollIntoView({ behavior: 'smooth' });
+    }
+}
+
+// Scroll to endpoint
+function scrollToEndpoint(index) {
+    const endpoint = document.getElementById('endpoint-' + index);
+    if (endpoint) {
+        endpoint.scrollIntoView({ behavior: 'smooth' });
+    }
+}
+
+// Show a search result, loading its tag section first in split output
+function showEndpoint(index, slug) {
+    const section = document.getElementById('tag-' + slug);
+    if (!section) {
+        scrollToEndpoint(index);
+        return;
+    }
+    section.open = true;
+    loadSection(section).then(() => scrollToEndpoint(index));
+}
+
+// Virtualized navigation: only the rows inside the viewport are in the DOM
+const NAV_ROW_HEIGHT = 60;
+const NAV_OVERSCAN = 8;
+const navPanel = document.querySelector('nav');
+const navData = JSON.parse(document.getElementById('nav-data').textContent);
+let navRows = navData;
+let activeTarget = null;
+let navFrame = null;
+
+function setNavRows(rows) {
+    navRows = rows;
+    endpointList.style.height = (navRows.length * NAV_ROW_HEIGHT) + 'px';
+    renderNavWindow();
+}
+
+function renderNavWindow() {
+    navFrame = null;
+    const offset = navPanel.scrollTop - endpointList.offsetTop;
+    const first = Math.max(0, Math.floor(offset / NAV_ROW_HEIGHT) - NAV_OVERSCAN);
+    const last = Math.min(navRows.length, Math.ceil((offset + navPanel.clientHeight) / NAV_ROW_HEIGHT) + NAV_OVERSCAN);
+    let html = '';
+    for (let i = first; i < last; i++) {
+        const row = navRows[i];
+        const active = row[2] === activeTarget ? ' active' : '';
+        html += `<div class="nav-item virtual-row${active}" style="top:${i * NAV_ROW_HEIGHT}px" data-row="${i}">
+            <span class="nav-path">${escapeHtml(row[0])}</span>
+            <span class="nav-methods">${escapeHtml(row[1])}</span>
+        </div>`;
+    }
+    endpointList.innerHTML = html;
+}
+
+navPanel.addEventListener('scroll', function() {
+    if (navFrame === null) {
+        navFrame = requestAnimationFrame(renderNavWindow);
+    }
+}, { passive: true });
+
+endpointList.addEventListener('click', function(e) {
+    const item = e.target.closest('.virtual-row');
+    if (!item) {
+        return;
+    }
+    const target = navRows[Number(item.dataset.row)][2];
+    if (typeof target === 'number') {
+        scrollToEndpoint(target);
+    } else {
+        openTag(target);
+    }
+});
+
+setNavRows(navData);
+
+// Highlight active nav item as sections cross the top of the viewport
+function observedTarget(element) {
+    return element.id.startsWith('endpoint-') ? Number(element.id.slice(9)) : element.id.slice(4);
+}
+
+const activeObserver = new IntersectionObserver(entries => {
+    entries.forEach(entry => {
+        if (entry.isIntersecting) {
+            activeTarget = observedTarget(entry.target);
+        }
+    });
+    endpointList.querySelectorAll('.virtual-row').forEach(item => {
+        item.classList.toggle('active', navRows[Number(item.dataset.row)][2] === activeTarget);
+    });
+}, { rootMargin: '-100px 0px -70% 0px' });
+
+document.querySelectorAll('#endpoints > .endpoint, .tag-section').forEach(element => {
+    activeObserver.observe(element);
+});
+
+// A search result opened from another page: ?section=slug#endpoint-N
+const requestedEndpoint = location.hash.match(/^#endpoint-(\d+)$/);
+if (requestedEndpoint && !document.getElementById(location.hash.slice(1))) {
+    showEndpoint(Number(requestedEndpoint[1]), new URLSearchParams(location.search).get('section'));
+}
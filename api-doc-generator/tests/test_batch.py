@@ -0,0 +1,23 @@
+"""Per-service results of batch builds."""
+
+import json
+
+from api_doc_gen import build_batch
+
+
+def test_unsupported_source_fails_only_its_service(tmp_path):
+    spec = {'openapi': '3.0.0', 'info': {'title': 'Pets', 'version': '1'},
+            'paths': {'/pets': {'get': {'summary': 'List pets'}}}}
+    (tmp_path / 'pets.json').write_text(json.dumps(spec))
+    batch = {'services': [
+        {'name': 'pets', 'input': str(tmp_path / 'pets.json')},
+        {'name': 'typo', 'input': str(tmp_path / 'pets.json'), 'source': 'fastpai'}
+    ]}
+    results = build_batch(batch, str(tmp_path / 'portal'), {'cache': False})
+    
+    assert [result['error'] for result in results] == [
+        None, "Unsupported source 'fastpai'; expected one of fastapi, flask, openapi"
+    ]
+    assert results[0]['endpoints'] == 1
+    assert (tmp_path / 'portal' / 'pets' / 'index.html').exists()
+    assert not (tmp_path / 'portal' / 'typo').exists()
@@ -0,0 +1,49 @@
+"""The incremental build manifest across incremental and full builds."""
+
+import json
+
+from api_doc_gen import MANIFEST_FILE, APIDocumentationGenerator
+
+
+def spec(*paths):
+    return {
+        'openapi': '3.0.0',
+        'info': {'title': 'Shop', 'version': '1'},
+        'paths': {path: {'get': {'summary': f"Get {path}"}} for path in paths}
+    }
+
+
+def build(tmp_path, document, stream=False, **config):
+    spec_path = tmp_path / 'spec.json'
+    spec_path.write_text(json.dumps(document))
+    generator = APIDocumentationGenerator(dict(config, cache=False))
+    if stream:
+        generator.generate_streamed_documentation(str(spec_path), str(tmp_path / 'docs'))
+    else:
+        generator.parse_openapi_spec(str(spec_path))
+        generator.generate_html_documentation(str(tmp_path / 'docs'))
+    return (tmp_path / 'docs' / 'index.html').read_text()
+
+
+def test_full_builds_drop_the_manifest(tmp_path):
+    a, b = spec('/pets'), spec('/orders')
+    first = build(tmp_path, a, incremental=True)
+    assert (tmp_path / 'docs' / MANIFEST_FILE).exists()
+    
+    assert build(tmp_path, b) != first
+    assert not (tmp_path / 'docs' / MANIFEST_FILE).exists()
+    # Without the stale manifest, the next incremental build renders a again
+    assert build(tmp_path, a, incremental=True) == first
+
+
+def test_streamed_builds_drop_the_manifest(tmp_path):
+    first = build(tmp_path, spec('/pets'), incremental=True)
+    build(tmp_path, spec('/orders'), stream=True)
+    assert not (tmp_path / 'docs' / MANIFEST_FILE).exists()
+    assert build(tmp_path, spec('/pets'), incremental=True) == first
+
+
+def test_unchanged_incremental_build_writes_nothing(tmp_path, capsys):
+    build(tmp_path, spec('/pets', '/orders'), incremental=True)
+    build(tmp_path, spec('/pets', '/orders'), incremental=True)
+    assert '(0 written, ' in capsys.readouterr().out.splitlines()[-1]
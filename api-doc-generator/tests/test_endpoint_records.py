@@ -0,0 +1,12 @@
+"""Compact Endpoint records built from parsed endpoint dicts."""
+
+from api_doc_gen import APIDocumentationGenerator
+
+
+def test_methods_are_interned_in_sorted_order():
+    generator = APIDocumentationGenerator({'cache': False})
+    first = generator._endpoint_record({'path': '/items', 'methods': ['POST', 'GET'], 'tags': ['items']})
+    second = generator._endpoint_record({'path': '/items', 'methods': {'GET', 'POST'}, 'tags': ['items']})
+    assert first.key == second.key == 'GET POST /items'
+    assert first.methods is second.methods
+    assert first.tags is second.tags
@@ -0,0 +1,93 @@
+"""Edge cases of the incremental JSON reader behind --stream."""
+
+import io
+import json
+
+import pytest
+
+from api_doc_gen import JSONStream
+
+
+def stream(document, chunk_size=3):
+    """JSONStream over an encoded document, read in deliberately tiny chunks."""
+    if not isinstance(document, bytes):
+        document = json.dumps(document).encode('utf-8')
+    return JSONStream(io.BytesIO(document), chunk_size=chunk_size)
+
+
+def read_object(reader):
+    """Decode an object member by member through iter_object()."""
+    return {key: reader.value() for key in reader.iter_object()}
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64])
+def test_members_survive_any_chunk_boundary(chunk_size):
+    document = {
+        'integer': 1234567890,
+        'float': -12.5e-3,
+        'true': True,
+        'false': False,
+        'null': None,
+        'text': 'x' * 100,
+        'unicode': 'naïve – 日本 🚀',
+        'nested': {'list': [1, [2, {'three': 3}]], 'empty': {}}
+    }
+    assert read_object(stream(document, chunk_size)) == document
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3])
+def test_numbers_touching_the_buffer_end_are_read_whole(chunk_size):
+    # A chunk ending in "12" must not be decoded as 12 when "34.5e1" follows
+    reader = stream(b'{"a":1234.5e1,"b":7}', chunk_size)
+    assert read_object(reader) == {'a': 12345.0, 'b': 7}
+
+
+def test_multibyte_characters_split_across_chunks():
+    encoded = json.dumps({'name': 'é日🚀'}, ensure_ascii=False).encode('utf-8')
+    for chunk_size in range(1, len(encoded) + 1):
+        assert read_object(stream(encoded, chunk_size)) == {'name': 'é日🚀'}
+
+
+def test_skip_consumes_nested_values():
+    reader = stream({'skipped': {'deep': [1, 2, {'x': 'y'}], 'more': 'text'}, 'kept': [True]})
+    keys = []
+    for key in reader.iter_object():
+        keys.append(key)
+        if key == 'skipped':
+            reader.skip()
+        else:
+            assert reader.value() == [True]
+    assert keys == ['skipped', 'kept']
+
+
+def test_nested_objects_are_walked_key_by_key():
+    reader = stream({'paths': {'/a': {'get': 1}, '/b': {'post': 2}}, 'info': {}})
+    seen = []
+    for key in reader.iter_object():
+        if key == 'paths':
+            for path in reader.iter_object():
+                seen.append((path, reader.value()))
+        else:
+            assert reader.value() == {}
+    assert seen == [('/a', {'get': 1}), ('/b', {'post': 2})]
+
+
+def test_empty_object_and_surrounding_whitespace():
+    assert read_object(stream(b' \n\t{ \r\n } \n')) == {}
+
+
+def test_missing_separator_is_reported():
+    with pytest.raises(ValueError, match="Expected ',' or '}'"):
+        read_object(stream(b'{"a": 1 "b": 2}'))
+
+
+def test_truncated_document_is_reported():
+    with pytest.raises(ValueError):
+        read_object(stream(b'{"a": [1, 2'))
+
+
+def test_non_object_document_is_reported():
+    with pytest.raises(ValueError, match="end of input"):
+        list(stream(b'   ').iter_object())
+    with pytest.raises(ValueError, match="Expected '{'"):
+        list(stream(b'[1]').iter_object())
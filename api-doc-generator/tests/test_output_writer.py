@@ -0,0 +1,223 @@
+"""Staging, commit and fallback behavior of the output writer."""
+
+import functools
+import json
+import os
+
+import pytest
+
+import api_doc_gen
+from api_doc_gen import STAGED_REMOVALS_FILE, APIDocumentationGenerator, OutputWriter
+
+
+def write(writer, name, data):
+    """Write one file through the writer the way _write_output does: to a temporary sibling, then renamed."""
+    final = writer.path / name
+    final.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = final.with_name(f".{final.name}.tmp")
+    output = writer.open(tmp_file)
+    output.write(data)
+    output.close(functools.partial(os.replace, tmp_file, final))
+
+
+def snapshot(directory):
+    """Relative path -> (inode, content) of every file under directory."""
+    return {
+        str(path.relative_to(directory)): (path.stat().st_ino, path.read_bytes())
+        for path in sorted(directory.rglob('*')) if path.is_file()
+    }
+
+
+def staging_dirs(parent):
+    return [name for name in os.listdir(parent) if name.endswith('.staging')]
+
+
+@pytest.fixture
+def site(tmp_path):
+    """An output directory holding a previous build."""
+    target = tmp_path / 'site'
+    with OutputWriter(str(target)) as writer:
+        write(writer, 'index.html', b'old index')
+        write(writer, 'tags/a.html', b'a')
+        write(writer, 'tags/b.html', b'b')
+    return target
+
+
+def test_first_build_is_renamed_into_place(tmp_path, site):
+    assert {name: content for name, (_, content) in snapshot(site).items()} == {
+        'index.html': b'old index', 'tags/a.html': b'a', 'tags/b.html': b'b'
+    }
+    assert staging_dirs(tmp_path) == []
+
+
+def test_only_written_files_are_staged(tmp_path, site):
+    before = snapshot(site)
+    with OutputWriter(str(site)) as writer:
+        assert writer.staged and writer.path.parent == site.parent
+        write(writer, 'index.html', b'new index')
+        writer.remove(writer.path / 'tags' / 'b.html')
+        writer.wait()
+        # Unchanged files are neither copied nor linked into the staging directory
+        assert snapshot(writer.path).keys() == {'index.html'}
+        assert (site / 'index.html').read_bytes() == b'old index'
+    
+    after = snapshot(site)
+    assert after.keys() == {'index.html', 'tags/a.html'}
+    assert after['index.html'][1] == b'new index'
+    assert after['tags/a.html'] == before['tags/a.html']
+    assert staging_dirs(tmp_path) == []
+
+
+def test_reads_fall_back_to_the_current_output(site):
+    with OutputWriter(str(site)) as writer:
+        assert writer.source(writer.path / 'tags' / 'a.html') == site / 'tags' / 'a.html'
+        write(writer, 'tags/a.html', b'new a')
+        writer.wait()
+        assert writer.source(writer.path / 'tags' / 'a.html') == writer.path / 'tags' / 'a.html'
+        writer.remove(writer.path / 'index.html')
+        assert not writer.source(writer.path / 'index.html').exists()
+
+
+def test_failed_build_leaves_the_output_untouched(tmp_path, site):
+    before = snapshot(site)
+    with pytest.raises(RuntimeError):
+        with OutputWriter(str(site)) as writer:
+            write(writer, 'index.html', b'half a build')
+            writer.remove(writer.path / 'tags' / 'a.html')
+            raise RuntimeError('render failed')
+    assert snapshot(site) == before
+    assert staging_dirs(tmp_path) == []
+
+
+def test_failed_write_surfaces_on_exit_and_leaves_the_output_untouched(tmp_path, site):
+    before = snapshot(site)
+    with pytest.raises(OSError):
+        with OutputWriter(str(site)) as writer:
+            output = writer.open(writer.path / 'missing' / 'page.html')
+            output.write(b'never written')
+            output.close(lambda: None)
+    assert snapshot(site) == before
+    assert staging_dirs(tmp_path) == []
+
+
+def test_leftover_staging_directory_is_dropped(tmp_path, site):
+    leftover = tmp_path / '.site.staging'
+    leftover.mkdir()
+    (leftover / 'stale.html').write_bytes(b'from a killed build')
+    with OutputWriter(str(site)) as writer:
+        write(writer, 'index.html', b'new index')
+    assert not (site / 'stale.html').exists()
+    assert staging_dirs(tmp_path) == []
+
+
+def test_files_are_committed_after_what_they_reference(site, monkeypatch):
+    replaced = []
+    real_replace = os.replace
+    
+    def replace(source, destination):
+        replaced.append(os.path.relpath(destination, site))
+        real_replace(source, destination)
+    
+    (site / api_doc_gen.MANIFEST_FILE).write_bytes(b'{}')
+    with OutputWriter(str(site)) as writer:
+        write(writer, 'index.html', b'new index')
+        write(writer, 'index.html.gz', b'new index, compressed')
+        write(writer, 'styles.0123456789ab.css', b'body {}')
+        write(writer, 'search-index.0123456789ab.json', b'{}')
+        write(writer, 'tags/a.html', b'new a')
+        write(writer, 'svc/index.html', b'service index')
+        write(writer, 'svc/page.html', b'service page')
+        write(writer, api_doc_gen.DELTA_MANIFEST_FILE, b'{}')
+        writer.remove(writer.path / api_doc_gen.MANIFEST_FILE)
+        writer.wait()
+        monkeypatch.setattr(os, 'replace', replace)
+        monkeypatch.setattr(os, 'remove', lambda path: replaced.append(f"-{os.path.relpath(path, site)}"))
+    
+    assert replaced[0] == f"-{api_doc_gen.MANIFEST_FILE}"
+    assert set(replaced[1:3]) == {'search-index.0123456789ab.json', 'styles.0123456789ab.css'}
+    assert set(replaced[3:5]) == {'tags/a.html', 'svc/page.html'}
+    assert replaced[5] == 'svc/index.html'
+    assert set(replaced[6:8]) == {'index.html', 'index.html.gz'}
+    assert replaced[8:] == [api_doc_gen.DELTA_MANIFEST_FILE]
+
+
+@pytest.mark.parametrize('reason', ['in-place', 'mount point'])
+def test_unstaged_writers_write_in_place(site, monkeypatch, reason):
+    if reason == 'mount point':
+        monkeypatch.setattr(os.path, 'ismount', lambda path: True)
+    with OutputWriter(str(site), atomic=reason != 'in-place') as writer:
+        assert not writer.staged and writer.path == site
+        write(writer, 'index.html', b'new index')
+        writer.remove(site / 'tags' / 'b.html')
+        assert not (site / 'tags' / 'b.html').exists()
+        assert writer.source(site / 'tags' / 'a.html') == site / 'tags' / 'a.html'
+    assert (site / 'index.html').read_bytes() == b'new index'
+
+
+def test_nested_writers_hand_their_files_to_the_enclosing_build(tmp_path, site):
+    service = site / 'svc'
+    with OutputWriter(str(service)) as writer:
+        write(writer, 'index.html', b'service v1')
+        write(writer, 'old.html', b'gone soon')
+    
+    with OutputWriter(str(site)) as portal:
+        staging = portal.path / 'svc'
+        with OutputWriter(str(service), staging=str(staging)) as nested:
+            assert nested.source(staging / 'old.html') == service / 'old.html'
+            write(nested, 'index.html', b'service v2')
+            nested.remove(staging / 'old.html')
+        assert (staging / STAGED_REMOVALS_FILE).read_text() == 'old.html\n'
+        assert (service / 'old.html').exists()
+    
+    assert snapshot(service).keys() == {'index.html'}
+    assert (service / 'index.html').read_bytes() == b'service v2'
+    assert staging_dirs(tmp_path) == []
+
+
+def test_failed_nested_writer_discards_only_its_own_files(site):
+    with OutputWriter(str(site)) as portal:
+        write(portal, 'index.html', b'portal v2')
+        with pytest.raises(RuntimeError):
+            with OutputWriter(str(site / 'svc'), staging=str(portal.path / 'svc')) as nested:
+                write(nested, 'index.html', b'broken service')
+                raise RuntimeError('service failed')
+        assert not (portal.path / 'svc').exists()
+    assert (site / 'index.html').read_bytes() == b'portal v2'
+    assert not (site / 'svc').exists()
+
+
+def test_incremental_build_replaces_only_changed_files(tmp_path):
+    spec = {
+        'openapi': '3.0.0',
+        'info': {'title': 'Shop', 'version': '1'},
+        'paths': {
+            '/pets': {'get': {'summary': 'List pets', 'tags': ['pets']}},
+            '/orders': {'get': {'summary': 'List orders', 'tags': ['orders']}}
+        }
+    }
+    spec_path = tmp_path / 'spec.json'
+    target = tmp_path / 'docs'
+    config = {'cache': False, 'split_by_tag': True, 'incremental': True, 'precompress': True}
+    
+    def build():
+        spec_path.write_text(json.dumps(spec))
+        generator = APIDocumentationGenerator(dict(config))
+        generator.parse_openapi_spec(str(spec_path))
+        generator.generate_html_documentation(str(target))
+        return snapshot(target)
+    
+    first = build()
+    assert build() == first
+    
+    spec['paths']['/pets']['get']['summary'] = 'List every pet'
+    del spec['paths']['/orders']
+    third = build()
+    replaced = {name for name in third if third[name] != first.get(name)}
+    assert replaced == {
+        api_doc_gen.MANIFEST_FILE, 'index.html', 'index.html.gz', 'tags/pets.html', 'tags/pets.html.gz',
+        'search-index.json', 'search-index.json.gz'
+    }
+    assert 'tags/orders.html' in first and 'tags/orders.html' not in third
+    assert 'tags/orders.html.gz' not in third
+    assert third['styles.css'] == first['styles.css']
+    assert staging_dirs(tmp_path) == []
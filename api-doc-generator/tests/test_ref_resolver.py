@@ -0,0 +1,102 @@
+"""$ref resolution: memoization, cycles and external documents."""
+
+import os
+
+from api_doc_gen import RefResolver
+
+
+def resolver(spec, files=None, loads=None):
+    """RefResolver for spec at /specs/api.json with other documents served from files."""
+    files = files or {}
+    
+    def load(path):
+        if loads is not None:
+            loads.append(path)
+        return files[path]
+    
+    return RefResolver(spec, '/specs/api.json', load)
+
+
+def schemas(**named):
+    return {'components': {'schemas': named}}
+
+
+def test_self_reference_is_marked_circular():
+    spec = schemas(Node={'type': 'object', 'properties': {
+        'value': {'type': 'string'},
+        'next': {'$ref': '#/components/schemas/Node'}
+    }})
+    node = resolver(spec).resolve({'$ref': '#/components/schemas/Node'})
+    assert node['x-schema-name'] == 'Node'
+    assert node['properties']['value'] == {'type': 'string'}
+    assert node['properties']['next'] == {'$ref': '#/components/schemas/Node', 'x-circular': True}
+
+
+def test_mutual_recursion_terminates():
+    spec = schemas(
+        Parent={'properties': {'children': {'type': 'array', 'items': {'$ref': '#/components/schemas/Child'}}}},
+        Child={'properties': {'parent': {'$ref': '#/components/schemas/Parent'}}}
+    )
+    refs = resolver(spec)
+    parent = refs.resolve({'$ref': '#/components/schemas/Parent'})
+    child = parent['properties']['children']['items']
+    assert child['x-schema-name'] == 'Child'
+    assert child['properties']['parent'] == {'$ref': '#/components/schemas/Parent', 'x-circular': True}
+    # Child was resolved while Parent was in progress, and that result is reused
+    assert refs.resolve({'$ref': '#/components/schemas/Child'}) is child
+
+
+def test_shared_references_are_resolved_once():
+    spec = schemas(
+        Address={'properties': {'city': {'type': 'string'}}},
+        User={'properties': {'home': {'$ref': '#/components/schemas/Address'},
+                             'work': {'$ref': '#/components/schemas/Address'}}}
+    )
+    user = resolver(spec).resolve({'$ref': '#/components/schemas/User'})
+    assert user['properties']['home'] is user['properties']['work']
+    assert user['properties']['home']['properties'] == {'city': {'type': 'string'}}
+
+
+def test_reference_chains_resolve_to_the_target():
+    spec = schemas(A={'$ref': '#/components/schemas/B'}, B={'$ref': '#/components/schemas/C'}, C={'type': 'integer'})
+    assert resolver(spec).resolve({'$ref': '#/components/schemas/A'})['type'] == 'integer'
+
+
+def test_reference_to_itself_does_not_recurse():
+    spec = schemas(Loop={'$ref': '#/components/schemas/Loop'})
+    loop = resolver(spec).resolve({'$ref': '#/components/schemas/Loop'})
+    assert loop['$ref'] == '#/components/schemas/Loop'
+    assert loop['x-circular'] is True
+
+
+def test_escaped_pointer_tokens():
+    spec = {'paths': {'/users/{id}': {'get': {'summary': 'Get user'}}}, 'x': {'a~b': 1, 'list': ['zero', 'one']}}
+    refs = resolver(spec)
+    assert refs.resolve({'$ref': '#/paths/~1users~1%7Bid%7D/get'}) == {'summary': 'Get user'}
+    assert refs.resolve({'$ref': '#/x/a~0b'}) == 1
+    assert refs.resolve({'$ref': '#/x/list/1'}) == 'one'
+
+
+def test_missing_target_is_left_unresolved(capsys):
+    node = resolver(schemas()).resolve({'$ref': '#/components/schemas/Missing'})
+    assert node['$ref'] == '#/components/schemas/Missing'
+    assert 'x-circular' not in node
+    assert 'Could not resolve $ref #/components/schemas/Missing' in capsys.readouterr().out
+
+
+def test_external_documents_are_loaded_once_and_cycles_cross_files():
+    models = os.path.normpath('/specs/models.json')
+    files = {models: schemas(
+        Pet={'properties': {'owner': {'$ref': '#/components/schemas/Owner'}}},
+        Owner={'properties': {'pets': {'items': {'$ref': 'api.json#/components/schemas/PetList'}}}}
+    )}
+    spec = schemas(PetList={'type': 'array', 'items': {'$ref': 'models.json#/components/schemas/Pet'}})
+    loads = []
+    refs = resolver(spec, files, loads)
+    
+    pet_list = refs.resolve({'$ref': '#/components/schemas/PetList'})
+    owner = pet_list['items']['properties']['owner']
+    assert owner['properties']['pets']['items'] == {'$ref': 'api.json#/components/schemas/PetList', 'x-circular': True}
+    assert refs.resolve({'$ref': 'models.json#/components/schemas/Owner'}) is owner
+    assert loads == [models]
+    assert refs.external_files() == [models]
@@ -0,0 +1,167 @@
+"""Query semantics and incremental updates of the docs server's search index."""
+
+import json
+
+from api_doc_gen import APIDocumentationGenerator, SearchService
+
+
+def endpoint(path, summary='', method='GET', tags='default', parameters='', description=''):
+    """SearchService document shaped like _search_documents() endpoint rows."""
+    return {
+        'key': f"endpoint {method} {path}",
+        'fields': {'path': path, 'methods': method, 'summary': summary, 'description': description,
+                   'tags': tags, 'parameters': parameters},
+        'result': {'type': 'endpoint', 'path': path, 'methods': (method,), 'summary': summary}
+    }
+
+
+def schema(name, properties=''):
+    return {
+        'key': f"schema {name}",
+        'fields': {'name': name, 'properties': properties},
+        'result': {'type': 'schema', 'name': name}
+    }
+
+
+def paths(response):
+    return [result.get('path') or result.get('name') for result in response['results']]
+
+
+def service(*documents, scope=''):
+    search = SearchService()
+    search.update(documents, scope=scope)
+    return search
+
+
+def test_every_word_must_match():
+    search = service(endpoint('/pets', 'List pets'), endpoint('/pets/{id}', 'Delete a pet', 'DELETE'))
+    assert paths(search.query('pets delete')) == ['/pets/{id}']
+    assert search.query('pets nothing')['total'] == 0
+
+
+def test_exact_tokens_outrank_prefixes():
+    search = service(endpoint('/usernames', 'Usernames'), endpoint('/user', 'User'))
+    assert paths(search.query('user')) == ['/user', '/usernames']
+
+
+def test_prefix_matches():
+    search = service(endpoint('/orders', 'Orders'), endpoint('/invoices', 'Invoices'))
+    assert paths(search.query('ord')) == ['/orders']
+
+
+def test_field_weights_rank_path_over_description():
+    search = service(endpoint('/misc', description='about invoices'), endpoint('/invoices'))
+    assert paths(search.query('invoices')) == ['/invoices', '/misc']
+
+
+def test_tilde_adds_one_edit_matches():
+    search = service(endpoint('/orders', 'Orders'), endpoint('/ordrs', 'Typo route'))
+    # Without ~ an exact match exists, so no fuzzy expansion happens
+    assert paths(search.query('ordrs')) == ['/ordrs']
+    assert paths(search.query('ordrs~')) == ['/ordrs', '/orders']
+
+
+def test_unmatched_words_fall_back_to_fuzzy():
+    search = service(endpoint('/customers', 'Customers'))
+    assert paths(search.query('custmers')) == ['/customers']
+    assert paths(search.query('custoemrs')) == ['/customers']
+    # Too short for fuzzy matching
+    assert search.query('cst')['total'] == 0
+
+
+def test_field_scoped_terms():
+    search = service(
+        endpoint('/pets', 'List pets', tags='store'),
+        endpoint('/store', 'Store front', tags='pets'),
+        endpoint('/search', 'Search', parameters='pets limit')
+    )
+    assert paths(search.query('summary:pets')) == ['/pets']
+    assert paths(search.query('tag:pets')) == ['/store']
+    assert paths(search.query('param:pets')) == ['/search']
+    assert paths(search.query('method:get tag:store')) == ['/pets']
+
+
+def test_type_and_service_filters():
+    search = SearchService()
+    search.update([endpoint('/pets', 'Pets'), schema('Pet', 'name age')], scope='petstore')
+    search.update([endpoint('/pets', 'Pets')], scope='billing')
+    assert paths(search.query('pet type:schema')) == ['Pet']
+    assert search.query('pets type:endpoint')['total'] == 2
+    results = search.query('pets service:billing')['results']
+    assert [result['service'] for result in results] == ['billing']
+    assert search.query('pets service:unknown')['total'] == 0
+
+
+def test_empty_and_punctuation_only_queries_match_nothing():
+    search = service(endpoint('/pets', 'Pets'))
+    assert search.query('')['total'] == 0
+    assert search.query(' ,./ ')['total'] == 0
+
+
+def test_paging_keeps_the_total():
+    search = service(*[endpoint(f'/items/{i}', f'Item {i}') for i in range(30)])
+    first = search.query('items', limit=10)
+    second = search.query('items', offset=10, limit=10)
+    assert first['total'] == second['total'] == 30
+    assert len(first['results']) == len(second['results']) == 10
+    assert not set(paths(first)) & set(paths(second))
+
+
+def test_update_reindexes_only_changed_documents():
+    search = SearchService()
+    assert search.update([endpoint('/a', 'Alpha'), endpoint('/b', 'Beta')]) == \
+        {'added': 2, 'changed': 0, 'removed': 0, 'documents': 2}
+    stats = search.update([endpoint('/a', 'Alpha'), endpoint('/b', 'Gamma'), endpoint('/c', 'Delta')])
+    assert stats == {'added': 1, 'changed': 1, 'removed': 0, 'documents': 3}
+    assert search.query('beta')['total'] == 0
+    assert paths(search.query('gamma')) == ['/b']
+    
+    assert search.update([endpoint('/c', 'Delta')])['removed'] == 2
+    assert search.query('alpha')['total'] == 0
+    assert len(search) == 1
+
+
+def test_scopes_are_replaced_independently():
+    search = SearchService()
+    search.update([endpoint('/pets', 'Pets')], scope='one')
+    search.update([endpoint('/pets', 'Pets')], scope='two')
+    search.update([], scope='one')
+    assert [result['service'] for result in search.query('pets')['results']] == ['two']
+
+
+def test_operations_with_the_same_key_stay_separate():
+    search = service(endpoint('/pets', 'Pets'), endpoint('/pets', 'Pets again'))
+    assert search.query('pets')['total'] == 2
+
+
+def test_purged_tombstones_do_not_return():
+    search = SearchService()
+    search.update([endpoint(f'/old/{i}', 'Old') for i in range(1500)])
+    search.update([endpoint('/new', 'New')])
+    assert search.query('old')['total'] == 0
+    assert paths(search.query('new')) == ['/new']
+    search.update([endpoint('/new', 'New'), endpoint('/old/1', 'Old')])
+    assert paths(search.query('old')) == ['/old/1']
+
+
+def test_streamed_builds_index_the_same_documents(tmp_path):
+    spec = {
+        'openapi': '3.0.0',
+        'info': {'title': 'Pets', 'version': '1'},
+        'paths': {
+            '/pets': {'get': {'summary': 'List pets', 'tags': ['pets', 'store']}},
+            '/orders': {'post': {'summary': 'Place an order', 'tags': ['store']}}
+        },
+        'components': {'schemas': {'Pet': {'type': 'object', 'properties': {'name': {'type': 'string'}}}}}
+    }
+    spec_path = tmp_path / 'spec.json'
+    spec_path.write_text(json.dumps(spec))
+    
+    parsed = APIDocumentationGenerator({'cache': False, 'split_by_tag': True})
+    parsed.parse_openapi_spec(str(spec_path))
+    streamed = APIDocumentationGenerator({'cache': False, 'split_by_tag': True, 'search_api': True})
+    streamed.generate_streamed_documentation(str(spec_path), str(tmp_path / 'out'))
+    
+    assert streamed._search_documents() == parsed._search_documents()
+    search = service(*streamed._search_documents())
+    assert [result['section'] for result in search.query('orders')['results']] == ['store']